@@ -0,0 +1,90 @@
+# benchmarks/genetic_fitness_benchmark.py - 유전 알고리즘 적합도 계산/진화 속도 비교
+"""
+lotto_models_analysis 의 GeneticAlgorithmModel 에서 염색체마다 calculate_fitness 를 호출하던
+기존 방식과 population_fitness([P,45] 마스크 @ [45,30] 최근 회차 행렬곱)를 비교한다.
+
+1. 적합도 일치: 같은 개체군에서 두 방식의 적합도가 정확히 같은지
+2. 적합도 계산 시간: 개체군 크기별
+3. 진화 시간: evolve 1세대 (선택/교차/돌연변이 포함)
+
+사용 예:
+    python benchmarks/genetic_fitness_benchmark.py --population-sizes 100 1000 10000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_DIR, 'lotto_models_analysis')
+sys.path.insert(0, APP_DIR)
+
+# 모델 로그(logs/)는 앱 디렉토리 기준 상대 경로
+os.chdir(APP_DIR)
+
+from models.genetic import GeneticAlgorithmModel  # noqa: E402
+
+
+def load_numbers(db_path):
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            'SELECT num1, num2, num3, num4, num5, num6 FROM lotto_results ORDER BY draw_number'
+        ).fetchall()
+    return np.array(rows, dtype=np.int64)
+
+
+def synthetic_numbers(count, seed):
+    rng = np.random.default_rng(seed)
+    keys = rng.random((count, 45))
+    return np.sort(np.argpartition(keys, 6, axis=1)[:, :6] + 1, axis=1)
+
+
+def compare(model, population_size, seed):
+    np.random.seed(seed)
+    model.population_size = population_size
+    population = model.initialize_population()
+
+    start_time = time.perf_counter()
+    scalar = np.array([model.calculate_fitness(chromosome) for chromosome in population])
+    scalar_elapsed = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    vectorized = model.population_fitness(population)
+    vectorized_elapsed = time.perf_counter() - start_time
+
+    model.population = population
+    start_time = time.perf_counter()
+    model.evolve(generations=1)
+    evolve_elapsed = time.perf_counter() - start_time
+
+    print(f"  {population_size:>8,}{scalar_elapsed:>12.4f}{vectorized_elapsed:>12.4f}"
+          f"{scalar_elapsed / max(vectorized_elapsed, 1e-9):>10.1f}배{evolve_elapsed:>12.4f}"
+          f"{str(np.array_equal(scalar, vectorized)):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='유전 알고리즘 적합도 계산 비교')
+    parser.add_argument('--db', default=os.path.join(REPO_DIR, 'lotto.db'), help='당첨번호 데이터베이스')
+    parser.add_argument('--population-sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        label, numbers = '실제 이력', load_numbers(args.db)
+    else:
+        label, numbers = '합성 이력', synthetic_numbers(1000, args.seed)
+
+    model = GeneticAlgorithmModel()
+    model.historical_data = numbers
+
+    print(f"\n[{label}] {len(numbers):,}회차 (적합도는 최근 30회차 기준)")
+    print(f"  {'개체 수':>8}{'기존(초)':>12}{'벡터화(초)':>12}{'향상':>11}{'1세대(초)':>12}{'일치':>8}")
+    for population_size in args.population_sizes:
+        compare(model, population_size, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/gui_startup_benchmark.py - lotto_models_analysis GUI 시작 시간 비교
+"""
+models 패키지가 모든 모델(TensorFlow/Keras)과 sklearn 을 미리 import 하던 기존 방식(eager)과
+모델 모듈을 처음 사용할 때 불러오는 방식(lazy)의 시작 시간을 새 프로세스에서 측정한다.
+
+- 모듈 로드: main.py 가 시작할 때 불러오는 모듈까지의 시간
+- 첫 화면: PyQt5 가 있으면 창을 띄우고 첫 이벤트 처리까지의 시간 (offscreen)
+- 값은 프로세스 시작부터의 경과 시간이며, 반복 측정의 중앙값을 출력
+
+사용 예:
+    python benchmarks/gui_startup_benchmark.py --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_DIR, 'lotto_models_analysis')
+
+# eager: 기존 models/__init__ 와 같이 모든 모델 모듈 + sklearn 을 먼저 import
+EAGER_IMPORTS = "import sklearn.preprocessing, models.ensemble\n"
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+{eager}import utils.data_loader, utils.model_registry, models
+print(time.perf_counter() - start)
+"""
+
+WINDOW_SCRIPT = """
+import time
+start = time.perf_counter()
+{eager}from PyQt5.QtWidgets import QApplication
+import main
+app = QApplication([])
+window = main.LottoPredictionApp()
+window.show()
+app.processEvents()
+print(time.perf_counter() - start)
+"""
+
+
+def run(script, eager, repeat):
+    """새 프로세스에서 script 를 repeat 번 실행 -> 경과 시간 중앙값 (실패 시 None)"""
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', TF_CPP_MIN_LOG_LEVEL='3')
+    code = script.format(eager=EAGER_IMPORTS if eager else '')
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', code], cwd=APP_DIR, env=env,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"  실행 실패: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ''}")
+            return None
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GUI 시작 시간 비교 (eager vs lazy 모델 import)')
+    parser.add_argument('--repeat', type=int, default=3, help='측정 반복 수')
+    args = parser.parse_args()
+
+    for label, script in (('모듈 로드', IMPORT_SCRIPT), ('첫 화면', WINDOW_SCRIPT)):
+        print(f"\n[{label}] 반복 {args.repeat}회 중앙값")
+        eager = run(script, True, args.repeat)
+        lazy = run(script, False, args.repeat)
+        if eager is None or lazy is None:
+            continue
+        print(f"  기존 (eager): {eager:.3f}초")
+        print(f"  지연 (lazy):  {lazy:.3f}초")
+        print(f"  단축: {eager - lazy:.3f}초 ({eager / max(lazy, 1e-9):.1f}배)")
+
+
+if __name__ == '__main__':
+    main()
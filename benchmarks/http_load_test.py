@@ -0,0 +1,400 @@
+# benchmarks/http_load_test.py - 통계/번호생성 웹 앱 HTTP 부하 테스트
+"""
+lotto_stats_web / lotto_tapa_web 처리량 측정 도구
+
+앱을 임시 픽스처 DB로 별도 프로세스에서 띄운 뒤, 지정한 동시성으로 주요 엔드포인트에
+요청을 보내 p50/p95/p99 응답 시간과 초당 요청 수를 측정하고 결과를 JSON으로 저장한다.
+
+사용 예:
+    python benchmarks/http_load_test.py stats --concurrency 8 --duration 20
+    python benchmarks/http_load_test.py tapa --synthetic-draws 100000
+    python benchmarks/http_load_test.py stats --server gunicorn --workers 4
+    python benchmarks/http_load_test.py compare results/a.json results/b.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, 'benchmarks', 'results')
+SOURCE_DB = os.path.join(REPO_DIR, 'lotto.db')
+
+ANALYSIS_TYPES = ['ac', 'sum', 'odd_even', 'high_low', 'consecutive',
+                  'patterns', 'last_digits', 'combinations', 'summary']
+
+# 앱별 실행 정보와 부하 대상 (이름, 메서드, 경로, 폼 데이터)
+APPS = {
+    'stats': {
+        'dir': os.path.join(REPO_DIR, 'lotto_stats_web'),
+        'gunicorn_target': 'app:create_app()',
+        'health': '/api/health',
+        'targets': [('api_stats', 'GET', '/api/stats', None)] + [
+            (f'api_analysis_{t}', 'GET', f'/api/analysis/{t}', None) for t in ANALYSIS_TYPES
+        ]
+    },
+    'tapa': {
+        'dir': os.path.join(REPO_DIR, 'lotto_tapa_new', 'lotto_tapa_web'),
+        'gunicorn_target': 'app:app',
+        'health': '/health',
+        'targets': [
+            ('generate', 'POST', '/generate', {'games_count': '5'}),
+            ('stats', 'GET', '/stats', None)
+        ]
+    }
+}
+
+
+# ----------------------------------------------------------------------
+# 픽스처 DB
+# ----------------------------------------------------------------------
+def create_fixture_db(path, synthetic_draws=None, seed=42):
+    """두 앱이 모두 읽을 수 있는 스키마의 픽스처 DB 생성
+
+    synthetic_draws 가 없으면 저장소 루트 lotto.db 의 실제 회차를 복사하고,
+    있으면 고정 시드로 해당 회차 수만큼 합성 데이터를 만든다.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE lotto_results (
+            draw_number INTEGER PRIMARY KEY,
+            num1 INTEGER, num2 INTEGER, num3 INTEGER,
+            num4 INTEGER, num5 INTEGER, num6 INTEGER,
+            bonus INTEGER,
+            draw_date TEXT,
+            money1 INTEGER, money2 INTEGER, money3 INTEGER,
+            money4 INTEGER, money5 INTEGER
+        )
+    ''')
+
+    if synthetic_draws:
+        rng = random.Random(seed)
+
+        def rows():
+            for draw_number in range(1, synthetic_draws + 1):
+                picked = rng.sample(range(1, 46), 7)
+                numbers = sorted(picked[:6])
+                yield (draw_number, *numbers, picked[6], None,
+                       rng.randint(1, 30) * 10 ** 8, 5 * 10 ** 7, 1500000, 50000, 5000)
+
+        conn.executemany('INSERT INTO lotto_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows())
+    else:
+        conn.execute('ATTACH DATABASE ? AS src', (SOURCE_DB,))
+        conn.execute('''
+            INSERT INTO lotto_results
+            SELECT draw_number, num1, num2, num3, num4, num5, num6, bonus, NULL,
+                   money1, money2, money3, money4, money5
+            FROM src.lotto_results
+        ''')
+        conn.commit()
+        conn.execute('DETACH DATABASE src')
+
+    conn.commit()
+    count = conn.execute('SELECT COUNT(*) FROM lotto_results').fetchone()[0]
+    conn.close()
+    return count
+
+
+# ----------------------------------------------------------------------
+# 서버 실행
+# ----------------------------------------------------------------------
+def start_server(app_name, db_path, work_dir, port, server='flask', workers=4):
+    """픽스처 DB를 바라보는 앱 서버를 별도 프로세스로 실행"""
+    app_info = APPS[app_name]
+    env = dict(os.environ)
+    env.update({
+        # stats 앱
+        'DB_PATH': db_path,
+        'CACHE_DIR': os.path.join(work_dir, 'cache'),
+        'FLASK_DEBUG': 'False',
+        'FLASK_HOST': '127.0.0.1',
+        'FLASK_PORT': str(port),
+        'FLASK_ENV': 'production',
+        # tapa 앱
+        'LOTTO_DB_PATH': db_path,
+        'HOST': '127.0.0.1',
+        'PORT': str(port),
+        # 다중 워커 지표 집계
+        'METRICS_DIR': os.path.join(work_dir, 'metrics')
+    })
+
+    if server == 'gunicorn':
+        cmd = [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}',
+               '--log-level', 'warning', app_info['gunicorn_target']]
+    else:
+        cmd = [sys.executable, 'app.py']
+
+    log_file = open(os.path.join(work_dir, 'server.log'), 'w', encoding='utf-8')
+    process = subprocess.Popen(cmd, cwd=app_info['dir'], env=env,
+                               stdout=log_file, stderr=subprocess.STDOUT)
+    process.log_file = log_file
+    return process
+
+
+def wait_for_server(base_url, health_path, process, timeout=60):
+    """헬스 체크 엔드포인트가 응답할 때까지 대기"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('서버 프로세스가 시작 중 종료되었습니다 (server.log 확인)')
+        try:
+            with urllib.request.urlopen(base_url + health_path, timeout=2) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'서버가 {timeout}초 안에 응답하지 않았습니다')
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    process.log_file.close()
+
+
+# ----------------------------------------------------------------------
+# 부하 생성
+# ----------------------------------------------------------------------
+def send_request(base_url, method, path, form):
+    """요청 1회 수행 후 (소요 시간, 성공 여부) 반환"""
+    data = urllib.parse.urlencode(form).encode('utf-8') if form else None
+    req = urllib.request.Request(base_url + path, data=data, method=method)
+    start_time = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            response.read()
+            ok = response.status < 400
+    except (urllib.error.URLError, ConnectionError, OSError):
+        ok = False
+    return time.perf_counter() - start_time, ok
+
+
+def run_target(base_url, target, concurrency, duration, requests_limit, warmup):
+    """단일 엔드포인트에 동시 요청을 보내고 응답 시간 목록 수집"""
+    name, method, path, form = target
+
+    for _ in range(warmup):
+        send_request(base_url, method, path, form)
+
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    issued = [0]
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        while time.perf_counter() < deadline:
+            with lock:
+                if requests_limit and issued[0] >= requests_limit:
+                    return
+                issued[0] += 1
+            elapsed, ok = send_request(base_url, method, path, form)
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+    wall_time = time.perf_counter() - start_time
+
+    return summarize(name, method, path, latencies, errors[0], wall_time)
+
+
+def percentile(sorted_values, q):
+    """선형 보간 백분위수"""
+    if not sorted_values:
+        return None
+    pos = (len(sorted_values) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+def summarize(name, method, path, latencies, errors, wall_time):
+    values = sorted(latencies)
+
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        'name': name,
+        'method': method,
+        'path': path,
+        'requests': len(values),
+        'errors': errors,
+        'wall_time_s': round(wall_time, 3),
+        'rps': round(len(values) / wall_time, 2) if wall_time > 0 else 0.0,
+        'latency_ms': {
+            'mean': ms(sum(values) / len(values)) if values else None,
+            'p50': ms(percentile(values, 50)),
+            'p95': ms(percentile(values, 95)),
+            'p99': ms(percentile(values, 99)),
+            'max': ms(values[-1]) if values else None
+        }
+    }
+
+
+# ----------------------------------------------------------------------
+# 결과 출력/저장/비교
+# ----------------------------------------------------------------------
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results):
+    print(f"\n{'엔드포인트':<28}{'요청':>8}{'오류':>6}{'RPS':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}")
+    print('-' * 82)
+    for r in results:
+        lat = r['latency_ms']
+        print(f"{r['name']:<28}{r['requests']:>8}{r['errors']:>6}{r['rps']:>10}"
+              f"{_fmt(lat['p50']):>10}{_fmt(lat['p95']):>10}{_fmt(lat['p99']):>10}")
+
+
+def _fmt(value):
+    return '-' if value is None else f'{value:.1f}'
+
+
+def compare(path_a, path_b):
+    """두 결과 파일의 엔드포인트별 RPS / p95 변화 출력"""
+    with open(path_a, 'r', encoding='utf-8') as f:
+        a = json.load(f)
+    with open(path_b, 'r', encoding='utf-8') as f:
+        b = json.load(f)
+
+    print(f"A: {path_a} (commit {a.get('commit')})")
+    print(f"B: {path_b} (commit {b.get('commit')})")
+    print(f"\n{'엔드포인트':<28}{'RPS A':>10}{'RPS B':>10}{'변화':>9}{'p95 A':>10}{'p95 B':>10}{'변화':>9}")
+    print('-' * 86)
+
+    results_a = {r['name']: r for r in a['results']}
+    for rb in b['results']:
+        ra = results_a.get(rb['name'])
+        if not ra:
+            continue
+        p95_a, p95_b = ra['latency_ms']['p95'], rb['latency_ms']['p95']
+        print(f"{rb['name']:<28}{ra['rps']:>10}{rb['rps']:>10}{_change(ra['rps'], rb['rps']):>9}"
+              f"{_fmt(p95_a):>10}{_fmt(p95_b):>10}{_change(p95_a, p95_b):>9}")
+
+
+def _change(before, after):
+    if not before or after is None:
+        return '-'
+    return f'{(after - before) / before * 100:+.1f}%'
+
+
+def run_benchmark(args):
+    work_dir = tempfile.mkdtemp(prefix='lotto_bench_')
+    db_path = os.path.join(work_dir, 'lotto.db')
+    draw_count = create_fixture_db(db_path, args.synthetic_draws, args.seed)
+    print(f"픽스처 DB 생성: {draw_count}회차 ({'합성' if args.synthetic_draws else '실제 데이터'})")
+
+    base_url = f'http://127.0.0.1:{args.port}'
+    process = start_server(args.app, db_path, work_dir, args.port, args.server, args.workers)
+    try:
+        wait_for_server(base_url, APPS[args.app]['health'], process)
+        print(f"서버 시작: {args.app} ({args.server}), {base_url}")
+
+        targets = APPS[args.app]['targets']
+        if args.only:
+            targets = [t for t in targets if any(key in t[0] for key in args.only)]
+
+        results = []
+        for target in targets:
+            print(f"  부하 테스트 중: {target[1]} {target[2]}")
+            results.append(run_target(base_url, target, args.concurrency, args.duration,
+                                      args.requests, args.warmup))
+    finally:
+        stop_server(process)
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_table(results)
+
+    report = {
+        'app': args.app,
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'settings': {
+            'server': args.server,
+            'workers': args.workers if args.server == 'gunicorn' else 1,
+            'concurrency': args.concurrency,
+            'duration_s': args.duration,
+            'requests_limit': args.requests,
+            'warmup': args.warmup,
+            'draw_count': draw_count,
+            'synthetic': bool(args.synthetic_draws),
+            'seed': args.seed
+        },
+        'results': results
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(
+            RESULTS_DIR,
+            f"{args.app}_{report['commit'] or 'nogit'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로또 웹 앱 HTTP 부하 테스트')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for app_name in APPS:
+        sub = subparsers.add_parser(app_name, help=f'{app_name} 앱 부하 테스트')
+        sub.add_argument('--concurrency', type=int, default=4, help='동시 요청 수')
+        sub.add_argument('--duration', type=float, default=10.0, help='엔드포인트별 측정 시간 (초)')
+        sub.add_argument('--requests', type=int, default=0, help='엔드포인트별 최대 요청 수 (0: 무제한)')
+        sub.add_argument('--warmup', type=int, default=3, help='측정 전 워밍업 요청 수')
+        sub.add_argument('--synthetic-draws', type=int, default=0,
+                         help='합성 회차 수 (예: 100000). 0이면 실제 데이터 사용')
+        sub.add_argument('--seed', type=int, default=42, help='합성 데이터 시드')
+        sub.add_argument('--server', choices=['flask', 'gunicorn'], default='flask', help='서버 종류')
+        sub.add_argument('--workers', type=int, default=4, help='gunicorn 워커 수')
+        sub.add_argument('--port', type=int, default=5099, help='테스트 서버 포트')
+        sub.add_argument('--only', nargs='*', help='이름에 해당 문자열이 포함된 엔드포인트만 측정')
+        sub.add_argument('--output', help='결과 JSON 경로 (기본: benchmarks/results/)')
+        sub.add_argument('--keep', action='store_true', help='임시 작업 디렉토리 유지')
+        sub.set_defaults(app=app_name)
+
+    compare_parser = subparsers.add_parser('compare', help='두 결과 파일 비교')
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+
+    args = parser.parse_args()
+    if args.command == 'compare':
+        compare(args.before, args.after)
+    else:
+        run_benchmark(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/keras_inference_benchmark.py - 혼합/트랜스포머 모델 예측 지연 시간 비교
+"""
+lotto_models_analysis 의 HybridModel / TransformerModel 에서 입력 하나를 예측할 때의 지연 시간을
+예측 경로별로 비교한다 (학습되지 않은 가중치, CPU).
+
+- predict : 기존 model.predict
+- function: enable_fast_inference() 의 고정 시그니처 tf.function
+- xla     : enable_fast_inference(jit_compile=True)
+- tflite  : export_tflite() -> load_tflite() (변환에 실패하면 생략)
+
+각 경로는 준비 시간(컴파일/변환)과 반복 호출의 중앙값/p95 지연 시간을 출력하고,
+기존 경로와 출력 차이(최대 절대 오차)를 함께 확인한다.
+
+사용 예:
+    python benchmarks/keras_inference_benchmark.py --repeat 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_DIR, 'lotto_models_analysis')
+sys.path.insert(0, APP_DIR)
+
+# 모델 로그(logs/)는 앱 디렉토리 기준 상대 경로
+os.chdir(APP_DIR)
+
+from models import HybridModel, TransformerModel  # noqa: E402
+from utils.windowing import SequenceWindows, marking_patterns  # noqa: E402
+
+MODES = ('predict', 'function', 'xla', 'tflite')
+
+
+def synthetic_numbers(count, seed):
+    rng = np.random.default_rng(seed)
+    keys = rng.random((count, 45))
+    return np.sort(np.argpartition(keys, 6, axis=1)[:, :6] + 1, axis=1)
+
+
+def prepare(model, mode, sample_inputs, temp_dir):
+    """예측 경로 준비 -> 준비 시간 (지원하지 않으면 None)"""
+    start_time = time.perf_counter()
+    if mode == 'predict':
+        model.inference_mode = 'predict'
+    elif mode in ('function', 'xla'):
+        model.enable_fast_inference(sample_inputs, jit_compile=(mode == 'xla'))
+    else:
+        model.enable_fast_inference(sample_inputs)
+        try:
+            path = model.export_tflite(os.path.join(temp_dir, model.model_name.lower()))
+        except Exception as e:
+            print(f"  {mode:<10}변환 실패: {str(e).splitlines()[0]}")
+            return None
+        model.load_tflite(path)
+    return time.perf_counter() - start_time
+
+
+def measure(model, inputs, repeat):
+    """(출력, 지연 시간 배열[ms])"""
+    output = model.run_inference(inputs)  # 첫 호출(워밍업) 제외
+    latencies = np.zeros(repeat)
+    for i in range(repeat):
+        start_time = time.perf_counter()
+        model.run_inference(inputs)
+        latencies[i] = (time.perf_counter() - start_time) * 1000
+    return np.asarray(output), latencies
+
+
+def compare(label, model, inputs, repeat):
+    print(f"\n[{label}] 반복 {repeat}회")
+    print(f"  {'경로':<10}{'준비(초)':>10}{'중앙값(ms)':>12}{'p95(ms)':>10}{'향상':>8}{'최대 오차':>12}")
+
+    baseline = None
+    with tempfile.TemporaryDirectory(prefix='inference_') as temp_dir:
+        for mode in MODES:
+            setup = prepare(model, mode, inputs, temp_dir)
+            if setup is None:
+                continue
+            output, latencies = measure(model, inputs, repeat)
+            median = float(np.median(latencies))
+            if baseline is None:
+                baseline = (output, median)
+            error = float(np.max(np.abs(output - baseline[0])))
+            print(f"  {mode:<10}{setup:>10.3f}{median:>12.3f}{np.percentile(latencies, 95):>10.3f}"
+                  f"{baseline[1] / median:>7.1f}배{error:>12.2e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keras 모델 예측 지연 시간 비교')
+    parser.add_argument('--repeat', type=int, default=200, help='경로별 예측 반복 수')
+    parser.add_argument('--history', type=int, default=1200, help='합성 이력 길이 (회차 수)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    numbers = synthetic_numbers(args.history, args.seed)
+
+    transformer = TransformerModel()
+    window = SequenceWindows(numbers[-transformer.sequence_length:], transformer.sequence_length).last_window()
+    compare('트랜스포머 모델', transformer, window, args.repeat)
+
+    # main.py 의 "전체 데이터" 모드와 같은 윈도우 길이 (N // 10)
+    hybrid = HybridModel()
+    windows = SequenceWindows(numbers, len(numbers) // 10, max(len(numbers) // 20, 1), -1)
+    hybrid_inputs = [marking_patterns(numbers[-1:]), windows.batch([len(windows) - 1])[0]]
+    compare('혼합 모델', hybrid, hybrid_inputs, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+# benchmarks/rl_mc_engine_benchmark.py - 강화학습 예측기 학습 루프 속도/분포 비교
+"""
+lotto_Reinforcement_20241127 의 기존 학습 루프(select_numbers 기반)와
+MonteCarloEngine(Gumbel-top-k 배치 샘플링)을 비교한다.
+
+1. 분포 비교: 같은 가중치에서 번호별 포함 빈도와 일치 개수 분포
+2. 속도 비교: 회차당 iterations 반복 학습의 초당 반복 수
+
+사용 예:
+    python benchmarks/rl_mc_engine_benchmark.py --iterations 200 --draws 5 --eval-samples 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, 'lotto_Reinforcement_20241127'))
+
+from mc_engine import MonteCarloEngine, SCORE_TABLE  # noqa: E402
+
+
+class ReferenceAnalyzer:
+    """main.py LottoAnalyzer / LearningAnalyzer 의 기존 구현 (비교 기준)"""
+
+    def __init__(self, learning_rate, numbers_memory=None):
+        self.learning_rate = learning_rate
+        self.numbers_memory = dict(numbers_memory) if numbers_memory else {i: 1.0 for i in range(1, 46)}
+        self.number_stats = {i: 0 for i in range(1, 46)}
+
+    def select_numbers(self):
+        weights = list(self.numbers_memory.values())
+        weight_sum = sum(weights)
+        probabilities = [w / weight_sum for w in weights]
+
+        selected = []
+        while len(selected) < 6:
+            num = np.random.choice(range(1, 46), p=probabilities)
+            if num not in selected:
+                selected.append(num)
+                probabilities[int(num) - 1] *= 0.5
+                probabilities = [p / sum(probabilities) for p in probabilities]
+
+        selected.sort()
+        return selected
+
+    def evaluate_model(self, actual_numbers, iterations):
+        total_score = 0
+        for _ in range(iterations):
+            matches = len(set(self.select_numbers()) & set(actual_numbers))
+            total_score += SCORE_TABLE[matches]
+        return total_score / iterations
+
+    def update_weights(self, numbers, score):
+        for num in numbers:
+            increase = score * self.learning_rate
+            frequency = self.number_stats.get(num, 0)
+            max_frequency = max(self.number_stats.values())
+            frequency_factor = frequency / max_frequency if max_frequency > 0 else 0
+            self.numbers_memory[num] += increase * (1 + frequency_factor)
+
+    def train_draw(self, actual_numbers, iterations, eval_samples):
+        best_score = 0
+        for _ in range(iterations):
+            predicted = self.select_numbers()
+            matches = len(set(predicted) & set(actual_numbers))
+            current_score = self.evaluate_model(actual_numbers, eval_samples)
+            if current_score > best_score:
+                best_score = current_score
+            if matches > 0:
+                self.update_weights(list(set(predicted) & set(actual_numbers)), matches)
+        return best_score
+
+
+def compare_distribution(samples, seed):
+    """비균등 가중치에서 두 구현의 번호 포함 빈도/일치 개수 분포 비교"""
+    rng = np.random.default_rng(seed)
+    weights = rng.gamma(2.0, 1.0, size=45) + 0.1
+    memory = {n: float(weights[n - 1]) for n in range(1, 46)}
+    actual = [3, 11, 19, 27, 35, 43]
+
+    np.random.seed(seed)
+    reference = ReferenceAnalyzer(0.1, memory)
+    ref_sets = np.array([reference.select_numbers() for _ in range(samples)])
+
+    engine = MonteCarloEngine(0.1, memory, seed=seed)
+    new_sets = engine.sample(samples)
+
+    ref_freq = np.bincount(ref_sets.ravel(), minlength=46)[1:] / samples
+    new_freq = np.bincount(new_sets.ravel(), minlength=46)[1:] / samples
+
+    actual_set = set(actual)
+    ref_matches = np.bincount([len(set(s) & actual_set) for s in ref_sets.tolist()], minlength=7) / samples
+    new_matches = np.bincount([len(set(s) & actual_set) for s in new_sets.tolist()], minlength=7) / samples
+
+    # 번호별 포함 확률의 표준오차 대비 최대 편차
+    stderr = np.sqrt(ref_freq * (1 - ref_freq) / samples * 2)
+    z_max = float(np.max(np.abs(ref_freq - new_freq) / np.maximum(stderr, 1e-12)))
+
+    print(f"\n[분포 비교] 샘플 {samples}세트, 비균등 가중치")
+    print(f"  번호별 포함 확률 최대 차이: {np.max(np.abs(ref_freq - new_freq)):.4f} (최대 z={z_max:.2f})")
+    print(f"  {'일치 개수':<10}{'기존':>10}{'엔진':>10}")
+    for k in range(7):
+        print(f"  {k:<10}{ref_matches[k]:>10.4f}{new_matches[k]:>10.4f}")
+
+
+def compare_speed(draws, iterations, eval_samples, seed):
+    """회차 draws 개 x iterations 반복 학습 속도 비교"""
+    rng = np.random.default_rng(seed)
+    history = [sorted(rng.choice(np.arange(1, 46), 6, replace=False).tolist()) for _ in range(draws)]
+
+    np.random.seed(seed)
+    reference = ReferenceAnalyzer(0.1)
+    start_time = time.perf_counter()
+    for actual in history:
+        reference.train_draw(actual, iterations, eval_samples)
+    ref_elapsed = time.perf_counter() - start_time
+
+    engine = MonteCarloEngine(0.1, seed=seed)
+    start_time = time.perf_counter()
+    for actual in history:
+        engine.train_draw(actual, iterations, eval_samples)
+    new_elapsed = time.perf_counter() - start_time
+
+    total = draws * iterations
+    print(f"\n[속도 비교] {draws}회차 x {iterations}반복, 평가 {eval_samples}세트/반복")
+    print(f"  기존: {total / ref_elapsed:>12,.0f} 반복/초 ({ref_elapsed:.2f}초)")
+    print(f"  엔진: {total / new_elapsed:>12,.0f} 반복/초 ({new_elapsed:.2f}초)")
+    print(f"  속도 향상: {ref_elapsed / new_elapsed:.1f}배")
+
+    # 대량 샘플링 처리량
+    start_time = time.perf_counter()
+    engine.sample(100000)
+    print(f"  6개 조합 10만 세트 샘플링: {time.perf_counter() - start_time:.3f}초")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='강화학습 예측기 학습 엔진 비교')
+    parser.add_argument('--draws', type=int, default=5, help='학습 회차 수')
+    parser.add_argument('--iterations', type=int, default=200, help='회차당 반복 수')
+    parser.add_argument('--eval-samples', type=int, default=10, help='반복당 평가 세트 수 (웹 10, GUI 100)')
+    parser.add_argument('--dist-samples', type=int, default=20000, help='분포 비교 샘플 수')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    compare_distribution(args.dist_samples, args.seed)
+    compare_speed(args.draws, args.iterations, args.eval_samples, args.seed)
+
+
+if __name__ == '__main__':
+    main()
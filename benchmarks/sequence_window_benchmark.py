@@ -0,0 +1,129 @@
+# benchmarks/sequence_window_benchmark.py - 딥러닝 모델 입력 시퀀스 생성 시간/메모리 비교
+"""
+lotto_models_analysis 의 기존 시퀀스 생성(회차마다 np.zeros((L,45)) 후 이중 루프)과
+utils/windowing.SequenceWindows(원-핫 버퍼 1회 인코딩 + sliding_window_view)를 비교한다.
+
+- 생성 시간: 입력 X 와 타겟 y 를 만들 때까지
+- 최대 메모리: tracemalloc 기준 생성 중 최대 할당량
+- 학습 직전 연속 배열로 복사(materialize)하는 경우도 함께 측정
+
+사용 예:
+    python benchmarks/sequence_window_benchmark.py --db lotto.db --synthetic 20000 100000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, 'lotto_models_analysis'))
+
+from utils.windowing import SequenceWindows  # noqa: E402
+
+
+def legacy_sequences(numbers, sequence_length, stride=1, target_offset=0):
+    """DataLoader.preprocess_data 의 기존 구현 (비교 기준)"""
+    X = []
+    y = []
+    for i in range(0, len(numbers) - sequence_length, stride):
+        sequence = numbers[i:i + sequence_length]
+        target = numbers[i + sequence_length + target_offset]
+
+        sequence_encoded = np.zeros((sequence_length, 45))
+        for j, nums in enumerate(sequence):
+            for num in nums:
+                sequence_encoded[j, int(num - 1)] = 1
+
+        X.append(sequence_encoded)
+        y.append(target)
+
+    X = np.array(X, dtype=np.float32)
+    y_encoded = np.zeros((len(y), 45))
+    for i, nums in enumerate(y):
+        for num in nums:
+            y_encoded[i, int(num - 1)] = 1
+    return X, y_encoded
+
+
+def window_sequences(numbers, sequence_length, stride=1, target_offset=0, materialize=False):
+    windows = SequenceWindows(numbers, sequence_length, stride, target_offset)
+    if materialize:
+        return windows.materialize()
+    return windows.inputs, windows.targets
+
+
+def measure(func, *args, **kwargs):
+    """(결과, 소요 시간, 최대 메모리 바이트)"""
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def load_numbers(db_path):
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            'SELECT num1, num2, num3, num4, num5, num6 FROM lotto_results ORDER BY draw_number'
+        ).fetchall()
+    return np.array(rows, dtype=np.int32)
+
+
+def synthetic_numbers(count, seed):
+    rng = np.random.default_rng(seed)
+    keys = rng.random((count, 45))
+    return np.sort(np.argpartition(keys, 6, axis=1)[:, :6] + 1, axis=1).astype(np.int32)
+
+
+def compare(label, numbers, sequence_length, stride=1, target_offset=0, skip_legacy=False):
+    print(f"\n[{label}] 이력 {len(numbers):,}회차, 윈도우 길이 {sequence_length}, 간격 {stride}")
+    print(f"  {'방식':<16}{'시간(초)':>10}{'최대 메모리':>14}{'X shape':>22}")
+
+    rows = []
+    if not skip_legacy:
+        rows.append(('기존 루프',) + measure(legacy_sequences, numbers, sequence_length, stride, target_offset))
+    rows.append(('윈도우 뷰',) + measure(window_sequences, numbers, sequence_length, stride, target_offset))
+    rows.append(('윈도우 + 복사',) + measure(window_sequences, numbers, sequence_length, stride,
+                                          target_offset, materialize=True))
+
+    for name, (X, y), elapsed, peak in rows:
+        print(f"  {name:<16}{elapsed:>10.4f}{peak / 1024 ** 2:>12.2f}MB{str(X.shape):>22}")
+
+    if not skip_legacy:
+        (X0, y0), (X1, y1) = rows[0][1], rows[1][1]
+        print(f"  결과 일치: {np.array_equal(X0, X1) and np.array_equal(y0, y1)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='딥러닝 모델 입력 시퀀스 생성 비교')
+    parser.add_argument('--db', default=os.path.join(REPO_DIR, 'lotto.db'), help='당첨번호 데이터베이스')
+    parser.add_argument('--sequence-length', type=int, default=10, help='"지정 길이" 모드 윈도우 길이')
+    parser.add_argument('--synthetic', type=int, nargs='*', default=[20000, 100000],
+                        help='합성 이력 길이 (회차 수)')
+    parser.add_argument('--legacy-limit', type=int, default=100000,
+                        help='이 길이를 넘는 합성 이력은 기존 루프 측정 생략')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    datasets = []
+    if os.path.exists(args.db):
+        datasets.append(('실제 이력', load_numbers(args.db)))
+    for count in args.synthetic:
+        datasets.append((f'합성 {count:,}회차', synthetic_numbers(count, args.seed)))
+
+    for label, numbers in datasets:
+        skip_legacy = len(numbers) > args.legacy_limit
+        compare(f'{label} / 지정 길이', numbers, args.sequence_length, skip_legacy=skip_legacy)
+        full_length = len(numbers) // 10
+        compare(f'{label} / 전체 데이터', numbers, full_length, max(full_length // 2, 1), -1,
+                skip_legacy=skip_legacy)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,10 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
 from datetime import datetime
 import os
+import sys
 from pathlib import Path
-import threading
-import queue
 import json
+import time
 import numpy as np
 import pandas as pd
 import matplotlib
@@ -12,14 +12,24 @@ matplotlib.use('Agg')  # GUI 없이 실행하기 위한 설정
 import matplotlib.pyplot as plt
 import io
 import base64
+
+# 저장소 공용 모듈 (lotto_common) 과 상위 강화학습 앱의 학습 엔진 (mc_engine)
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
 from config import Config
+from lotto_common.request_metrics import MetricsConnection, init_metrics
+from task_manager import TaskLimitExceeded, TaskRunner, TaskStore
+from mc_engine import MonteCarloEngine
+from lotto_common import history_kernels
+import sweep
+from lotto_common import state_file
+from lotto_common import async_logging
 import logging
 import sqlite3
 from sqlite3 import Error
 import copy
-import pickle
 import traceback
-import sys
 import locale
 
 sys.stdout.reconfigure(encoding='utf-8')
@@ -27,21 +37,27 @@ sys.stdout.reconfigure(encoding='utf-8')
 # Flask 앱 초기화
 app = Flask(__name__)
 Config.init_app(app)
-
-# 전역 변수
-task_queue = queue.Queue()
-results = {}
-active_tasks = {}
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(asctime)s] %(levelname)s: %(message)s',
-    handlers=[
-        logging.FileHandler(Config.LOGS_DIR / 'webapp.log', encoding='utf-8', mode='a'),
-        logging.StreamHandler(sys.stdout) # stdout에 대한 인코딩 설정
-    ]
-)
+init_metrics(app, os.environ.get('METRICS_DIR'))
+
+# 작업 저장소/실행기 (gunicorn 워커 간 공유)
+task_store = TaskStore(Config.TASKS_DB_PATH, log_buffer_size=Config.TASK_LOG_BUFFER_SIZE,
+                       queue_ttl=Config.TASK_QUEUE_TTL)
+task_runner = TaskRunner(task_store,
+                         max_processes=Config.TASK_PROCESSES,
+                         max_active_tasks=Config.MAX_ACTIVE_TASKS,
+                         max_active_sweeps=Config.SWEEP_MAX_ACTIVE,
+                         result_ttl=Config.TASK_RESULT_TTL)
+
+# 로깅 설정 (파일/콘솔 기록은 백그라운드 스레드에서 처리, LOTTO_LOG_LEVEL 로 레벨 변경)
+log_formatter = logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s')
+log_handlers = [
+    logging.FileHandler(Config.LOGS_DIR / 'webapp.log', encoding='utf-8', mode='a'),
+    logging.StreamHandler(sys.stdout) # stdout에 대한 인코딩 설정
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+log_pipeline = async_logging.get_pipeline(logging.getLogger(), log_handlers,
+                                          level=async_logging.level_from_env(logging.INFO))
 logger = logging.getLogger(__name__)
 
 # 폰트 설정
@@ -72,22 +88,16 @@ class ModelState:
         )
 
     def save_to_file(self, filepath):
-        with open(filepath, 'wb') as f:
-            pickle.dump({
-                'numbers_memory': self.numbers_memory,
-                'number_stats': self.number_stats,
-                'score': self.score
-            }, f)
+        state_file.save_model_state(filepath, self.numbers_memory, self.number_stats, self.score)
 
     @classmethod
     def load_from_file(cls, filepath):
-        with open(filepath, 'rb') as f:
-            data = pickle.load(f)
-            return cls(
-                numbers_memory=data.get('numbers_memory', {}),
-                number_stats=data.get('number_stats', {}),
-                score=data.get('score', 0)
-            )
+        data = state_file.load_model_state(filepath)
+        return cls(
+            numbers_memory=data['numbers_memory'],
+            number_stats=data['number_stats'],
+            score=data['score']
+        )
 
 
 class DatabaseManager:
@@ -98,7 +108,7 @@ class DatabaseManager:
 
     def connect(self):
         try:
-            return sqlite3.connect(self.db_path)
+            return sqlite3.connect(self.db_path, factory=MetricsConnection)
         except Error as e:
             logger.error("Database connection error", exc_info=True)
             raise
@@ -219,12 +229,9 @@ class LottoAnalyzer:
         self.number_stats = copy.deepcopy(state.number_stats)
 
     def analyze_historical_data(self, df: pd.DataFrame):
-        total_records = len(df)
-
-        for _, row in df.iterrows():
-            numbers = [row[f'num{i}'] for i in range(1, 7)]
-            for num in numbers:
-                self.number_stats[num] += 1
+        counts = history_kernels.number_counts(history_kernels.draws_matrix(df))
+        for num, count in history_kernels.counts_to_dict(counts).items():
+            self.number_stats[num] += count
 
     def select_numbers(self) -> list:
         weights = list(self.numbers_memory.values())
@@ -275,31 +282,22 @@ def start_prediction():
         if iterations <= 0:
             return jsonify({'error': '학습 반복 횟수는 1 이상이어야 합니다'}), 400
 
-        # 작업 ID 생성
-        task_id = datetime.now().strftime('%Y%m%d%H%M%S')
-
-        # 작업 초기화
-        results[task_id] = {
-            'status': 'initializing',
-            'progress': 0,
-            'log_messages': [],
-            'predictions': [],
-            'graphs': None
+        # 예측 작업 등록 및 프로세스 풀에서 실행
+        params = {
+            'games': games,
+            'learning_rate': learning_rate,
+            'iterations': iterations,
+            'draw_limit': draw_limit
         }
-
-        # 예측 작업 시작
-        thread = threading.Thread(
-            target=run_prediction,
-            args=(task_id, games, learning_rate, iterations, draw_limit)
-        )
-        thread.daemon = True
-        thread.start()
+        task_id = task_runner.submit(run_prediction, params, games, learning_rate, iterations, draw_limit)
 
         return jsonify({
             'task_id': task_id,
             'message': '예측이 시작되었습니다.'
         })
 
+    except TaskLimitExceeded as e:
+        return jsonify({'error': str(e)}), 429
     except Exception as e:
         logger.error(f"Prediction start error: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
@@ -311,45 +309,110 @@ def help_page():
 
 @app.route('/get_progress/<task_id>')
 def get_progress(task_id):
-    if task_id not in results:
+    task_runner.purge_expired()
+    task = task_store.get_task(task_id)
+    if task is None:
         return jsonify({'error': 'Task not found'}), 404
 
-    # NumPy 타입을 Python 기본 타입으로 변환
-    def convert_to_serializable(obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return obj
-
-    # 결과 딕셔너리의 모든 값을 변환
-    serializable_results = {}
-    for key, value in results[task_id].items():
-        if isinstance(value, dict):
-            serializable_results[key] = {k: convert_to_serializable(v) for k, v in value.items()}
-        else:
-            serializable_results[key] = convert_to_serializable(value)
+    return jsonify({
+        'status': task['status'],
+        'progress': task['progress'],
+        'log_messages': task['log_messages'],
+        'predictions': task['predictions'] or [],
+        'graphs': task['graphs'],
+        'score': task['score'],
+        'error': task['error'],
+        'file_path': task['file_path']
+    })
+
+
+@app.route('/progress/<task_id>/stream')
+def progress_stream(task_id):
+    """진행 상황 Server-Sent Events 스트림
+
+    새 로그 줄(event: log, id = 로그 순번)과 진행률 변화(event: progress)만 전송하고,
+    작업이 끝나면 최종 결과(event: done)를 보낸 뒤 종료한다.
+    재연결 시 브라우저가 보내는 Last-Event-ID 이후의 로그부터 이어서 전송한다.
+    """
+    task_runner.purge_expired()
+    if task_store.get_task(task_id, include_logs=False) is None:
+        return jsonify({'error': 'Task not found'}), 404
 
-    return jsonify(serializable_results)
+    last_seq = request.headers.get('Last-Event-ID', type=int) or request.args.get('after', 0, type=int)
+
+    def sse(event, data, event_id=None):
+        lines = [f'event: {event}']
+        if event_id is not None:
+            lines.append(f'id: {event_id}')
+        lines.append(f'data: {json.dumps(data, ensure_ascii=False)}')
+        return '\n'.join(lines) + '\n\n'
+
+    def generate(after_seq):
+        deadline = time.monotonic() + Config.PROGRESS_STREAM_MAX_SECONDS
+        last_state = None
+        yield 'retry: 1000\n\n'
+
+        while True:
+            task = task_store.get_task(task_id, include_logs=False)
+            if task is None:
+                yield sse('done', {'status': 'expired'})
+                return
+
+            for seq, message in task_store.get_logs(task_id, after_seq):
+                yield sse('log', message, seq)
+                after_seq = seq
+
+            state = (task['status'], task['progress'])
+            if state != last_state:
+                last_state = state
+                yield sse('progress', {'status': task['status'], 'progress': task['progress']})
+
+            if task['status'] not in ('queued', 'running'):
+                yield sse('done', {
+                    'status': task['status'],
+                    'progress': task['progress'],
+                    'predictions': task['predictions'] or [],
+                    'graphs': task['graphs'],
+                    'score': task['score'],
+                    'error': task['error']
+                })
+                return
+
+            if time.monotonic() >= deadline:
+                # 연결을 닫으면 브라우저가 Last-Event-ID 와 함께 재연결
+                return
+            time.sleep(Config.PROGRESS_STREAM_INTERVAL)
+
+    return Response(generate(last_seq), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/cancel_task/<task_id>', methods=['POST'])
+def cancel_task(task_id):
+    if task_store.get_task(task_id, include_logs=False) is None:
+        return jsonify({'error': 'Task not found'}), 404
+    if not task_runner.cancel(task_id):
+        return jsonify({'error': '이미 종료된 작업입니다'}), 409
+    return jsonify({'task_id': task_id, 'message': '작업 취소를 요청했습니다.'})
 
 
 @app.route('/get_graphs/<task_id>')
 def get_graphs(task_id):
-    if task_id not in results or 'graphs' not in results[task_id]:
+    task = task_store.get_task(task_id, include_logs=False)
+    if task is None or not task['graphs']:
         return jsonify({'error': 'Graphs not available'}), 404
-    return jsonify(results[task_id]['graphs'])
+    return jsonify(task['graphs'])
 
 
 @app.route('/download_results/<task_id>')
 def download_results(task_id):
-    if task_id not in results or not results[task_id].get('file_path'):
+    task = task_store.get_task(task_id, include_logs=False)
+    if task is None or not task['file_path']:
         return jsonify({'error': 'Results not available'}), 404
 
     try:
         return send_file(
-            results[task_id]['file_path'],
+            task['file_path'],
             as_attachment=True,
             download_name=f'lotto_prediction_{task_id}.xlsx'
         )
@@ -358,6 +421,84 @@ def download_results(task_id):
         return jsonify({'error': 'Download failed'}), 500
 
 
+@app.route('/start_sweep', methods=['POST'])
+def start_sweep():
+    """학습률/반복 수/학습 회차 수/시드 조합 탐색 작업 등록"""
+    try:
+        data = request.json or {}
+        try:
+            learning_rates = [float(v) for v in data.get('learning_rates', [0.05, 0.1, 0.2])]
+            iterations = [int(v) for v in data.get('iterations', [50, 100])]
+            draw_limits = [None if v == "전체" else int(v) for v in data.get('learning_draws', [100])]
+            seeds = int(data.get('seeds', 3))
+            random_count = int(data.get('random', 0))
+        except (TypeError, ValueError):
+            return jsonify({'error': '학습률, 반복 횟수, 학습 회차, 시드 수는 숫자 목록이어야 합니다'}), 400
+
+        # 입력값 검증
+        if not learning_rates or not iterations or not draw_limits:
+            return jsonify({'error': '학습률, 반복 횟수, 학습 회차를 하나 이상 지정해야 합니다'}), 400
+        if any(lr <= 0 or lr > 1 for lr in learning_rates):
+            return jsonify({'error': '학습률은 0과 1 사이여야 합니다'}), 400
+        if any(it <= 0 for it in iterations):
+            return jsonify({'error': '학습 반복 횟수는 1 이상이어야 합니다'}), 400
+        if any(limit is not None and limit <= 0 for limit in draw_limits):
+            return jsonify({'error': '학습 회차 수는 1 이상이어야 합니다'}), 400
+
+        if random_count > 0:
+            configs = sweep.random_configs(random_count, learning_rates, iterations, draw_limits)
+        else:
+            configs = sweep.grid_configs(learning_rates, iterations, draw_limits, range(max(seeds, 1)))
+        if len(configs) > Config.SWEEP_MAX_JOBS:
+            return jsonify({'error': f'탐색 조합은 최대 {Config.SWEEP_MAX_JOBS}개까지만 가능합니다 '
+                                     f'(요청 {len(configs)}개)'}), 400
+
+        params = {
+            'sweep': True,
+            'learning_rates': learning_rates,
+            'iterations': iterations,
+            'draw_limits': draw_limits,
+            'seeds': seeds,
+            'random': random_count,
+            'jobs': len(configs)
+        }
+        task_id = task_runner.submit(run_sweep, params, configs, Config.SWEEP_PROCESSES)
+
+        return jsonify({
+            'task_id': task_id,
+            'jobs': len(configs),
+            'message': '하이퍼파라미터 탐색이 시작되었습니다.'
+        })
+
+    except TaskLimitExceeded as e:
+        return jsonify({'error': str(e)}), 429
+    except Exception as e:
+        logger.error(f"Sweep start error: {str(e)}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/sweep_results/<task_id>')
+def sweep_results(task_id):
+    """탐색 리더보드 (JSON, ?format=csv 이면 CSV 파일 다운로드)"""
+    task = task_store.get_task(task_id, include_logs=False)
+    if task is None or not task['file_path'] or not (task['params'] or {}).get('sweep'):
+        return jsonify({'error': 'Sweep results not available'}), 404
+
+    json_path = Path(task['file_path'])
+    try:
+        if request.args.get('format') == 'csv':
+            return send_file(
+                json_path.with_name('leaderboard.csv'),
+                as_attachment=True,
+                download_name=f'lotto_sweep_{task_id}.csv'
+            )
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return jsonify(json.load(f))
+    except Exception as e:
+        logger.error(f"Sweep results error: {str(e)}", exc_info=True)
+        return jsonify({'error': 'Sweep results not available'}), 500
+
+
 # def run_prediction(task_id, games, learning_rate, iterations, draw_limit):
 #     """예측 실행 함수"""
 #     try:
@@ -492,155 +633,149 @@ def download_results(task_id):
 #     # 결과 딕셔너리의 모든 값을 변환
 #     results[task_id] = convert_values(results[task_id])
 
-def run_prediction(task_id, games, learning_rate, iterations, draw_limit):
-    """예측 실행 함수"""
-    try:
-        # 데이터베이스 매니저 초기화
-        db_manager = DatabaseManager()
-
-        # 분석기 초기화
-        analyzer = LottoAnalyzer(learning_rate)
-        learning_analyzer = LearningAnalyzer()
-
-        # 상태 업데이트
-        results[task_id] = {
-            'status': 'running',
-            'progress': 0,
-            'log_messages': ['데이터 로딩 중...']
-        }
+def run_prediction(task, games, learning_rate, iterations, draw_limit):
+    """예측 실행 함수 (프로세스 풀에서 실행, 상태는 task 를 통해 공유 저장소에 기록)"""
+    # 데이터베이스 매니저 초기화
+    db_manager = DatabaseManager()
+
+    # 분석기 초기화
+    analyzer = LottoAnalyzer(learning_rate)
+
+    # 상태 업데이트
+    task.log('데이터 로딩 중...')
+    task.flush()
+
+    # 데이터 로드
+    historical_data = db_manager.get_historical_data(draw_limit)
+    data_range = "전체" if not draw_limit else f"최근 {draw_limit}회차"
+
+    logger.info(f"데이터 로드 완료: {data_range}")
+    task.log(f"데이터 로드 완료: {data_range}")
+
+    overall_best_state = None
+    overall_best_score = 0.0
+    draws = history_kernels.draws_matrix(historical_data).tolist()
+    draw_numbers = history_kernels.draw_numbers(historical_data).tolist()
+    total_draws = len(draws)
+
+    # 배열 기반 학습 엔진 (반복마다 예측 1세트 + 평가 10세트를 한 번에 샘플링)
+    engine = MonteCarloEngine(learning_rate, analyzer.numbers_memory, analyzer.number_stats)
+
+    # 각 회차별 학습
+    for idx, (draw_number, actual_numbers) in enumerate(zip(draw_numbers, draws), 1):
+        task.log(f"\n=== {draw_number}회차 학습 ===")
+        task.log(f"실제 당첨번호: {actual_numbers}")
+
+        # 현재 회차 학습
+        draw_result = engine.train_draw(actual_numbers, iterations, eval_samples=10)
+        best_score = draw_result.best_score
+        match_summary = draw_result.match_summary
+
+        if draw_result.best_memory is not None and best_score > overall_best_score:
+            overall_best_score = float(best_score)
+            overall_best_state = ModelState(
+                numbers_memory=engine.to_dict(draw_result.best_memory),
+                number_stats=engine.to_dict(draw_result.best_stats, int),
+                score=overall_best_score
+            )
 
-        # 데이터 로드
-        historical_data = db_manager.get_historical_data(draw_limit)
-        data_range = "전체" if not draw_limit else f"최근 {draw_limit}회차"
-
-        logger.info(f"데이터 로드 완료: {data_range}")
-        results[task_id]['log_messages'].append(f"데이터 로드 완료: {data_range}")
-
-        overall_best_state = None
-        overall_best_score = 0.0
-        total_draws = len(historical_data)
-
-        # 각 회차별 학습
-        for idx, row in enumerate(historical_data.iterrows(), 1):
-            _, data = row
-            draw_number = int(data['draw_number'])
-            actual_numbers = [int(data[f'num{i}']) for i in range(1, 7)]
-
-            results[task_id]['log_messages'].append(f"\n=== {draw_number}회차 학습 ===")
-            results[task_id]['log_messages'].append(f"실제 당첨번호: {actual_numbers}")
-
-            # 현재 회차 학습
-            best_state = None
-            best_score = 0.0
-            match_summary = {i: 0 for i in range(7)}
-
-            for iteration in range(iterations):
-                predicted_numbers = analyzer.select_numbers()
-                matches = len(set(predicted_numbers) & set(actual_numbers))
-                match_summary[matches] += 1
-
-                current_score, _ = learning_analyzer.evaluate_model(
-                    analyzer, actual_numbers, iterations=10
-                )
-                current_score = float(current_score)
-
-                if current_score > best_score:
-                    best_score = float(current_score)
-                    best_state = analyzer.get_state()
-                    best_state.score = best_score
-
-                    if current_score > overall_best_score:
-                        overall_best_score = float(current_score)
-                        overall_best_state = best_state.copy()
-
-                if matches > 0:
-                    analyzer.update_weights(
-                        list(set(predicted_numbers) & set(actual_numbers)),
-                        int(matches)
-                    )
+        # 회차별 결과 요약
+        summary_text = (
+            f"학습 완료:\n"
+            f"- 최고 점수: {best_score:.2f}\n"
+            f"- 매칭 통계:\n"
+        )
 
-            # 회차별 결과 요약
-            summary_text = (
-                f"학습 완료:\n"
-                f"- 최고 점수: {best_score:.2f}\n"
-                f"- 매칭 통계:\n"
-            )
+        for matches, count in match_summary.items():
+            if count > 0:
+                percentage = float(count / iterations * 100)
+                summary_text += f"  {matches}개 일치: {count}회 ({percentage:.2f}%)\n"
 
-            for matches, count in match_summary.items():
-                if count > 0:
-                    percentage = float(count / iterations * 100)
-                    summary_text += f"  {matches}개 일치: {count}회 ({percentage:.2f}%)\n"
-
-            results[task_id]['log_messages'].append(summary_text)
-
-            # 진행률 업데이트
-            progress = float((idx / total_draws) * 100)
-            results[task_id]['progress'] = progress
-
-            # 분석기의 number_stats 업데이트
-            for num in actual_numbers:
-                analyzer.number_stats[num] = analyzer.number_stats.get(num, 0) + 1
-
-        # 최종 예측 수행
-        if overall_best_state:
-            analyzer.set_state(overall_best_state)
-            final_predictions = []
-
-            for _ in range(games):
-                predicted_numbers = [int(x) for x in analyzer.select_numbers()]
-                final_predictions.append(predicted_numbers)
-                results[task_id]['predictions'] = final_predictions
-
-            # 그래프 생성
-            logger.info("Generating graphs...")
-            graphs = generate_plots(analyzer, historical_data)
-            if graphs:
-                logger.info("Graphs generated successfully")
-                results[task_id]['graphs'] = graphs
-            else:
-                logger.error("Failed to generate graphs")
+        task.log(summary_text)
 
-            # 결과 저장
-            file_path = save_results(task_id, final_predictions)
-            results[task_id]['file_path'] = str(file_path)
+        # 진행률 업데이트 (회차 단위로 저장소에 기록, 취소 요청 시 여기서 중단)
+        task.set_progress((idx / total_draws) * 100)
+        task.flush()
 
-            # 완료 상태 업데이트
-            results[task_id].update({
-                'status': 'completed',
-                'score': float(overall_best_score),
-                'log_messages': results[task_id]['log_messages'] + [
-                    f"\n예측 완료!\n"
-                    f"최고 성능 점수: {overall_best_score:.2f}\n"
-                    f"생성된 게임 수: {games}"
-                ]
-            })
+        # 출현 통계 업데이트
+        engine.observe_draw(actual_numbers)
 
-            logger.info(f"Prediction completed - Best score: {overall_best_score:.2f}")
+    # 학습된 가중치/통계를 분석기에 반영
+    analyzer.numbers_memory = engine.to_dict(engine.numbers_memory)
+    analyzer.number_stats = engine.to_dict(engine.number_stats, int)
 
-    except Exception as e:
-        logger.error(f"Prediction process error: {str(e)}", exc_info=True)
-        results[task_id].update({
-            'status': 'error',
-            'error': str(e),
-            'log_messages': results[task_id].get('log_messages', []) + [f"오류 발생: {str(e)}"]
-        })
+    # 최종 예측 수행
+    if overall_best_state:
+        analyzer.set_state(overall_best_state)
+        final_predictions = []
+
+        for _ in range(games):
+            predicted_numbers = [int(x) for x in analyzer.select_numbers()]
+            final_predictions.append(predicted_numbers)
+        task.update(predictions=final_predictions)
+
+        # 그래프 생성
+        logger.info("Generating graphs...")
+        graphs = generate_plots(analyzer, historical_data)
+        if graphs:
+            logger.info("Graphs generated successfully")
+            task.update(graphs=graphs)
+        else:
+            logger.error("Failed to generate graphs")
+
+        # 결과 저장
+        file_path = save_results(task.task_id, final_predictions)
+
+        # 완료 상태 업데이트
+        task.log(
+            f"\n예측 완료!\n"
+            f"최고 성능 점수: {overall_best_score:.2f}\n"
+            f"생성된 게임 수: {games}"
+        )
+        task.update(
+            status='completed',
+            progress=100.0,
+            score=float(overall_best_score),
+            file_path=str(file_path) if file_path else None
+        )
 
-    # 모든 숫자 타입을 Python 기본 타입으로 변환
-    def convert_values(d):
-        if isinstance(d, dict):
-            return {k: convert_values(v) for k, v in d.items()}
-        elif isinstance(d, list):
-            return [convert_values(x) for x in d]
-        elif isinstance(d, (np.integer, np.int32, np.int64)):
-            return int(d)
-        elif isinstance(d, (np.floating, np.float32, np.float64)):
-            return float(d)
-        elif isinstance(d, np.ndarray):
-            return d.tolist()
-        return d
-
-    # 결과 딕셔너리의 모든 값을 변환
-    results[task_id] = convert_values(results[task_id])
+        logger.info(f"Prediction completed - Best score: {overall_best_score:.2f}")
+
+
+def run_sweep(task, configs, processes):
+    """하이퍼파라미터 탐색 작업 (조합별 학습은 작업 내부 프로세스 풀에서 병렬 실행)"""
+    task.log('데이터 로딩 중...')
+    task.flush()
+
+    # 전체 이력을 한 번 읽고 조합마다 draw_limit 만큼 뒤에서 잘라 사용
+    history = history_kernels.draws_matrix(DatabaseManager().get_historical_data())
+    task.log(f"데이터 로드 완료: {len(history)}회차, 조합 {len(configs)}개, 프로세스 {processes}개")
+    task.flush()
+
+    def report(result, done, total):
+        limit = result['draw_limit'] or '전체'
+        task.log(f"[{done}/{total}] 학습률 {result['learning_rate']:.4f}, 반복 {result['iterations']}, "
+                 f"회차 {limit}, 시드 {result['seed']} -> 평균 점수 {result['mean_score']:.3f}")
+        task.set_progress(done / total * 100)
+        # 취소 요청 시 TaskCancelled 로 남은 조합 취소
+        task.flush()
+
+    start_time = time.perf_counter()
+    results = sweep.run_sweep(configs, history, processes, on_result=report)
+    elapsed = time.perf_counter() - start_time
+
+    meta = {'task_id': task.task_id, 'history_draws': len(history), 'processes': processes,
+            'elapsed': elapsed}
+    _, json_path = sweep.write_leaderboard(results, Config.SWEEPS_DIR / task.task_id, meta)
+
+    task.log(f"\n탐색 완료! ({elapsed:.2f}초)\n{sweep.format_leaderboard(results, 10)}")
+    task.update(
+        status='completed',
+        progress=100.0,
+        score=results[0]['mean_score'] if results else None,
+        file_path=str(json_path)
+    )
+    logger.info(f"Sweep completed - {len(results)} jobs in {elapsed:.2f}s")
 
 
 # def generate_plots(analyzer, historical_data):
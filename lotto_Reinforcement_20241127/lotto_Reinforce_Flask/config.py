@@ -14,10 +14,28 @@ class Config:
     LOGS_DIR = DATA_DIR / 'logs'
     PREDICTIONS_DIR = DATA_DIR / 'predictions'
     MODELS_DIR = DATA_DIR / 'models'
+    SWEEPS_DIR = DATA_DIR / 'sweeps'
 
     # 데이터베이스 설정
     DATABASE_PATH = DATA_DIR / 'lotto.db'
 
+    # 예측 작업 설정 (작업 상태는 워커 간 공유를 위해 별도 SQLite 에 저장)
+    TASKS_DB_PATH = DATA_DIR / 'tasks.db'
+    TASK_PROCESSES = int(os.getenv('TASK_PROCESSES', 1))  # 워커당 학습 프로세스 수
+    MAX_ACTIVE_TASKS = int(os.getenv('MAX_ACTIVE_TASKS', 2))  # 전체 동시 실행/대기 작업 수
+    TASK_LOG_BUFFER_SIZE = 2000  # 작업별 보관 로그 줄 수 (링 버퍼)
+    TASK_RESULT_TTL = 3600  # 종료된 작업 보관 시간 (초)
+    TASK_QUEUE_TTL = int(os.getenv('TASK_QUEUE_TTL', 6 * 3600))  # 대기 작업 최대 대기 시간 (초)
+
+    # 하이퍼파라미터 탐색(sweep) 설정 (작업 하나가 자체 프로세스 풀을 사용)
+    SWEEP_PROCESSES = int(os.getenv('SWEEP_PROCESSES', os.cpu_count() or 1))  # 탐색 작업당 프로세스 수
+    SWEEP_MAX_JOBS = int(os.getenv('SWEEP_MAX_JOBS', 200))  # 탐색 한 번에 실행할 최대 조합 수
+    SWEEP_MAX_ACTIVE = int(os.getenv('SWEEP_MAX_ACTIVE', 1))  # 전체 동시 실행/대기 탐색 작업 수
+
+    # 진행 상황 스트림(SSE) 설정
+    PROGRESS_STREAM_INTERVAL = 0.5  # 저장소 확인 주기 (초)
+    PROGRESS_STREAM_MAX_SECONDS = 60  # 연결 유지 최대 시간 (sync 워커 점유 방지, 브라우저가 자동 재연결)
+
     # 웹 서버 설정
     SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-here')
     DEBUG = os.getenv('FLASK_ENV') == 'development'
@@ -25,7 +43,7 @@ class Config:
     @classmethod
     def init_app(cls, app):
         # 필요한 디렉토리 생성
-        for directory in [cls.DATA_DIR, cls.LOGS_DIR, cls.PREDICTIONS_DIR, cls.MODELS_DIR]:
+        for directory in [cls.DATA_DIR, cls.LOGS_DIR, cls.PREDICTIONS_DIR, cls.MODELS_DIR, cls.SWEEPS_DIR]:
             directory.mkdir(exist_ok=True)
 
         # 앱 설정 적용
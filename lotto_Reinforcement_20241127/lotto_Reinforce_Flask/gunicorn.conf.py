@@ -3,7 +3,19 @@ os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
 os.environ.setdefault('LANG', 'ko_KR.UTF-8')
 os.environ.setdefault('LC_ALL', 'ko_KR.UTF-8')
 
+# 워커 간 /metrics 집계를 위한 공유 디렉토리
+os.environ.setdefault('METRICS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'metrics'))
+
 bind = "127.0.0.1:5000"
 workers = 4
 worker_class = "sync"
-timeout = 300
\ No newline at end of file
+timeout = 300
+
+
+def on_starting(server):
+    """이전 실행에서 남은 워커 지표 파일 정리"""
+    metrics_dir = os.environ['METRICS_DIR']
+    if os.path.isdir(metrics_dir):
+        for filename in os.listdir(metrics_dir):
+            if filename.startswith('metrics_'):
+                os.remove(os.path.join(metrics_dir, filename))
\ No newline at end of file
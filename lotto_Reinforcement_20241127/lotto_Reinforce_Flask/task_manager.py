@@ -0,0 +1,435 @@
+# task_manager.py - 예측 작업 실행기 및 워커 간 공유 작업 저장소
+"""
+gunicorn 워커 여러 개가 같은 작업 상태를 볼 수 있도록 작업 상태/진행률/로그/결과를
+SQLite(WAL)에 저장하고, CPU 위주 학습은 GIL 영향을 받지 않도록 프로세스 풀에서 실행한다.
+
+- TaskStore: 작업 상태 저장소 (어느 워커에서든 조회 가능)
+- TaskRunner: 워커별 프로세스 풀 + 전역 동시 실행 제한 + 취소
+- TaskContext: 작업 함수가 로그/진행률을 기록하고 취소 여부를 확인하는 핸들
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('queued', 'running')
+FINISHED_STATUSES = ('completed', 'error', 'cancelled')
+
+# JSON 으로 저장하는 컬럼
+_JSON_FIELDS = ('params', 'predictions', 'graphs')
+
+
+class TaskCancelled(Exception):
+    """사용자 요청으로 작업이 취소됨"""
+
+
+class TaskLimitExceeded(Exception):
+    """동시 실행 가능한 작업 수 초과"""
+
+
+def _json_default(obj):
+    # NumPy 스칼라/배열을 Python 기본 타입으로 변환
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class TaskStore:
+    """SQLite 기반 작업 상태 저장소"""
+
+    def __init__(self, db_path, log_buffer_size=None, queue_ttl=None):
+        self.db_path = str(db_path)
+        # 작업별로 보관할 최근 로그 줄 수 (링 버퍼, None 이면 무제한)
+        self.log_buffer_size = log_buffer_size
+        # 대기(queued) 상태로 둘 수 있는 최대 시간 (초, None 이면 제한 없음)
+        self.queue_ttl = queue_ttl
+        self._init_db()
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self.connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        with self.connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS tasks (
+                    task_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    progress REAL DEFAULT 0,
+                    params TEXT,
+                    predictions TEXT,
+                    graphs TEXT,
+                    file_path TEXT,
+                    score REAL,
+                    error TEXT,
+                    cancel_requested INTEGER DEFAULT 0,
+                    log_count INTEGER DEFAULT 0,
+                    pid INTEGER,
+                    owner_pid INTEGER,
+                    created_at REAL,
+                    updated_at REAL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS task_logs (
+                    task_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    message TEXT,
+                    PRIMARY KEY (task_id, seq)
+                )
+            ''')
+            # 이전 버전 DB: 작업을 등록한 워커 pid 컬럼 추가
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(tasks)')}
+            if 'owner_pid' not in columns:
+                conn.execute('ALTER TABLE tasks ADD COLUMN owner_pid INTEGER')
+
+    # ------------------------------------------------------------------
+    # 생성/갱신
+    # ------------------------------------------------------------------
+    def create_task(self, params, max_active=None, max_sweeps=None):
+        """작업 등록. 전역 동시 실행 제한은 쓰기 잠금 안에서 확인한다.
+
+        max_sweeps: params['sweep'] 이 참인 탐색 작업의 동시 실행/대기 제한
+        (탐색 작업은 자체 프로세스 풀을 쓰므로 전체 작업 수와 별도로 묶는다)
+        """
+        task_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        now = time.time()
+
+        conn = self.connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            self._fail_orphaned_tasks(conn)
+            if max_active:
+                active = conn.execute(
+                    f"SELECT COUNT(*) FROM tasks WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+                    ACTIVE_STATUSES).fetchone()[0]
+                if active >= max_active:
+                    conn.execute('ROLLBACK')
+                    raise TaskLimitExceeded(f'동시에 실행할 수 있는 예측 작업은 최대 {max_active}개입니다')
+            if max_sweeps and params.get('sweep'):
+                rows = conn.execute(
+                    f"SELECT params FROM tasks WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+                    ACTIVE_STATUSES).fetchall()
+                sweeps = sum(1 for row in rows if (json.loads(row['params'] or 'null') or {}).get('sweep'))
+                if sweeps >= max_sweeps:
+                    conn.execute('ROLLBACK')
+                    raise TaskLimitExceeded(f'하이퍼파라미터 탐색은 동시에 최대 {max_sweeps}개까지 실행할 수 있습니다')
+            conn.execute(
+                'INSERT INTO tasks (task_id, status, params, owner_pid, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (task_id, 'queued', json.dumps(params, default=_json_default), os.getpid(), now, now))
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+        return task_id
+
+    def _fail_orphaned_tasks(self, conn):
+        """실행/대기 주체가 사라진 작업을 오류로 정리 (서버 재시작, 프로세스 강제 종료 등)
+
+        - running: 작업 프로세스(pid)가 없음
+        - queued: 작업을 등록한 워커(owner_pid)가 없거나 queue_ttl 초 넘게 시작되지 않음
+        """
+        now = time.time()
+        rows = conn.execute(
+            "SELECT task_id, status, pid, owner_pid, updated_at FROM tasks "
+            "WHERE status IN ('queued', 'running')").fetchall()
+        for row in rows:
+            if row['status'] == 'running':
+                if _pid_alive(row['pid']):
+                    continue
+                error = '작업 프로세스가 비정상 종료되었습니다'
+            elif not _pid_alive(row['owner_pid']):
+                error = '작업을 등록한 서버 프로세스가 종료되어 실행되지 않았습니다'
+            elif self.queue_ttl and now - row['updated_at'] > self.queue_ttl:
+                error = f'{self.queue_ttl}초 동안 실행되지 않아 대기 작업을 취소했습니다'
+            else:
+                continue
+            conn.execute(
+                "UPDATE tasks SET status = 'error', error = ?, updated_at = ? WHERE task_id = ?",
+                (error, now, row['task_id']))
+
+    def update(self, task_id, expected_status=None, **fields):
+        """필드 갱신. expected_status 를 주면 현재 상태가 그 값일 때만 갱신 (갱신 여부 반환)"""
+        if not fields:
+            return False
+        values = []
+        for key, value in fields.items():
+            if key in _JSON_FIELDS and value is not None:
+                value = json.dumps(value, default=_json_default)
+            values.append(value)
+        assignments = ', '.join(f'{key} = ?' for key in fields)
+        query = f'UPDATE tasks SET {assignments}, updated_at = ? WHERE task_id = ?'
+        params = (*values, time.time(), task_id)
+        if expected_status is not None:
+            query += ' AND status = ?'
+            params += (expected_status,)
+        with self.connection() as conn:
+            return conn.execute(query, params).rowcount > 0
+
+    def append_logs(self, task_id, messages, **fields):
+        """로그 메시지 추가 (필요하면 진행률 등 다른 필드도 같은 트랜잭션에서 갱신)"""
+        conn = self.connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT log_count FROM tasks WHERE task_id = ?', (task_id,)).fetchone()
+            start = row['log_count'] if row else 0
+            conn.executemany(
+                'INSERT INTO task_logs (task_id, seq, message) VALUES (?, ?, ?)',
+                [(task_id, start + i + 1, message) for i, message in enumerate(messages)])
+            fields['log_count'] = start + len(messages)
+            if self.log_buffer_size:
+                # 링 버퍼: 오래된 로그부터 제거해 작업당 저장량을 일정하게 유지
+                conn.execute('DELETE FROM task_logs WHERE task_id = ? AND seq <= ?',
+                             (task_id, fields['log_count'] - self.log_buffer_size))
+            assignments = ', '.join(f'{key} = ?' for key in fields)
+            conn.execute(f'UPDATE tasks SET {assignments}, updated_at = ? WHERE task_id = ?',
+                         (*fields.values(), time.time(), task_id))
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def purge_finished(self, ttl):
+        """종료 후 ttl 초가 지난 작업과 로그 삭제"""
+        cutoff = time.time() - ttl
+        placeholders = ','.join('?' * len(FINISHED_STATUSES))
+        with self.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                f'DELETE FROM task_logs WHERE task_id IN ('
+                f'SELECT task_id FROM tasks WHERE status IN ({placeholders}) AND updated_at < ?)',
+                (*FINISHED_STATUSES, cutoff))
+            cursor = conn.execute(
+                f'DELETE FROM tasks WHERE status IN ({placeholders}) AND updated_at < ?',
+                (*FINISHED_STATUSES, cutoff))
+            conn.execute('COMMIT')
+            return cursor.rowcount
+
+    def request_cancel(self, task_id):
+        """취소 요청. 이미 끝난 작업이면 False"""
+        with self.connection() as conn:
+            cursor = conn.execute(
+                f"UPDATE tasks SET cancel_requested = 1, updated_at = ? "
+                f"WHERE task_id = ? AND status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+                (time.time(), task_id, *ACTIVE_STATUSES))
+            return cursor.rowcount > 0
+
+    def is_cancel_requested(self, task_id):
+        with self.connection() as conn:
+            row = conn.execute('SELECT cancel_requested FROM tasks WHERE task_id = ?', (task_id,)).fetchone()
+        return bool(row and row['cancel_requested'])
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get_task(self, task_id, include_logs=True):
+        with self.connection() as conn:
+            row = conn.execute('SELECT * FROM tasks WHERE task_id = ?', (task_id,)).fetchone()
+            if row is None:
+                return None
+            task = dict(row)
+            for key in _JSON_FIELDS:
+                if task[key] is not None:
+                    task[key] = json.loads(task[key])
+            if include_logs:
+                task['log_messages'] = [
+                    r['message'] for r in conn.execute(
+                        'SELECT message FROM task_logs WHERE task_id = ? ORDER BY seq', (task_id,))]
+        return task
+
+    def get_logs(self, task_id, after_seq=0, limit=None):
+        """after_seq 이후의 로그 [(seq, message), ...]"""
+        query = 'SELECT seq, message FROM task_logs WHERE task_id = ? AND seq > ? ORDER BY seq'
+        params = (task_id, after_seq)
+        if limit:
+            query += ' LIMIT ?'
+            params += (limit,)
+        with self.connection() as conn:
+            return [(r['seq'], r['message']) for r in conn.execute(query, params)]
+
+
+class TaskContext:
+    """작업 함수에 전달되는 핸들. 로그는 모아 두었다가 flush 시 한 번에 기록한다."""
+
+    def __init__(self, store, task_id):
+        self.store = store
+        self.task_id = task_id
+        self._pending_logs = []
+        self._progress = None
+
+    def log(self, message):
+        self._pending_logs.append(message)
+
+    def set_progress(self, progress):
+        self._progress = float(progress)
+
+    def flush(self):
+        """대기 중인 로그/진행률 기록 후 취소 요청 확인"""
+        fields = {}
+        if self._progress is not None:
+            fields['progress'] = self._progress
+            self._progress = None
+        if self._pending_logs:
+            self.store.append_logs(self.task_id, self._pending_logs, **fields)
+            self._pending_logs = []
+        elif fields:
+            self.store.update(self.task_id, **fields)
+
+        if self.store.is_cancel_requested(self.task_id):
+            raise TaskCancelled()
+
+    def update(self, **fields):
+        self.flush()
+        self.store.update(self.task_id, **fields)
+
+
+def _run_task(func, db_path, log_buffer_size, task_id, args):
+    """프로세스 풀에서 실행되는 작업 진입점"""
+    store = TaskStore(db_path, log_buffer_size)
+    task = TaskContext(store, task_id)
+
+    # 대기 중에 취소되었거나 다른 워커가 오류로 정리한 작업(queue_ttl 초과 등)은 실행하지 않음
+    if store.is_cancel_requested(task_id):
+        store.update(task_id, expected_status='queued', status='cancelled')
+        return
+    if not store.update(task_id, expected_status='queued', status='running', pid=os.getpid()):
+        return
+    try:
+        func(task, *args)
+        task.flush()
+        current = store.get_task(task_id, include_logs=False)
+        if current and current['status'] not in FINISHED_STATUSES:
+            store.update(task_id, status='completed', progress=100.0)
+    except TaskCancelled:
+        task._pending_logs.append('작업이 취소되었습니다.')
+        store.append_logs(task_id, task._pending_logs, status='cancelled')
+    except Exception as e:
+        logger.error(f"Task {task_id} error: {str(e)}", exc_info=True)
+        task._pending_logs.append(f"오류 발생: {str(e)}")
+        store.append_logs(task_id, task._pending_logs, status='error', error=str(e))
+
+
+class TaskRunner:
+    """워커별 프로세스 풀에서 작업을 실행하고 공유 저장소에 상태를 기록"""
+
+    def __init__(self, store, max_processes=1, max_active_tasks=2, max_active_sweeps=1, result_ttl=None,
+                 purge_interval=60):
+        self.store = store
+        self.max_processes = max_processes
+        self.max_active_tasks = max_active_tasks
+        self.max_active_sweeps = max_active_sweeps
+        self.result_ttl = result_ttl
+        self.purge_interval = purge_interval
+        self._last_purge = float('-inf')
+        self._executor = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # gunicorn 워커 fork 이후에 풀을 만들도록 지연 생성
+        # 자식 프로세스가 강제 종료되면(OOM, kill) 풀은 다시 쓸 수 없으므로 새로 만든다
+        with self._lock:
+            if self._executor is not None and getattr(self._executor, '_broken', False):
+                logger.warning("작업 프로세스 풀이 손상되어 다시 생성합니다")
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_processes)
+            return self._executor
+
+    def _discard_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                executor.shutdown(wait=False)
+                self._executor = None
+
+    def submit(self, func, params, *args):
+        """작업 등록 후 실행. 동시 실행 제한 초과 시 TaskLimitExceeded"""
+        self.purge_expired()
+        task_id = self.store.create_task(params, self.max_active_tasks, self.max_active_sweeps)
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_run_task, func, self.store.db_path,
+                                     self.store.log_buffer_size, task_id, args)
+        except Exception as e:
+            # 등록한 대기 작업이 동시 실행 제한 자리를 차지하지 않도록 바로 오류 처리
+            self.store.update(task_id, status='error', error=f'작업을 시작하지 못했습니다: {e}')
+            if isinstance(e, BrokenProcessPool):
+                self._discard_executor(executor)
+            raise
+        with self._lock:
+            self._futures[task_id] = future
+        future.add_done_callback(lambda f, tid=task_id: self._on_done(tid, f))
+        return task_id
+
+    def purge_expired(self):
+        """result_ttl 이 지난 종료 작업 정리 (purge_interval 초에 한 번, 제출/조회 경로에서 호출)
+
+        새 작업 제출 없이 조회만 들어오는 서버에서도 종료된 작업과 로그가 남지 않도록 한다.
+        """
+        if not self.result_ttl:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_purge < self.purge_interval:
+                return 0
+            self._last_purge = now
+        return self.store.purge_finished(self.result_ttl)
+
+    def _on_done(self, task_id, future):
+        with self._lock:
+            self._futures.pop(task_id, None)
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            # 프로세스 풀 자체 오류 (자식 프로세스 강제 종료 등)
+            logger.error(f"Task {task_id} process failure: {exc}")
+            self.store.update(task_id, status='error', error=str(exc))
+
+    def cancel(self, task_id):
+        """작업 취소 요청. 대기 중이면 즉시, 실행 중이면 다음 flush 시점에 중단"""
+        if not self.store.request_cancel(task_id):
+            return False
+        with self._lock:
+            future = self._futures.get(task_id)
+        if future is not None and future.cancel():
+            self.store.update(task_id, status='cancelled')
+        return True
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
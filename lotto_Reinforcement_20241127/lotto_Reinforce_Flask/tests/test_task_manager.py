@@ -0,0 +1,156 @@
+# tests/test_task_manager.py - 작업 저장소/실행기의 고아 작업 정리, 동시 실행 제한, 풀 복구 테스트
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_manager import TaskLimitExceeded, TaskRunner, TaskStore, _run_task  # noqa: E402
+
+
+def _dead_pid():
+    """종료된 프로세스의 pid"""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def _record_run(task, marker):
+    with open(marker, 'w') as f:
+        f.write(task.task_id)
+
+
+def _kill_worker(task):
+    os._exit(1)
+
+
+def _wait_finished(store, task_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        task = store.get_task(task_id, include_logs=False)
+        if task['status'] not in ('queued', 'running'):
+            return task
+        time.sleep(0.05)
+    raise AssertionError(f'{task_id} 작업이 끝나지 않음')
+
+
+def _set(store, task_id, **fields):
+    assignments = ', '.join(f'{key} = ?' for key in fields)
+    with store.connection() as conn:
+        conn.execute(f'UPDATE tasks SET {assignments} WHERE task_id = ?', (*fields.values(), task_id))
+
+
+def test_queued_task_of_dead_owner_is_failed(tmp_path):
+    store = TaskStore(tmp_path / 'tasks.db')
+    first = store.create_task({}, max_active=2)
+    second = store.create_task({}, max_active=2)
+    for task_id in (first, second):
+        _set(store, task_id, owner_pid=_dead_pid())
+
+    # 두 고아 작업이 자리를 차지하고 있어도 새 작업을 등록할 수 있어야 한다
+    third = store.create_task({}, max_active=2)
+
+    assert store.get_task(first)['status'] == 'error'
+    assert store.get_task(second)['status'] == 'error'
+    assert store.get_task(third)['status'] == 'queued'
+
+
+def test_queued_task_past_ttl_is_failed(tmp_path):
+    store = TaskStore(tmp_path / 'tasks.db', queue_ttl=60)
+    stale = store.create_task({}, max_active=1)
+    _set(store, stale, updated_at=time.time() - 120)
+
+    fresh = store.create_task({}, max_active=1)
+
+    assert store.get_task(stale)['status'] == 'error'
+    assert store.get_task(fresh)['status'] == 'queued'
+
+
+def test_live_queued_task_counts_toward_limit(tmp_path):
+    store = TaskStore(tmp_path / 'tasks.db', queue_ttl=60)
+    task_id = store.create_task({}, max_active=1)
+
+    with pytest.raises(TaskLimitExceeded):
+        store.create_task({}, max_active=1)
+    assert store.get_task(task_id)['status'] == 'queued'
+
+
+def test_only_one_sweep_at_a_time(tmp_path):
+    store = TaskStore(tmp_path / 'tasks.db')
+    sweep_id = store.create_task({'sweep': True}, max_active=3, max_sweeps=1)
+
+    with pytest.raises(TaskLimitExceeded):
+        store.create_task({'sweep': True}, max_active=3, max_sweeps=1)
+    # 일반 예측 작업은 전체 제한 안에서 계속 등록 가능
+    store.create_task({}, max_active=3, max_sweeps=1)
+
+    store.update(sweep_id, status='completed')
+    store.create_task({'sweep': True}, max_active=3, max_sweeps=1)
+
+
+def test_running_task_of_dead_process_is_failed(tmp_path):
+    store = TaskStore(tmp_path / 'tasks.db')
+    task_id = store.create_task({}, max_active=1)
+    store.update(task_id, status='running', pid=_dead_pid())
+
+    store.create_task({}, max_active=1)
+
+    assert store.get_task(task_id)['status'] == 'error'
+
+
+def test_old_database_gets_owner_column(tmp_path):
+    import sqlite3
+
+    path = tmp_path / 'tasks.db'
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE tasks (task_id TEXT PRIMARY KEY, status TEXT NOT NULL, progress REAL DEFAULT 0, '
+                     'params TEXT, predictions TEXT, graphs TEXT, file_path TEXT, score REAL, error TEXT, '
+                     'cancel_requested INTEGER DEFAULT 0, log_count INTEGER DEFAULT 0, pid INTEGER, '
+                     'created_at REAL, updated_at REAL)')
+
+    store = TaskStore(path)
+    task_id = store.create_task({}, max_active=1)
+    assert store.get_task(task_id)['owner_pid'] == os.getpid()
+
+
+def test_failed_queued_task_is_not_started(tmp_path):
+    store = TaskStore(tmp_path / 'tasks.db', queue_ttl=60)
+    task_id = store.create_task({})
+    _set(store, task_id, updated_at=time.time() - 120)
+    store.create_task({})  # 대기 시간 초과로 오류 처리
+
+    marker = tmp_path / 'ran'
+    _run_task(_record_run, store.db_path, None, task_id, (str(marker),))
+
+    assert not marker.exists()
+    assert store.get_task(task_id)['status'] == 'error'
+
+
+def test_broken_pool_is_replaced(tmp_path):
+    store = TaskStore(tmp_path / 'tasks.db')
+    runner = TaskRunner(store, max_processes=1, max_active_tasks=1)
+    try:
+        crashed = runner.submit(_kill_worker, {})
+        assert _wait_finished(store, crashed)['status'] == 'error'
+
+        marker = tmp_path / 'ran'
+        task_id = runner.submit(_record_run, {}, str(marker))
+        assert _wait_finished(store, task_id)['status'] == 'completed'
+        assert marker.read_text() == task_id
+    finally:
+        runner.shutdown()
+
+
+def test_finished_tasks_are_purged_without_new_submissions(tmp_path):
+    store = TaskStore(tmp_path / 'tasks.db')
+    runner = TaskRunner(store, result_ttl=60, purge_interval=0)
+    task_id = store.create_task({})
+    store.append_logs(task_id, ['로그'], status='completed')
+    _set(store, task_id, updated_at=time.time() - 120)
+
+    assert runner.purge_expired() == 1
+    assert store.get_task(task_id) is None
+    assert store.get_logs(task_id) == []
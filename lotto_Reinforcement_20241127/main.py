@@ -16,7 +16,15 @@ import sys
 import matplotlib
 import matplotlib.font_manager as fm
 import copy
-import pickle
+
+# 저장소 공용 모듈 (lotto_common)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mc_engine import MonteCarloEngine
+from lotto_common import history_kernels
+from lotto_common import async_logging
+from lotto_common import state_file
+from lotto_common import tk_bridge
 
 
 class ModelState:
@@ -44,24 +52,18 @@ class ModelState:
         )
 
     def save_to_file(self, filepath):
-        """현재 상태를 파일로 저장"""
-        with open(filepath, 'wb') as f:
-            pickle.dump({
-                'numbers_memory': self.numbers_memory,
-                'number_stats': self.number_stats,
-                'score': self.score
-            }, f)
+        """현재 상태를 .lstate 파일로 저장"""
+        state_file.save_model_state(filepath, self.numbers_memory, self.number_stats, self.score)
 
     @classmethod
     def load_from_file(cls, filepath):
-        """파일에서 상태를 로드"""
-        with open(filepath, 'rb') as f:
-            data = pickle.load(f)
-            return cls(
-                numbers_memory=data.get('numbers_memory', {}),
-                number_stats=data.get('number_stats', {}),
-                score=data.get('score', 0)
-            )
+        """파일에서 상태를 로드 (.lstate 또는 기존 pickle)"""
+        data = state_file.load_model_state(filepath)
+        return cls(
+            numbers_memory=data['numbers_memory'],
+            number_stats=data['number_stats'],
+            score=data['score']
+        )
 
 
 class FileManager:
@@ -103,7 +105,7 @@ class FileManager:
     def get_model_file(self) -> Path:
         """모델 저장 파일 경로 반환"""
         current_datetime = datetime.now().strftime('%Y%m%d_%H%M%S')
-        return self.models_dir / f'best_model_{current_datetime}.pkl'
+        return self.models_dir / f'best_model_{current_datetime}.lstate'
 
 
 class LogManager:
@@ -118,10 +120,8 @@ class LogManager:
         log_file = self.file_manager.get_new_log_file()
 
         logger = logging.getLogger('LottoPrediction')
-        logger.setLevel(logging.INFO)  # DEBUG에서 INFO로 변경
 
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
 
         formatter = logging.Formatter(
             '[%(asctime)s] %(levelname)s: %(message)s',
@@ -129,25 +129,38 @@ class LogManager:
         )
         file_handler.setFormatter(formatter)
 
-        logger.handlers = []
-        logger.addHandler(file_handler)
+        # 파일 기록은 백그라운드 스레드에서 (LOTTO_LOG_LEVEL=DEBUG 로 디버그 로그 활성화)
+        self.pipeline = async_logging.get_pipeline(logger, [file_handler],
+                                                   level=async_logging.level_from_env(logging.INFO))
+        self.sampler = async_logging.LogSampler()
         self.logger = logger
 
-    def log_info(self, message: str):
-        """정보 로깅"""
-        self.logger.info(message)
+    def log_info(self, message: str, *args):
+        """정보 로깅 (args 가 있으면 기록 시점에 message % args 로 포맷)"""
+        self.logger.info(message, *args)
 
-    def log_error(self, message: str, exc_info=None):
+    def log_error(self, message: str, *args, exc_info=None):
         """에러 로깅"""
-        if exc_info:
-            self.logger.error(message, exc_info=exc_info)
-        else:
-            self.logger.error(message)
+        self.logger.error(message, *args, exc_info=exc_info)
+
+    @property
+    def debug_enabled(self) -> bool:
+        """디버그 로그가 켜져 있는지 (포맷 비용이 큰 로그 앞에서 확인)"""
+        return self.logger.isEnabledFor(logging.DEBUG)
 
-    def log_debug(self, message: str):
+    def log_debug(self, message: str, *args):
         """디버그 정보 로깅"""
-        if not message.startswith("Selected numbers"):  # Selected numbers 로깅 제외
-            self.logger.debug(message)
+        if self.debug_enabled and not message.startswith("Selected numbers"):  # Selected numbers 로깅 제외
+            self.logger.debug(message, *args)
+
+    def log_debug_sampled(self, key: str, message: str, *args):
+        """반복 루프용 디버그 로깅 (key 별로 처음 1회와 이후 sampler.every 번째 호출만 기록)"""
+        if self.debug_enabled and self.sampler(key):
+            self.logger.debug(message, *args)
+
+    def close(self):
+        """대기 중인 로그를 모두 기록"""
+        self.pipeline.stop()
 
 
 class DatabaseManager:
@@ -330,15 +343,15 @@ class LottoAnalyzer:
         self.log_manager.log_info("Starting historical data analysis")
         total_records = len(df)
 
-        for _, row in df.iterrows():
-            numbers = [row[f'num{i}'] for i in range(1, 7)]
-            for num in numbers:
-                self.number_stats[num] += 1
+        counts = history_kernels.number_counts(history_kernels.draws_matrix(df))
+        for num, count in history_kernels.counts_to_dict(counts).items():
+            self.number_stats[num] += count
 
         # 통계 정보 로깅
-        for num, count in self.number_stats.items():
-            frequency = count / total_records * 100
-            self.log_manager.log_debug(f"Number {num}: {count} occurrences ({frequency:.2f}%)")
+        if self.log_manager.debug_enabled:
+            for num, count in self.number_stats.items():
+                self.log_manager.log_debug("Number %d: %d occurrences (%.2f%%)",
+                                           num, count, count / total_records * 100)
 
     def select_numbers(self) -> list:
         """가중치 기반 번호 선택"""
@@ -373,7 +386,7 @@ class LottoAnalyzer:
             self.numbers_memory[num] += increase * (1 + frequency_factor)
 
             self.log_manager.log_debug(
-                f"Updated weight for number {num}: {old_weight:.2f} -> {self.numbers_memory[num]:.2f}"
+                "Updated weight for number %d: %.2f -> %.2f", num, old_weight, self.numbers_memory[num]
             )
 
 
@@ -399,6 +412,10 @@ class LottoPredictionGUI:
         self._setup_gui()
         self._setup_visualization()
 
+        # 학습 스레드의 화면 갱신은 큐를 거쳐 메인 루프에서 주기적으로 반영
+        self.ui = tk_bridge.TkUpdateQueue(self.root)
+        self.ui.set_scrollback(self.log_text)
+
         self.is_running = False
         self.best_model_state = None
         self.log_manager.log_info("Application started successfully")
@@ -500,7 +517,7 @@ class LottoPredictionGUI:
     def _prediction_thread(self):
         """예측 실행 스레드"""
         try:
-            self.status_var.set("데이터 로딩 중...")
+            self.ui.set(self.status_var, "데이터 로딩 중...")
             self.log_manager.log_info("Starting prediction process")
 
             # 학습 회차 설정 적용
@@ -512,72 +529,60 @@ class LottoPredictionGUI:
             # 학습 시작 정보 로깅
             data_range = "전체" if not draw_limit else f"최근 {draw_limit}회차"
             self.log_manager.log_info(f"학습 설정: {data_range}, 반복 횟수: {iterations}")
-            self.log_text.insert(tk.END, f"\n학습 설정:\n- 데이터: {data_range}\n- 반복 횟수: {iterations}\n")
+            self.ui.append(self.log_text, f"\n학습 설정:\n- 데이터: {data_range}\n- 반복 횟수: {iterations}\n")
 
             overall_best_state = None
             overall_best_score = 0
 
+            # 배열 기반 학습 엔진 (반복마다 예측/평가 세트를 한 번에 샘플링)
+            engine = MonteCarloEngine(self.analyzer.learning_rate,
+                                      self.analyzer.numbers_memory,
+                                      self.analyzer.number_stats)
+
             # 각 회차별 학습
-            total_draws = len(historical_data)
-            for idx, row in historical_data.iterrows():
+            draws = history_kernels.draws_matrix(historical_data).tolist()
+            draw_numbers = history_kernels.draw_numbers(historical_data).tolist()
+            total_draws = len(draws)
+            for idx, (draw_number, actual_numbers) in enumerate(zip(draw_numbers, draws)):
                 if not self.is_running:
                     break
 
-                draw_number = row['draw_number']
-                actual_numbers = [row[f'num{i}'] for i in range(1, 7)]
-
-                self.status_var.set(f"{draw_number}회차 학습 중... ({idx + 1}/{total_draws})")
+                self.ui.set(self.status_var, f"{draw_number}회차 학습 중... ({idx + 1}/{total_draws})")
 
                 # 학습 시작 로그
                 self.log_manager.log_info(f"\n=== {draw_number}회차 학습 시작 ===")
                 self.log_manager.log_info(f"실제 당첨번호: {actual_numbers}")
-                self.log_text.insert(tk.END, f"\n\n=== {draw_number}회차 학습 ===")
-                self.log_text.insert(tk.END, f"\n실제 당첨번호: {actual_numbers}")
+                self.ui.append(self.log_text, f"\n\n=== {draw_number}회차 학습 ===\n실제 당첨번호: {actual_numbers}")
 
-                # 현재 회차에서의 최고 성능 모델
-                best_state = None
-                best_score = 0
-                match_summary = {i: 0 for i in range(7)}  # 0~6개 일치 횟수
-
-                # iterations 횟수만큼 학습 및 평가
-                for iteration in range(iterations):
-                    if not self.is_running:
-                        break
-
-                    # 번호 예측 및 평가
-                    predicted_numbers = self.analyzer.select_numbers()
-                    matches = len(set(predicted_numbers) & set(actual_numbers))
-                    match_summary[matches] += 1
-
-                    current_score, _ = learning_analyzer.evaluate_model(
-                        self.analyzer, actual_numbers
+                # iterations 횟수만큼 예측-평가(100세트)-가중치 갱신
+                draw_result = engine.train_draw(
+                    actual_numbers, iterations, eval_samples=100,
+                    should_stop=lambda: not self.is_running
+                )
+                best_score = draw_result.best_score
+                match_summary = draw_result.match_summary
+
+                # 현재 회차 최고 성능 모델이 전체 최고보다 좋으면 보관
+                if draw_result.best_memory is not None and best_score > overall_best_score:
+                    overall_best_score = best_score
+                    overall_best_state = ModelState(
+                        numbers_memory=engine.to_dict(draw_result.best_memory),
+                        number_stats=engine.to_dict(draw_result.best_stats, int),
+                        score=best_score
                     )
 
-                    if current_score > best_score:
-                        best_score = current_score
-                        best_state = self.analyzer.get_state()
-                        best_state.score = current_score
-
-                        if current_score > overall_best_score:
-                            overall_best_score = current_score
-                            overall_best_state = best_state.copy()
-
-                    # 가중치 업데이트
-                    if matches > 0:
-                        self.analyzer.update_weights(
-                            list(set(predicted_numbers) & set(actual_numbers)),
-                            matches
-                        )
+                # 회차별 가중치 상위 번호 (디버그 로그는 처음 1회와 sampler.every 회차마다만 기록)
+                self.log_manager.log_debug_sampled(
+                    'train_draw', "%d회차 학습 후 가중치 상위 번호: %s",
+                    draw_number, (np.argsort(engine.numbers_memory)[::-1][:6] + 1).tolist()
+                )
 
-                    # 진행 상황 표시
-                    if iteration % 10 == 0:
-                        progress = (idx * iterations + iteration) / (total_draws * iterations) * 100
-                        self.progress_var.set(progress)
-                        self.root.update_idletasks()
+                # 진행 상황 표시
+                self.ui.set(self.progress_var, (idx + 1) / total_draws * 100)
 
                 # 회차별 학습 결과 요약
                 result = learning_analyzer.analyze_match(
-                    draw_number, actual_numbers, predicted_numbers)
+                    draw_number, actual_numbers, draw_result.last_predicted)
 
                 summary_text = (
                     f"학습 완료:\n"
@@ -591,8 +596,11 @@ class LottoPredictionGUI:
                         summary_text += f"  {matches}개 일치: {count}회 ({percentage:.2f}%)\n"
 
                 self.log_manager.log_info(summary_text)
-                self.log_text.insert(tk.END, f"\n{draw_number}회차: {summary_text}")
-                self.log_text.see(tk.END)
+                self.ui.append(self.log_text, f"\n{draw_number}회차: {summary_text}")
+
+            # 학습된 가중치를 분석기에 반영
+            self.analyzer.numbers_memory = engine.to_dict(engine.numbers_memory)
+            self.analyzer.number_stats = engine.to_dict(engine.number_stats, int)
 
             if self.is_running and overall_best_state:
                 # 최고 성능 모델 저장
@@ -602,46 +610,46 @@ class LottoPredictionGUI:
                 self.analyzer.set_state(overall_best_state)
                 games = int(self.games_var.get())
 
-                self.status_var.set("최종 예측 생성 중...")
-                self.results_text.delete(1.0, tk.END)
-                self.results_text.insert(tk.END,
-                                      f"최고 성능 모델 점수: {overall_best_score:.2f}\n"
-                                      f"학습 데이터: {data_range}\n"
-                                      f"학습 반복 횟수: {iterations}\n\n"
-                                      )
+                self.ui.set(self.status_var, "최종 예측 생성 중...")
+                self.ui.clear(self.results_text)
+                self.ui.append(self.results_text,
+                               f"최고 성능 모델 점수: {overall_best_score:.2f}\n"
+                               f"학습 데이터: {data_range}\n"
+                               f"학습 반복 횟수: {iterations}\n\n"
+                               )
 
                 # 최종 예측 번호 생성
                 final_predictions = []
                 for game in range(games):
                     predicted_numbers = self.analyzer.select_numbers()
                     final_predictions.append(predicted_numbers)
-                    self.results_text.insert(tk.END, f"게임 {game + 1}: {predicted_numbers}\n")
+                    self.ui.append(self.results_text, f"게임 {game + 1}: {predicted_numbers}\n")
 
                 # 결과 저장
                 self._save_learning_results(learning_analyzer)
                 self._save_final_predictions(final_predictions)
-                self._update_analysis_graphs(historical_data)
-                self._update_stats_tab(historical_data)
+                self.ui.call(self._update_analysis_graphs, historical_data)
+                self.ui.call(self._update_stats_tab, historical_data)
 
-                self.status_var.set("완료")
+                self.ui.set(self.status_var, "완료")
                 self.log_manager.log_info(
                     f"Prediction process completed successfully\n"
                     f"Best model score: {overall_best_score:.2f}\n"
                     f"Generated {games} predictions"
                 )
-                messagebox.showinfo("완료",
-                                  f"예측이 완료되었습니다!\n"
-                                  f"최고 성능 점수: {overall_best_score:.2f}"
-                                  )
+                self.ui.call(messagebox.showinfo, "완료",
+                             f"예측이 완료되었습니다!\n"
+                             f"최고 성능 점수: {overall_best_score:.2f}"
+                             )
 
         except Exception as e:
             self.log_manager.log_error("Prediction process error", exc_info=True)
-            self.status_var.set("오류 발생")
-            messagebox.showerror("오류", f"예측 중 오류가 발생했습니다: {str(e)}")
+            self.ui.set(self.status_var, "오류 발생")
+            self.ui.call(messagebox.showerror, "오류", f"예측 중 오류가 발생했습니다: {str(e)}")
         finally:
             self.is_running = False
-            self.run_button.config(text="예측 시작")
-            self.progress_var.set(0)
+            self.ui.call(self.run_button.config, text="예측 시작")
+            self.ui.set(self.progress_var, 0)
 
     def run_prediction(self):
         """예측 실행"""
@@ -750,15 +758,8 @@ class LottoPredictionGUI:
 
     def _analyze_historical_data(self, df: pd.DataFrame):
         """과거 데이터 분석"""
-        number_stats = {i: 0 for i in range(1, 46)}
-        total_draws = len(df)
-
-        for _, row in df.iterrows():
-            numbers = [row[f'num{i}'] for i in range(1, 7)]
-            for num in numbers:
-                number_stats[num] += 1
-
-        return number_stats, total_draws
+        counts = history_kernels.number_counts(history_kernels.draws_matrix(df))
+        return history_kernels.counts_to_dict(counts), len(df)
 
     def _update_stats_tab(self, historical_data: pd.DataFrame):
         """통계 탭 업데이트"""
@@ -0,0 +1,166 @@
+# mc_engine.py - 가중치 학습용 배치 몬테카를로 엔진
+"""
+LottoAnalyzer 학습 루프(select_numbers / evaluate_model / update_weights)의 배치 버전
+
+- numbers_memory, number_stats 를 길이 45 float 배열로 유지
+- 6개 번호 조합을 Gumbel-top-k 로 한 번에 여러 세트 샘플링
+- 일치 개수는 64비트 비트마스크 AND 후 popcount 로 계산
+- 가중치 갱신은 np.add.at
+
+select_numbers 의 0.5 감쇠는 이미 뽑힌 번호에만 적용되고, 뽑힌 번호는 다시 나와도
+버려지므로 나머지 번호 사이의 상대 확률은 변하지 않는다. 즉 분포는 "가중치 비례 비복원
+순차 추출"과 같고, Gumbel-top-k 는 이 분포를 정확히 재현한다.
+
+회차 내 반복(iteration)은 매번 갱신된 가중치로 다음 샘플을 뽑아야 하므로 순차로 두고,
+반복 하나에 필요한 예측 1세트 + 평가 N세트를 한 번의 배열 연산으로 처리한다.
+"""
+import numpy as np
+
+NUMBER_COUNT = 45
+PICK_COUNT = 6
+
+# 일치 개수별 점수 (LearningAnalyzer._calculate_match_score 와 동일)
+SCORE_TABLE = np.array([0, 0, 1, 5, 20, 50, 1000], dtype=np.float64)
+
+_BIT = np.uint64(1) << np.arange(NUMBER_COUNT, dtype=np.uint64)
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(values):
+        """uint64 배열의 비트 수"""
+        return np.bitwise_count(values).astype(np.int64)
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+    def popcount(values):
+        """uint64 배열의 비트 수 (바이트 단위 조회표)"""
+        values = np.ascontiguousarray(values, dtype=np.uint64)
+        return _BYTE_POPCOUNT[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1)
+
+
+def to_masks(index_sets):
+    """0 기반 번호 인덱스 [n,6] -> 비트마스크 [n]"""
+    return np.bitwise_or.reduce(_BIT[index_sets], axis=-1)
+
+
+def numbers_to_mask(numbers):
+    """1 기반 번호 리스트 -> 비트마스크"""
+    return np.bitwise_or.reduce(_BIT[np.asarray(numbers, dtype=np.int64) - 1])
+
+
+class DrawTrainingResult:
+    """회차 하나의 학습 결과"""
+
+    def __init__(self, best_score, best_memory, best_stats, match_summary, last_predicted, iterations_run):
+        self.best_score = best_score
+        self.best_memory = best_memory
+        self.best_stats = best_stats
+        self.match_summary = match_summary
+        self.last_predicted = last_predicted
+        self.iterations_run = iterations_run
+
+
+class MonteCarloEngine:
+    """배열 기반 가중치 학습 엔진"""
+
+    def __init__(self, learning_rate, numbers_memory=None, number_stats=None, seed=None):
+        self.learning_rate = learning_rate
+        self.numbers_memory = self.to_array(numbers_memory, 1.0)
+        self.number_stats = self.to_array(number_stats, 0.0)
+        self.rng = np.random.default_rng(seed)
+
+    # ------------------------------------------------------------------
+    # 상태 변환
+    # ------------------------------------------------------------------
+    @staticmethod
+    def to_array(values, default):
+        """{번호: 값} 딕셔너리 또는 배열 -> float64[45]"""
+        if values is None:
+            return np.full(NUMBER_COUNT, default, dtype=np.float64)
+        if isinstance(values, dict):
+            return np.array([values.get(n, default) for n in range(1, NUMBER_COUNT + 1)], dtype=np.float64)
+        return np.array(values, dtype=np.float64)
+
+    @staticmethod
+    def to_dict(values, cast=float):
+        """float64[45] -> {번호: 값} 딕셔너리 (ModelState 호환)"""
+        return {n: cast(values[n - 1]) for n in range(1, NUMBER_COUNT + 1)}
+
+    def load(self, numbers_memory, number_stats):
+        self.numbers_memory = self.to_array(numbers_memory, 1.0)
+        self.number_stats = self.to_array(number_stats, 0.0)
+
+    # ------------------------------------------------------------------
+    # 샘플링/평가
+    # ------------------------------------------------------------------
+    def sample_indices(self, n):
+        """현재 가중치로 6개 조합 n세트 샘플링 (0 기반 인덱스, 정렬되지 않음)"""
+        keys = np.log(self.numbers_memory) + self.rng.gumbel(size=(n, NUMBER_COUNT))
+        return np.argpartition(-keys, PICK_COUNT - 1, axis=1)[:, :PICK_COUNT]
+
+    def sample(self, n):
+        """현재 가중치로 6개 조합 n세트 샘플링 (1 기반 번호, 오름차순) -> int[n,6]"""
+        return np.sort(self.sample_indices(n), axis=1) + 1
+
+    def evaluate(self, actual_numbers, samples=100):
+        """evaluate_model 과 같은 평균 점수와 일치 개수 분포"""
+        matches = popcount(to_masks(self.sample_indices(samples)) & numbers_to_mask(actual_numbers))
+        return float(SCORE_TABLE[matches].mean()), np.bincount(matches, minlength=PICK_COUNT + 1)
+
+    # ------------------------------------------------------------------
+    # 학습
+    # ------------------------------------------------------------------
+    def update_weights(self, matched_indices, score):
+        """일치한 번호(0 기반 인덱스)의 가중치 증가 (update_weights 와 같은 규칙)"""
+        max_frequency = self.number_stats.max()
+        if max_frequency > 0:
+            frequency_factor = self.number_stats[matched_indices] / max_frequency
+        else:
+            frequency_factor = np.zeros(len(matched_indices))
+        np.add.at(self.numbers_memory, matched_indices,
+                  score * self.learning_rate * (1 + frequency_factor))
+
+    def observe_draw(self, actual_numbers):
+        """실제 당첨번호를 출현 통계에 반영"""
+        np.add.at(self.number_stats, np.asarray(actual_numbers, dtype=np.int64) - 1, 1)
+
+    def train_draw(self, actual_numbers, iterations, eval_samples=10, should_stop=None):
+        """회차 하나에 대해 iterations 번 예측-평가-갱신 반복
+
+        반복마다 예측 1세트와 평가 eval_samples 세트를 한 번에 샘플링한다.
+        최고 점수 시점의 가중치/통계(갱신 전)를 함께 반환한다.
+        """
+        actual_mask = numbers_to_mask(actual_numbers)
+        best_score = 0.0
+        best_memory = None
+        best_stats = None
+        match_summary = np.zeros(PICK_COUNT + 1, dtype=np.int64)
+        predicted = None
+        iterations_run = 0
+
+        for _ in range(iterations):
+            if should_stop is not None and should_stop():
+                break
+
+            indices = self.sample_indices(eval_samples + 1)
+            matches = popcount(to_masks(indices) & actual_mask)
+
+            predicted = indices[0]
+            predicted_matches = int(matches[0])
+            match_summary[predicted_matches] += 1
+
+            current_score = float(SCORE_TABLE[matches[1:]].mean())
+            if current_score > best_score:
+                best_score = current_score
+                best_memory = self.numbers_memory.copy()
+                best_stats = self.number_stats.copy()
+
+            if predicted_matches > 0:
+                hit = ((actual_mask >> predicted.astype(np.uint64)) & np.uint64(1)).astype(bool)
+                self.update_weights(predicted[hit], predicted_matches)
+
+            iterations_run += 1
+
+        last_predicted = sorted(int(i) + 1 for i in predicted) if predicted is not None else []
+        return DrawTrainingResult(best_score, best_memory, best_stats,
+                                  {i: int(c) for i, c in enumerate(match_summary)},
+                                  last_predicted, iterations_run)
@@ -0,0 +1,253 @@
+# sweep.py - 강화학습 예측기 하이퍼파라미터/시드 병렬 탐색
+"""
+run_prediction 의 학습 루프(learning_rate, iterations, draw_limit)를 여러 조합과 시드로
+프로세스 풀에서 동시에 돌려 점수/일치 분포를 비교한다.
+
+- 전체 당첨번호 이력은 한 번만 읽어 임시 .npy 로 저장하고, 작업 프로세스는 이를
+  읽기 전용 memmap 으로 열어 공유한다 (draw_limit 는 뒤에서부터 잘라 사용)
+- 작업 하나 = MonteCarloEngine 하나, 시드가 고정되면 프로세스 수와 무관하게 같은 결과
+- 작업 간 공유 상태가 없으므로 코어 수에 비례해 처리량이 늘어난다
+- 결과는 평균 최고 점수 순 리더보드로 정렬해 leaderboard.csv / leaderboard.json 에 저장
+
+사용 예:
+    python sweep.py --learning-rates 0.05 0.1 0.2 --iterations 50 100 --draw-limits 50 100 --seeds 3
+    python sweep.py --random 20 --learning-rates 0.01 0.5 --iterations 20 200 --processes 8
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from itertools import product
+
+import numpy as np
+
+from mc_engine import PICK_COUNT, MonteCarloEngine
+
+# 리더보드 열 순서 (CSV/표 출력)
+LEADERBOARD_COLUMNS = ('rank', 'learning_rate', 'iterations', 'draw_limit', 'seed', 'draws',
+                       'mean_score', 'best_score', 'last_score', 'hit3_rate', 'elapsed')
+
+# 작업 프로세스에서 공유하는 읽기 전용 이력 (int[N,6])
+_history = None
+
+
+def load_history(db_path):
+    """lotto_results 전체 이력 -> 회차 오름차순 당첨번호 행렬 int[N,6]"""
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            'SELECT num1, num2, num3, num4, num5, num6 FROM lotto_results ORDER BY draw_number ASC'
+        ).fetchall()
+    if not rows:
+        return np.empty((0, PICK_COUNT), dtype=np.int64)
+    return np.sort(np.array(rows, dtype=np.int64), axis=1)
+
+
+# ----------------------------------------------------------------------
+# 조합 생성
+# ----------------------------------------------------------------------
+def grid_configs(learning_rates, iterations, draw_limits, seeds):
+    """모든 (학습률, 반복 수, 학습 회차 수, 시드) 조합"""
+    return [
+        {'learning_rate': float(lr), 'iterations': int(it), 'draw_limit': limit, 'seed': int(seed)}
+        for lr, it, limit, seed in product(learning_rates, iterations, draw_limits, seeds)
+    ]
+
+
+def random_configs(count, learning_rates, iterations, draw_limits, seed=None):
+    """무작위 조합 count 개
+
+    학습률은 주어진 값의 최소~최대 구간에서 로그 균등, 반복 수는 최소~최대 정수 균등,
+    학습 회차 수는 주어진 값 중에서 고르고 작업마다 새 시드를 부여한다.
+    """
+    rng = np.random.default_rng(seed)
+    low_lr, high_lr = math.log(min(learning_rates)), math.log(max(learning_rates))
+    low_it, high_it = min(iterations), max(iterations)
+    configs = []
+    for _ in range(count):
+        configs.append({
+            'learning_rate': round(float(math.exp(rng.uniform(low_lr, high_lr))), 6),
+            'iterations': int(rng.integers(low_it, high_it + 1)),
+            'draw_limit': draw_limits[int(rng.integers(len(draw_limits)))],
+            'seed': int(rng.integers(2 ** 31))
+        })
+    return configs
+
+
+# ----------------------------------------------------------------------
+# 작업 실행
+# ----------------------------------------------------------------------
+def _init_worker(history_path):
+    global _history
+    _history = np.load(history_path, mmap_mode='r')
+
+
+def train_config(config, history=None):
+    """조합 하나를 run_prediction 과 같은 순서로 학습하고 점수/일치 분포를 반환"""
+    history = _history if history is None else history
+    limit = config['draw_limit']
+    draws = history[-limit:] if limit else history
+
+    start_time = time.perf_counter()
+    engine = MonteCarloEngine(config['learning_rate'], seed=config['seed'])
+    draw_scores = np.zeros(len(draws))
+    match_counts = np.zeros(PICK_COUNT + 1, dtype=np.int64)
+
+    for idx, actual_numbers in enumerate(draws):
+        draw_result = engine.train_draw(actual_numbers, config['iterations'], eval_samples=10)
+        draw_scores[idx] = draw_result.best_score
+        for matches, count in draw_result.match_summary.items():
+            match_counts[matches] += count
+        engine.observe_draw(actual_numbers)
+
+    total_predictions = int(match_counts.sum())
+    return {
+        **config,
+        'draws': len(draws),
+        'mean_score': float(draw_scores.mean()) if len(draws) else 0.0,
+        'best_score': float(draw_scores.max()) if len(draws) else 0.0,
+        'last_score': float(draw_scores[-1]) if len(draws) else 0.0,
+        'match_counts': match_counts.tolist(),
+        'hit3_rate': float(match_counts[3:].sum() / total_predictions) if total_predictions else 0.0,
+        'elapsed': time.perf_counter() - start_time
+    }
+
+
+def rank_results(results):
+    """평균 최고 점수 -> 최고 점수 -> 3개 이상 일치 비율 순으로 정렬하고 순위 부여"""
+    ranked = sorted(results, key=lambda r: (-r['mean_score'], -r['best_score'], -r['hit3_rate']))
+    for rank, result in enumerate(ranked, 1):
+        result['rank'] = rank
+    return ranked
+
+
+def run_sweep(configs, history, processes=None, on_result=None):
+    """조합 목록을 프로세스 풀에서 실행하고 순위가 매겨진 결과 목록을 반환
+
+    on_result(result, done, total) 는 작업이 끝날 때마다 호출되며, 예외를 던지면
+    남은 작업을 취소하고 그 예외를 그대로 전달한다 (웹 작업 취소용).
+    """
+    processes = processes or os.cpu_count() or 1
+    results = []
+
+    if processes == 1 or len(configs) <= 1:
+        for config in configs:
+            results.append(train_config(config, history))
+            if on_result is not None:
+                on_result(results[-1], len(results), len(configs))
+        return rank_results(results)
+
+    # 이력은 한 번만 파일로 내려 두고 작업 프로세스가 memmap 으로 공유
+    temp_dir = tempfile.mkdtemp(prefix='lotto_sweep_')
+    history_path = os.path.join(temp_dir, 'history.npy')
+    np.save(history_path, np.ascontiguousarray(history, dtype=np.int64))
+
+    executor = ProcessPoolExecutor(max_workers=min(processes, len(configs)),
+                                   initializer=_init_worker, initargs=(history_path,))
+    try:
+        futures = [executor.submit(train_config, config) for config in configs]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if on_result is not None:
+                on_result(results[-1], len(results), len(configs))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return rank_results(results)
+
+
+# ----------------------------------------------------------------------
+# 결과 저장/출력
+# ----------------------------------------------------------------------
+def write_leaderboard(results, output_dir, meta=None):
+    """leaderboard.csv (요약) / leaderboard.json (일치 분포 포함 전체) 저장 후 경로 반환"""
+    os.makedirs(output_dir, exist_ok=True)
+    csv_path = os.path.join(output_dir, 'leaderboard.csv')
+    json_path = os.path.join(output_dir, 'leaderboard.json')
+
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(LEADERBOARD_COLUMNS + tuple(f'match_{k}' for k in range(PICK_COUNT + 1)))
+        for result in results:
+            writer.writerow([result[c] if result[c] is not None else '' for c in LEADERBOARD_COLUMNS]
+                            + result['match_counts'])
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta or {}, 'results': results}, f, ensure_ascii=False, indent=2)
+
+    return csv_path, json_path
+
+
+def format_leaderboard(results, top=None):
+    """리더보드 표 문자열"""
+    lines = [f"{'순위':>4} {'학습률':>8} {'반복':>6} {'회차':>6} {'시드':>11} "
+             f"{'평균점수':>9} {'최고점수':>9} {'3+일치':>7} {'시간(초)':>8}"]
+    for result in results[:top]:
+        limit = result['draw_limit'] or '전체'
+        lines.append(f"{result['rank']:>4} {result['learning_rate']:>8.4f} {result['iterations']:>6} "
+                     f"{limit:>6} {result['seed']:>11} {result['mean_score']:>9.3f} "
+                     f"{result['best_score']:>9.2f} {result['hit3_rate']:>7.2%} {result['elapsed']:>8.2f}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='강화학습 예측기 학습률/반복 수/시드 병렬 탐색')
+    parser.add_argument('--db', default='lotto.db', help='당첨번호 데이터베이스 경로')
+    parser.add_argument('--learning-rates', type=float, nargs='+', default=[0.05, 0.1, 0.2])
+    parser.add_argument('--iterations', type=int, nargs='+', default=[50, 100])
+    parser.add_argument('--draw-limits', type=int, nargs='+', default=[100],
+                        help='학습 회차 수 (0 = 전체)')
+    parser.add_argument('--seeds', type=int, default=3, help='조합당 시드 수 (그리드 탐색)')
+    parser.add_argument('--random', type=int, default=0,
+                        help='지정하면 그리드 대신 무작위 조합 N개 (학습률/반복 수는 최소~최대 구간)')
+    parser.add_argument('--random-seed', type=int, default=None, help='무작위 조합 생성 시드')
+    parser.add_argument('--processes', type=int, default=None, help='프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--output', default=None, help='결과 저장 디렉토리 (기본: sweeps/<시각>)')
+    parser.add_argument('--top', type=int, default=20, help='출력할 상위 조합 수')
+    args = parser.parse_args(argv)
+
+    draw_limits = [limit or None for limit in args.draw_limits]
+    if args.random:
+        configs = random_configs(args.random, args.learning_rates, args.iterations, draw_limits,
+                                 args.random_seed)
+    else:
+        configs = grid_configs(args.learning_rates, args.iterations, draw_limits, range(args.seeds))
+
+    history = load_history(args.db)
+    if len(history) == 0:
+        print(f"{args.db} 에 당첨번호 데이터가 없습니다.")
+        return 1
+
+    processes = args.processes or os.cpu_count() or 1
+    print(f"이력 {len(history)}회차, 조합 {len(configs)}개, 프로세스 {processes}개")
+
+    def report(result, done, total):
+        print(f"[{done}/{total}] lr={result['learning_rate']:.4f} it={result['iterations']} "
+              f"draws={result['draws']} seed={result['seed']} -> 평균 {result['mean_score']:.3f}")
+
+    start_time = time.perf_counter()
+    results = run_sweep(configs, history, processes, on_result=report)
+    elapsed = time.perf_counter() - start_time
+
+    output_dir = args.output or os.path.join('sweeps', datetime.now().strftime('%Y%m%d_%H%M%S'))
+    meta = {'db': os.path.abspath(args.db), 'history_draws': len(history), 'processes': processes,
+            'elapsed': elapsed, 'mode': 'random' if args.random else 'grid'}
+    csv_path, json_path = write_leaderboard(results, output_dir, meta)
+
+    print()
+    print(format_leaderboard(results, args.top))
+    print(f"\n총 {elapsed:.2f}초 (작업 합계 {sum(r['elapsed'] for r in results):.2f}초)")
+    print(f"저장: {csv_path}, {json_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+여러 앱이 함께 쓰는 공용 모듈
+
+각 앱의 진입점에서 저장소 루트를 sys.path 에 추가한 뒤
+`from lotto_common import request_metrics` 처럼 불러온다.
+
+- request_metrics: Flask 요청/DB/캐시 계측과 /metrics 노출
+- history_kernels: 당첨번호 이력 집계용 배열 커널
+- state_file: ModelState 바이너리 저장 형식과 pickle 변환 도구
+- async_logging: 학습 루프용 비동기 로깅
+- tk_bridge: 작업 스레드 -> Tk 메인 루프 화면 갱신 브리지
+"""
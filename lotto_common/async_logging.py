@@ -0,0 +1,122 @@
+# lotto_common/async_logging.py - 학습 루프용 비동기 로깅
+"""
+로거 핸들러를 QueueHandler 하나로 바꾸고, 실제 파일/콘솔 기록은 QueueListener
+백그라운드 스레드에서 처리한다. 호출 스레드는 레코드를 큐에 넣기만 한다.
+
+- 메시지는 logger.debug("... %s", value) 처럼 인자로 넘겨 레벨이 꺼져 있으면 포맷하지 않는다
+- 안쪽 루프 디버그 로그는 LogSampler 로 키별 처음 1회와 every 번째 호출만 남긴다
+- fork 로 만든 자식 프로세스(ProcessPoolExecutor 등)에서는 큐와 기록 스레드를 새로 시작한다
+- 파이프라인은 logger 당 하나 (get_pipeline 으로 다시 만들면 기존 것의 핸들러만 교체)
+- 로그 레벨은 LOTTO_LOG_LEVEL 환경 변수(DEBUG, INFO ...)로 바꿀 수 있다
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+LOG_LEVEL_ENV = 'LOTTO_LOG_LEVEL'
+DEFAULT_SAMPLE_EVERY = 100
+
+# logger -> AsyncLogPipeline (종료/fork 훅은 모듈에서 한 번만 등록)
+_pipelines = {}
+_pipelines_lock = threading.Lock()
+
+
+def level_from_env(default=logging.INFO):
+    """LOTTO_LOG_LEVEL 환경 변수 -> 로그 레벨 (없거나 잘못되면 default)"""
+    value = os.environ.get(LOG_LEVEL_ENV, '').strip().upper()
+    level = logging.getLevelName(value) if value else default
+    return level if isinstance(level, int) else default
+
+
+def get_pipeline(logger, handlers, level=logging.INFO):
+    """logger 의 파이프라인 반환
+
+    LogManager/GUI 를 여러 번 만들어도 기록 스레드와 훅이 쌓이지 않도록, 이미 있으면
+    남은 레코드를 기록한 뒤 핸들러와 레벨만 바꿔 다시 시작한다.
+    """
+    with _pipelines_lock:
+        pipeline = _pipelines.get(logger)
+        if pipeline is None:
+            pipeline = _pipelines[logger] = AsyncLogPipeline(logger, handlers, level)
+        else:
+            pipeline.reset(handlers, level)
+        return pipeline
+
+
+def _stop_all():
+    for pipeline in list(_pipelines.values()):
+        pipeline.stop()
+
+
+def _restart_all_in_child():
+    for pipeline in list(_pipelines.values()):
+        pipeline._restart_in_child()
+
+
+atexit.register(_stop_all)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_all_in_child)
+
+
+class AsyncLogPipeline:
+    """logger 의 핸들러들을 백그라운드 스레드로 옮기는 파이프라인 (get_pipeline 으로 생성)"""
+
+    def __init__(self, logger, handlers, level=logging.INFO):
+        self.logger = logger
+        self.handlers = list(handlers)
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = logging.handlers.QueueHandler(self.queue)
+        self.listener = None
+
+        logger.handlers = [self.queue_handler]
+        logger.setLevel(level)
+
+        self.start()
+
+    def reset(self, handlers, level=logging.INFO):
+        """대기 중인 레코드를 기록하고 핸들러/레벨을 바꿔 다시 시작 (빠진 핸들러는 닫음)"""
+        self.stop()
+        for handler in self.handlers:
+            if handler not in handlers:
+                handler.close()
+        self.handlers = list(handlers)
+        self.logger.handlers = [self.queue_handler]
+        self.logger.setLevel(level)
+        self.start()
+
+    def start(self):
+        self.listener = logging.handlers.QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        """큐에 남은 레코드를 모두 기록하고 스레드 종료"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def _restart_in_child(self):
+        # 부모의 기록 스레드는 자식에 복사되지 않으므로 새 큐/스레드로 다시 시작
+        if self.listener is None:
+            return
+        self.queue = queue.SimpleQueue()
+        self.queue_handler.queue = self.queue
+        self.start()
+
+
+class LogSampler:
+    """키별로 처음 1회와 이후 every 번째 호출만 통과시키는 샘플러"""
+
+    def __init__(self, every=DEFAULT_SAMPLE_EVERY):
+        self.every = max(1, int(every))
+        self._counts = {}
+
+    def __call__(self, key):
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.every == 0
+
+    def reset(self):
+        self._counts.clear()
@@ -0,0 +1,173 @@
+# lotto_common/history_kernels.py - 당첨번호 이력 집계용 배열 커널
+"""
+DataFrame 을 iterrows 로 한 줄씩 도는 대신 int[N,6] 당첨번호 행렬 하나로
+번호/2개 조합/3개 조합 출현 수와 마지막 출현 회차를 한 번에 계산한다.
+
+- 번호: 0 기반 인덱스 (번호 n -> n-1), 길이 45 배열
+- 2개 조합: (a-1)*45 + (b-1) 로 인코딩 (a < b), 길이 45**2 배열
+- 3개 조합: (a-1)*45**2 + (b-1)*45 + (c-1) 로 인코딩 (a < b < c), 길이 45**3 배열
+
+인코딩된 1차원 배열은 reshape 만으로 45x45, 45x45x45 밀집 텐서가 된다.
+"""
+from itertools import combinations, permutations
+
+import numpy as np
+
+NUMBER_COUNT = 45
+PICK_COUNT = 6
+NUMBER_COLUMNS = [f'num{i}' for i in range(1, PICK_COUNT + 1)]
+
+PAIR_SIZE = NUMBER_COUNT ** 2
+TRIPLE_SIZE = NUMBER_COUNT ** 3
+
+# 정렬된 6개 번호에서 뽑는 조합의 열 위치 (15쌍, 20개 3조합)
+_PAIR_COLUMNS = np.array(list(combinations(range(PICK_COUNT), 2)), dtype=np.int64).T
+_TRIPLE_COLUMNS = np.array(list(combinations(range(PICK_COUNT), 3)), dtype=np.int64).T
+
+
+def draws_matrix(df, columns=NUMBER_COLUMNS):
+    """DataFrame -> 행마다 오름차순 정렬된 당첨번호 행렬 int[N,6]"""
+    if len(df) == 0:
+        return np.empty((0, PICK_COUNT), dtype=np.int64)
+    return np.sort(df[columns].to_numpy(dtype=np.int64), axis=1)
+
+
+def draw_numbers(df, column='draw_number'):
+    """DataFrame -> 회차 번호 배열 int[N]"""
+    return df[column].to_numpy(dtype=np.int64)
+
+
+def number_counts(draws):
+    """번호별 출현 수 int[45]"""
+    return np.bincount(draws.ravel() - 1, minlength=NUMBER_COUNT)
+
+
+def pair_codes(draws):
+    """정렬된 당첨번호 행렬 -> 회차별 2개 조합 코드 int[N,15]"""
+    index = draws - 1
+    return index[:, _PAIR_COLUMNS[0]] * NUMBER_COUNT + index[:, _PAIR_COLUMNS[1]]
+
+
+def triple_codes(draws):
+    """정렬된 당첨번호 행렬 -> 회차별 3개 조합 코드 int[N,20]"""
+    index = draws - 1
+    return ((index[:, _TRIPLE_COLUMNS[0]] * NUMBER_COUNT + index[:, _TRIPLE_COLUMNS[1]]) * NUMBER_COUNT
+            + index[:, _TRIPLE_COLUMNS[2]])
+
+
+def pair_counts(draws):
+    """2개 조합별 출현 수 int[45**2] (reshape(45, 45) 시 [a-1, b-1], a < b)"""
+    return np.bincount(pair_codes(draws).ravel(), minlength=PAIR_SIZE)
+
+
+def triple_counts(draws):
+    """3개 조합별 출현 수 int[45**3] (reshape(45, 45, 45) 시 [a-1, b-1, c-1], a < b < c)"""
+    return np.bincount(triple_codes(draws).ravel(), minlength=TRIPLE_SIZE)
+
+
+def last_seen(codes, draw_numbers, size):
+    """코드별 마지막 출현 회차 (한 번도 없으면 0)
+
+    codes 는 [N, k] 코드 행렬, draw_numbers 는 행마다의 회차 번호 [N]
+    """
+    result = np.zeros(size, dtype=np.int64)
+    if codes.size:
+        np.maximum.at(result, codes.ravel(), np.repeat(draw_numbers, codes.shape[1]))
+    return result
+
+
+def number_last_seen(draws, draw_numbers):
+    """번호별 마지막 출현 회차 int[45] (draw_numbers 대신 행 위치를 넘기면 마지막 출현 위치)"""
+    return last_seen(draws - 1, draw_numbers, NUMBER_COUNT)
+
+
+def consecutive_pairs(draws):
+    """회차 순서대로 연속 번호 쌍 (n, n+1) 의 시작 번호 int[M]"""
+    rows, cols = np.nonzero(np.diff(draws, axis=1) == 1)
+    return draws[rows, cols]
+
+
+class HistorySummary:
+    """당첨번호 이력 한 번 집계한 결과"""
+
+    def __init__(self, draws, draw_numbers):
+        self.draws = draws
+        self.draw_numbers = draw_numbers
+        self.total_draws = len(draws)
+        self.max_draw = int(draw_numbers.max()) if len(draw_numbers) else 0
+
+        self.number_counts = number_counts(draws)
+        # 번호별 마지막 출현 위치 (1 ~ N, 없으면 0)
+        self.number_last_position = number_last_seen(draws, np.arange(1, self.total_draws + 1))
+
+        codes = pair_codes(draws)
+        self.pair_counts = np.bincount(codes.ravel(), minlength=PAIR_SIZE)
+        self.pair_last_seen = last_seen(codes, draw_numbers, PAIR_SIZE)
+
+        codes = triple_codes(draws)
+        self.triple_counts = np.bincount(codes.ravel(), minlength=TRIPLE_SIZE)
+        self.triple_last_seen = last_seen(codes, draw_numbers, TRIPLE_SIZE)
+
+        self.consecutive_starts = consecutive_pairs(draws)
+
+
+def summarize_history(df):
+    """DataFrame(draw_number, num1~num6) -> HistorySummary"""
+    return HistorySummary(draws_matrix(df), draw_numbers(df))
+
+
+def encode_pattern(pattern):
+    """2개 또는 3개 번호 조합 -> 조합 코드 (순서 무관)"""
+    code = 0
+    for num in sorted(pattern):
+        code = code * NUMBER_COUNT + (num - 1)
+    return code
+
+
+def top_patterns(values, decode, limit=10):
+    """값이 큰 순서로 상위 limit 개 [((번호, ...), 값), ...]"""
+    codes = np.argsort(-values, kind='stable')[:limit]
+    codes = codes[values[codes] > 0]
+    return list(zip(map(tuple, decode(codes).tolist()), values[codes].tolist()))
+
+
+# ----------------------------------------------------------------------
+# 밀집 텐서
+# ----------------------------------------------------------------------
+def symmetric_pairs(values):
+    """인코딩된 2개 조합 배열 -> 대칭 45x45 행렬 ([a-1, b-1] == [b-1, a-1])"""
+    matrix = np.asarray(values).reshape(NUMBER_COUNT, NUMBER_COUNT)
+    return matrix + matrix.T
+
+
+def symmetric_triples(values):
+    """인코딩된 3개 조합 배열 -> 모든 축 순서에 대칭인 45x45x45 텐서"""
+    tensor = np.asarray(values).reshape(NUMBER_COUNT, NUMBER_COUNT, NUMBER_COUNT)
+    return sum(tensor.transpose(axes) for axes in permutations(range(3)))
+
+
+# ----------------------------------------------------------------------
+# 기존 딕셔너리 형식 변환
+# ----------------------------------------------------------------------
+def counts_to_dict(counts):
+    """번호별 배열 -> {번호: 값}"""
+    return {n: counts[n - 1].item() for n in range(1, NUMBER_COUNT + 1)}
+
+
+def decode_pairs(codes):
+    """2개 조합 코드 -> int[M,2] 번호 쌍"""
+    codes = np.asarray(codes, dtype=np.int64)
+    return np.stack([codes // NUMBER_COUNT, codes % NUMBER_COUNT], axis=-1) + 1
+
+
+def decode_triples(codes):
+    """3개 조합 코드 -> int[M,3] 번호 조합"""
+    codes = np.asarray(codes, dtype=np.int64)
+    return np.stack([codes // PAIR_SIZE, codes // NUMBER_COUNT % NUMBER_COUNT, codes % NUMBER_COUNT],
+                    axis=-1) + 1
+
+
+def pattern_dict(values, decode):
+    """0 이 아닌 조합만 {(번호, ...): 값} 딕셔너리로 변환"""
+    codes = np.flatnonzero(values)
+    return {tuple(combo): value for combo, value in zip(decode(codes).tolist(), values[codes].tolist())}
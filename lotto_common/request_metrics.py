@@ -0,0 +1,346 @@
+# lotto_common/request_metrics.py - 요청 단위 성능 지표 수집 및 Prometheus 노출
+"""
+Flask 앱 공용 계측 모듈
+
+- 라우트별 응답 시간 히스토그램, 상태 코드별 요청 수, 처리 중 요청 수
+- SQLite 쿼리 수/소요 시간 (MetricsConnection 팩토리 사용 시)
+- 캐시 적중/미스 횟수 (record_cache 호출)
+
+gunicorn 다중 워커 환경에서는 METRICS_DIR 환경 변수(또는 init_metrics 인자)에
+공유 디렉토리를 지정하면 워커별 스냅샷 파일을 합산해 /metrics 에서 노출한다.
+스냅샷은 워커의 데몬 스레드가 FLUSH_INTERVAL 마다, 그리고 프로세스 종료 시 기록한다.
+외부 패키지 없이 표준 라이브러리와 Flask만 사용한다.
+"""
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from flask import Response, g, has_request_context, request
+
+# 응답 시간 히스토그램 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 워커 스냅샷 파일 기록 간격 (초)
+FLUSH_INTERVAL = 1.0
+
+# 라벨 키 구분자 (JSON 직렬화용)
+_SEP = '\t'
+
+
+class RequestMetrics:
+    """프로세스(워커) 단위 지표 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.metrics_dir = None
+        self._last_flush = 0.0
+        self._flusher_pid = None
+        self.reset()
+
+    def reset(self):
+        """모든 지표 초기화"""
+        with self._lock:
+            self.requests = {}  # method\tendpoint\tstatus -> count
+            self.latency = {}  # endpoint -> {'buckets': [...], 'sum': s, 'count': n}
+            self.in_flight = 0
+            self.db = {}  # endpoint -> [count, seconds]
+            self.cache = {}  # name\tresult -> count
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def request_started(self):
+        self.start_flusher()
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method, endpoint, status, duration):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+            key = _SEP.join((method, endpoint, str(status)))
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            hist = self.latency.get(endpoint)
+            if hist is None:
+                hist = {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0}
+                self.latency[endpoint] = hist
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    hist['buckets'][i] += 1
+            hist['sum'] += duration
+            hist['count'] += 1
+
+        self.maybe_flush()
+
+    def record_db_query(self, duration):
+        endpoint = _current_endpoint()
+        with self._lock:
+            entry = self.db.setdefault(endpoint, [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+
+    def record_cache(self, name, hit):
+        key = _SEP.join((name, 'hit' if hit else 'miss'))
+        with self._lock:
+            self.cache[key] = self.cache.get(key, 0) + 1
+
+    # ------------------------------------------------------------------
+    # 워커 간 공유
+    # ------------------------------------------------------------------
+    def snapshot(self):
+        """현재 프로세스 지표를 JSON 직렬화 가능한 딕셔너리로 반환"""
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'requests': dict(self.requests),
+                'latency': {k: {'buckets': list(v['buckets']), 'sum': v['sum'], 'count': v['count']}
+                            for k, v in self.latency.items()},
+                'in_flight': self.in_flight,
+                'db': {k: list(v) for k, v in self.db.items()},
+                'cache': dict(self.cache)
+            }
+
+    def maybe_flush(self, force=False):
+        """공유 디렉토리가 설정된 경우 워커 스냅샷 파일 갱신"""
+        if not self.metrics_dir:
+            return
+        with self._flush_lock:
+            now = time.time()
+            if not force and now - self._last_flush < FLUSH_INTERVAL:
+                return
+            self._last_flush = now
+
+            path = os.path.join(self.metrics_dir, f'metrics_{os.getpid()}.json')
+            tmp_path = f'{path}.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.snapshot(), f)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass
+
+    def start_flusher(self):
+        """현재 프로세스의 주기적 스냅샷 기록 스레드 시작 (프로세스당 한 번)
+
+        gunicorn 은 앱을 불러온 뒤 워커를 fork 하므로 스레드는 워커의 첫 요청에서 시작한다.
+        요청이 끊긴 워커도 마지막 지표를 FLUSH_INTERVAL 안에 기록한다.
+        """
+        pid = os.getpid()
+        if not self.metrics_dir or self._flusher_pid == pid:
+            return
+        with self._flush_lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+        threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            self.maybe_flush(force=True)
+
+    def collect(self):
+        """모든 워커 스냅샷을 합산 (공유 디렉토리가 없으면 현재 프로세스만)"""
+        if not self.metrics_dir:
+            return [self.snapshot()]
+
+        self.maybe_flush(force=True)
+        snapshots = []
+        for filename in os.listdir(self.metrics_dir):
+            if not (filename.startswith('metrics_') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.metrics_dir, filename), 'r', encoding='utf-8') as f:
+                    snap = json.load(f)
+            except (OSError, ValueError):
+                continue
+            # 종료된 워커의 처리 중 요청 수는 더 이상 유효하지 않음 (카운터는 유지)
+            if not _pid_alive(snap.get('pid')):
+                snap['in_flight'] = 0
+            snapshots.append(snap)
+        return snapshots
+
+    # ------------------------------------------------------------------
+    # Prometheus 텍스트 포맷
+    # ------------------------------------------------------------------
+    def render_prometheus(self):
+        snapshots = self.collect()
+
+        requests_total = {}
+        latency = {}
+        in_flight = 0
+        db = {}
+        cache = {}
+        for snap in snapshots:
+            for key, count in snap['requests'].items():
+                requests_total[key] = requests_total.get(key, 0) + count
+            for endpoint, hist in snap['latency'].items():
+                merged = latency.setdefault(
+                    endpoint, {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0})
+                merged['buckets'] = [a + b for a, b in zip(merged['buckets'], hist['buckets'])]
+                merged['sum'] += hist['sum']
+                merged['count'] += hist['count']
+            in_flight += snap['in_flight']
+            for endpoint, (count, seconds) in snap['db'].items():
+                entry = db.setdefault(endpoint, [0, 0.0])
+                entry[0] += count
+                entry[1] += seconds
+            for key, count in snap['cache'].items():
+                cache[key] = cache.get(key, 0) + count
+
+        lines = [
+            '# HELP http_requests_total 처리된 HTTP 요청 수',
+            '# TYPE http_requests_total counter'
+        ]
+        for key in sorted(requests_total):
+            method, endpoint, status = key.split(_SEP)
+            lines.append(
+                f'http_requests_total{{method="{method}",endpoint="{_escape(endpoint)}",status="{status}"}} '
+                f'{requests_total[key]}')
+
+        lines += [
+            '# HELP http_request_duration_seconds 라우트별 응답 시간',
+            '# TYPE http_request_duration_seconds histogram'
+        ]
+        for endpoint in sorted(latency):
+            hist = latency[endpoint]
+            label = f'endpoint="{_escape(endpoint)}"'
+            for bound, count in zip(LATENCY_BUCKETS, hist['buckets']):
+                lines.append(f'http_request_duration_seconds_bucket{{{label},le="{bound}"}} {count}')
+            lines.append(f'http_request_duration_seconds_bucket{{{label},le="+Inf"}} {hist["count"]}')
+            lines.append(f'http_request_duration_seconds_sum{{{label}}} {hist["sum"]:.6f}')
+            lines.append(f'http_request_duration_seconds_count{{{label}}} {hist["count"]}')
+
+        lines += [
+            '# HELP http_requests_in_flight 현재 처리 중인 HTTP 요청 수',
+            '# TYPE http_requests_in_flight gauge',
+            f'http_requests_in_flight {in_flight}',
+            '# HELP db_queries_total 실행된 DB 쿼리 수',
+            '# TYPE db_queries_total counter'
+        ]
+        for endpoint in sorted(db):
+            lines.append(f'db_queries_total{{endpoint="{_escape(endpoint)}"}} {db[endpoint][0]}')
+        lines += [
+            '# HELP db_query_duration_seconds_total DB 쿼리 누적 소요 시간',
+            '# TYPE db_query_duration_seconds_total counter'
+        ]
+        for endpoint in sorted(db):
+            lines.append(f'db_query_duration_seconds_total{{endpoint="{_escape(endpoint)}"}} {db[endpoint][1]:.6f}')
+
+        lines += [
+            '# HELP cache_requests_total 캐시 조회 결과 (hit/miss)',
+            '# TYPE cache_requests_total counter'
+        ]
+        for key in sorted(cache):
+            name, result = key.split(_SEP)
+            lines.append(f'cache_requests_total{{cache="{_escape(name)}",result="{result}"}} {cache[key]}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# 프로세스 전역 지표 저장소
+metrics = RequestMetrics()
+
+
+def _escape(value):
+    """Prometheus 라벨 값 이스케이프"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _current_endpoint():
+    """현재 요청의 라우트 템플릿 (요청 밖이면 '(background)')"""
+    if not has_request_context():
+        return '(background)'
+    rule = request.url_rule
+    return rule.rule if rule is not None else '(unmatched)'
+
+
+def record_cache(name, hit):
+    """캐시 적중/미스 기록"""
+    metrics.record_cache(name, hit)
+
+
+class MetricsCursor(sqlite3.Cursor):
+    """쿼리 수와 소요 시간을 기록하는 SQLite 커서"""
+
+    def execute(self, *args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return super().execute(*args, **kwargs)
+        finally:
+            metrics.record_db_query(time.perf_counter() - start_time)
+
+    def executemany(self, *args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return super().executemany(*args, **kwargs)
+        finally:
+            metrics.record_db_query(time.perf_counter() - start_time)
+
+
+class MetricsConnection(sqlite3.Connection):
+    """sqlite3.connect(..., factory=MetricsConnection) 으로 사용하는 계측 연결"""
+
+    def cursor(self, factory=MetricsCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args, **kwargs):
+        return self.cursor().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self.cursor().executemany(*args, **kwargs)
+
+
+def init_metrics(app, metrics_dir=None, endpoint='/metrics'):
+    """Flask 앱에 요청 계측 훅과 /metrics 엔드포인트 등록"""
+    metrics_dir = metrics_dir or os.environ.get('METRICS_DIR')
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        metrics.metrics_dir = metrics_dir
+        # fork 된 워커에도 상속되어 각자 자기 pid 의 스냅샷을 마지막으로 기록
+        atexit.register(metrics.maybe_flush, force=True)
+
+    @app.before_request
+    def _metrics_before_request():
+        g._metrics_start = time.perf_counter()
+        metrics.request_started()
+
+    @app.after_request
+    def _metrics_after_request(response):
+        start_time = g.pop('_metrics_start', None)
+        if start_time is not None:
+            metrics.request_finished(request.method, _current_endpoint(), response.status_code,
+                                     time.perf_counter() - start_time)
+        return response
+
+    @app.teardown_request
+    def _metrics_teardown_request(exc):
+        # after_request 가 호출되지 않은 (처리되지 않은 예외) 요청 정리
+        start_time = g.pop('_metrics_start', None)
+        if start_time is not None:
+            metrics.request_finished(request.method, _current_endpoint(), 500,
+                                     time.perf_counter() - start_time)
+
+    def metrics_view():
+        return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule(endpoint, 'metrics', metrics_view)
+
+    return metrics
@@ -0,0 +1,267 @@
+# lotto_common/state_file.py - ModelState 바이너리 저장 형식과 pickle 변환 도구
+"""
+고정 크기 배열 기반 모델 상태 파일 (.lstate)
+
+    [MAGIC 8바이트][헤더 길이 uint32 LE][헤더 JSON][배열 데이터 ...]
+
+- 헤더 JSON: {"format": 1, "meta": {...}, "arrays": {이름: {"dtype", "shape", "offset"}}}
+- 배열 데이터는 64바이트 정렬, offset 은 헤더 뒤 데이터 영역 시작 기준
+- 읽을 때는 헤더만 파싱하고 배열은 접근 시 np.memmap 으로 연결 (읽기 전용)
+- sklearn 모델 등 객체는 별도 파일 (<경로>.model) 에 저장하고 필요할 때만 로드
+
+기존 pickle 모델 변환 (각 앱 폴더에서):
+    python ../lotto_common/state_file.py models/*.pkl [--allow-models] [--remove-source]
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'LTSTATE\x00'
+FORMAT_VERSION = 1
+STATE_SUFFIX = '.lstate'
+MODEL_SUFFIX = '.model'
+NUMBER_COUNT = 45
+
+_ALIGN = 64
+_LENGTH = struct.Struct('<I')
+
+
+def _align(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def is_state_file(path):
+    """파일이 .lstate 형식인지 (MAGIC 확인)"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_state(path, arrays, meta=None):
+    """배열 딕셔너리와 메타 정보를 .lstate 파일로 저장 (임시 파일 후 교체)"""
+    arrays = {name: np.ascontiguousarray(value) for name, value in arrays.items()}
+
+    # offset 은 데이터 영역(헤더 뒤 64바이트 정렬 위치) 기준
+    entries = {}
+    offset = 0
+    for name, value in arrays.items():
+        entries[name] = {'dtype': value.dtype.str, 'shape': list(value.shape), 'offset': offset}
+        offset = _align(offset + value.nbytes)
+    header = {'format': FORMAT_VERSION, 'meta': meta or {}, 'arrays': entries}
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    data_start = _align(len(MAGIC) + _LENGTH.size + len(header_bytes))
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for name, value in arrays.items():
+            f.write(b'\x00' * (data_start + entries[name]['offset'] - f.tell()))
+            f.write(value.tobytes())
+    os.replace(tmp_path, path)
+
+
+class StateFile:
+    """.lstate 파일 읽기 (배열은 접근 시 memmap)"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"모델 상태 파일 형식이 아닙니다: {self.path}")
+            (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+            header = json.loads(f.read(length).decode('utf-8'))
+        self._data_start = _align(len(MAGIC) + _LENGTH.size + length)
+
+        if header.get('format', 0) > FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 모델 상태 형식 버전: {header.get('format')}")
+        self.meta = header.get('meta', {})
+        self._entries = header.get('arrays', {})
+        self._arrays = {}
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    @property
+    def names(self):
+        return list(self._entries)
+
+    def array(self, name):
+        """읽기 전용 memmap 배열"""
+        if name not in self._arrays:
+            entry = self._entries[name]
+            shape = tuple(entry['shape'])
+            if int(np.prod(shape)) == 0:
+                self._arrays[name] = np.empty(shape, dtype=entry['dtype'])
+            else:
+                self._arrays[name] = np.memmap(self.path, dtype=entry['dtype'], mode='r',
+                                               offset=self._data_start + entry['offset'], shape=shape)
+        return self._arrays[name]
+
+    def get(self, name, default=None):
+        return self.array(name) if name in self._entries else default
+
+
+# ----------------------------------------------------------------------
+# 번호별 딕셔너리 <-> 배열
+# ----------------------------------------------------------------------
+def numbers_to_array(values, dtype):
+    """{번호: 값} -> 길이 45 배열 (없는 번호는 0)"""
+    values = values or {}
+    return np.array([values.get(n, 0) for n in range(1, NUMBER_COUNT + 1)], dtype=dtype)
+
+
+def array_to_numbers(values):
+    """길이 45 배열 -> {번호: 값}"""
+    return {n: values[n - 1].item() for n in range(1, NUMBER_COUNT + 1)}
+
+
+# ----------------------------------------------------------------------
+# 모델 객체 (sklearn 등) 파일
+# ----------------------------------------------------------------------
+def model_blob_path(path):
+    return Path(f'{path}{MODEL_SUFFIX}')
+
+
+def write_model_blob(path, model):
+    """모델 객체를 상태 파일 옆 <경로>.model 로 저장"""
+    blob_path = model_blob_path(path)
+    with open(blob_path, 'wb') as f:
+        pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return blob_path
+
+
+def read_model_blob(path):
+    """<경로>.model 로드 (직접 저장한 신뢰 가능한 파일에만 사용)"""
+    blob_path = model_blob_path(path)
+    if not blob_path.exists():
+        return None
+    with open(blob_path, 'rb') as f:
+        return pickle.load(f)
+
+
+# ----------------------------------------------------------------------
+# ModelState 저장/로드
+# ----------------------------------------------------------------------
+def save_model_state(path, numbers_memory, number_stats, score=0, arrays=None, ml_model=None):
+    """ModelState 필드를 .lstate (+ 모델 파일) 로 저장
+
+    ml_model 이 없으면 이전 저장에서 남은 <경로>.model 을 지워 오래된 모델이 읽히지 않게 한다.
+    """
+    state_arrays = {
+        'numbers_memory': numbers_to_array(numbers_memory, np.float64),
+        'number_stats': numbers_to_array(number_stats, np.int64),
+    }
+    state_arrays.update(arrays or {})
+    if ml_model is not None:
+        write_model_blob(path, ml_model)
+    write_state(path, state_arrays, {'score': float(score), 'has_model': ml_model is not None})
+    if ml_model is None:
+        model_blob_path(path).unlink(missing_ok=True)
+
+
+def load_model_state(path):
+    """.lstate 또는 기존 pickle 파일 -> ModelState 생성 인자 딕셔너리
+
+    반환: numbers_memory, number_stats, score, arrays(추가 배열, 읽기 전용 memmap),
+    model_path(모델 파일이 있으면 read_model_blob 에 넘길 경로, 없으면 None)
+    """
+    if not is_state_file(path):
+        logging.warning(f"구형 pickle 모델을 로드 중 (state_file.py 로 변환 권장): {path}")
+        data = load_legacy_pickle(path)
+        return {
+            'numbers_memory': data.get('numbers_memory', {}),
+            'number_stats': data.get('number_stats', {}),
+            'score': data.get('score', 0),
+            'arrays': {},
+            'model_path': None,
+        }
+
+    stored = StateFile(path)
+    return {
+        'numbers_memory': array_to_numbers(stored.array('numbers_memory')),
+        'number_stats': array_to_numbers(stored.array('number_stats')),
+        'score': stored.meta.get('score', 0),
+        'arrays': {name: stored.array(name) for name in stored.names
+                   if name not in ('numbers_memory', 'number_stats')},
+        'model_path': path if stored.meta.get('has_model') else None,
+    }
+
+
+# ----------------------------------------------------------------------
+# 기존 pickle 모델
+# ----------------------------------------------------------------------
+class _StateUnpickler(pickle.Unpickler):
+    """기본 자료형과 numpy 스칼라만 허용하는 Unpickler"""
+
+    ALLOWED = {
+        ('collections', 'OrderedDict'),
+        ('numpy', 'dtype'),
+        ('numpy.core.multiarray', 'scalar'),
+        ('numpy._core.multiarray', 'scalar'),
+    }
+
+    def find_class(self, module, name):
+        if (module, name) in self.ALLOWED:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"허용되지 않은 객체: {module}.{name}")
+
+
+def load_legacy_pickle(path, allow_objects=False):
+    """기존 pickle 모델 파일 로드
+
+    allow_objects=False 이면 딕셔너리/숫자만 허용하므로 ml_model 이 들어 있는 파일은
+    UnpicklingError 가 발생한다. 직접 만든 파일임이 확실할 때만 True 로 사용한다.
+    """
+    with open(path, 'rb') as f:
+        if allow_objects:
+            return pickle.load(f)
+        return _StateUnpickler(f).load()
+
+
+def migrate_pickle(path, allow_objects=False, remove_source=False):
+    """pickle 모델 하나를 .lstate (+ .model) 로 변환하고 새 경로 반환"""
+    path = Path(path)
+    data = load_legacy_pickle(path, allow_objects)
+    target = path.with_suffix(STATE_SUFFIX)
+
+    save_model_state(target, data.get('numbers_memory'), data.get('number_stats'), data.get('score', 0),
+                     ml_model=data.get('ml_model'))
+
+    if remove_source:
+        path.unlink()
+    return target
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='pickle 모델 파일을 .lstate 형식으로 변환')
+    parser.add_argument('paths', nargs='+', help='변환할 .pkl 파일')
+    parser.add_argument('--allow-models', action='store_true',
+                        help='ml_model 등 임의 객체 허용 (직접 저장한 파일에만 사용)')
+    parser.add_argument('--remove-source', action='store_true', help='변환 후 원본 .pkl 삭제')
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.paths:
+        try:
+            source_size = os.path.getsize(path)
+            target = migrate_pickle(path, args.allow_models, args.remove_source)
+            print(f"{path} -> {target} ({source_size} -> {os.path.getsize(target)} bytes)")
+        except Exception as e:
+            failed += 1
+            logging.error(f"변환 실패 {path}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# lotto_common/tk_bridge.py - 작업 스레드 -> Tk 메인 루프 화면 갱신 브리지
+"""
+Tk 위젯은 메인 루프 스레드에서만 다뤄야 하고, 학습 루프가 줄마다 insert/see 를 부르면
+매번 다시 그리느라 화면이 멈춘다. 작업 스레드는 TkUpdateQueue 에 요청만 넣고,
+메인 루프가 after() 주기마다 큐를 비우면서 한 번에 반영한다.
+
+- 같은 텍스트 위젯에 연속으로 들어온 append 는 문자열 하나로 합쳐 insert 1회 + see 1회
+- StringVar/DoubleVar 등 변수 set 은 주기 안에서 마지막 값만 반영
+- 텍스트 위젯별 최대 줄 수(scrollback)를 넘으면 앞쪽 줄 삭제
+- call 로 넣은 함수(메시지 박스, 버튼 상태, 그래프 갱신 등)는 순서대로 메인 스레드에서 실행
+"""
+import queue
+import tkinter as tk
+
+DEFAULT_INTERVAL_MS = 100
+DEFAULT_MAX_LINES = 5000
+MAX_ITEMS_PER_TICK = 10000
+
+
+class TkUpdateQueue:
+    """작업 스레드에서 안전하게 호출할 수 있는 Tk 화면 갱신 큐"""
+
+    def __init__(self, root, interval_ms=DEFAULT_INTERVAL_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.queue = queue.SimpleQueue()
+        self._max_lines = {}
+        self._after_id = None
+        self.start()
+
+    # ------------------------------------------------------------------
+    # 작업 스레드용 (스레드 안전)
+    # ------------------------------------------------------------------
+    def append(self, widget, text):
+        """텍스트 위젯 끝에 text 추가"""
+        self.queue.put(('append', widget, text))
+
+    def clear(self, widget):
+        """텍스트 위젯 내용 삭제"""
+        self.queue.put(('clear', widget, None))
+
+    def set(self, variable, value):
+        """Tk 변수 값 변경 (주기 안에서 마지막 값만 반영)"""
+        self.queue.put(('set', variable, value))
+
+    def call(self, func, *args, **kwargs):
+        """메인 스레드에서 func(*args, **kwargs) 실행"""
+        self.queue.put(('call', func, (args, kwargs)))
+
+    # ------------------------------------------------------------------
+    # 메인 스레드용
+    # ------------------------------------------------------------------
+    def set_scrollback(self, widget, max_lines=DEFAULT_MAX_LINES):
+        """텍스트 위젯 최대 줄 수 설정 (None 이면 제한 없음)"""
+        self._max_lines[widget] = max_lines
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        try:
+            self.drain()
+        finally:
+            self.start()
+
+    def drain(self, max_items=MAX_ITEMS_PER_TICK):
+        """큐에 쌓인 요청을 합쳐서 반영 (한 주기 최대 max_items 개)"""
+        texts = {}  # widget -> [text, ...] (삽입 순서 유지)
+        values = {}  # variable -> value
+
+        for _ in range(max_items):
+            try:
+                kind, target, payload = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'append':
+                texts.setdefault(target, []).append(payload)
+            elif kind == 'clear':
+                texts.pop(target, None)
+                target.delete('1.0', tk.END)
+            elif kind == 'set':
+                values[target] = payload
+            elif kind == 'call':
+                # 앞서 들어온 갱신을 먼저 반영해야 메시지 박스 등이 최신 화면 위에 뜬다
+                self._flush(texts, values)
+                args, kwargs = payload
+                target(*args, **kwargs)
+
+        self._flush(texts, values)
+
+    def _flush(self, texts, values):
+        for widget, pieces in texts.items():
+            widget.insert(tk.END, ''.join(pieces))
+            self._trim(widget)
+            widget.see(tk.END)
+        for variable, value in values.items():
+            variable.set(value)
+        texts.clear()
+        values.clear()
+
+    def _trim(self, widget):
+        max_lines = self._max_lines.get(widget)
+        if not max_lines:
+            return
+        line_count = int(widget.index('end-1c').split('.')[0])
+        if line_count > max_lines:
+            widget.delete('1.0', f'{line_count - max_lines + 1}.0')
@@ -1,16 +1,22 @@
 import sys
 import os
+import threading
+import time
 from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QLabel, QPushButton, QComboBox,
                             QTextEdit, QSpinBox, QDoubleSpinBox, QProgressBar,
                             QMessageBox, QGroupBox, QFormLayout, QScrollArea,
-                            QTabWidget)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+                            QTabWidget, QCheckBox)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 import logging
 import numpy as np
 from utils.data_loader import DataLoader
-from models import get_model
+from utils.model_registry import ModelRegistry
+from models import get_available_models, get_model, warm_up
+
+# 프로세스 시작 시각 (첫 화면 표시까지 걸린 시간 측정용)
+START_TIME = time.perf_counter()
 
 def setup_logging():
     """로깅 설정"""
@@ -30,7 +36,7 @@ class PredictionWorker(QThread):
     log = pyqtSignal(str)
 
     def __init__(self, model_type, num_sets, db_path, start_draw=1, end_draw=None,
-                 sequence_mode="전체 데이터", sequence_length=10):
+                 sequence_mode="전체 데이터", sequence_length=10, use_registry=True, fine_tune=True):
         super().__init__()
         self.model_type = model_type
         self.num_sets = num_sets
@@ -39,6 +45,8 @@ class PredictionWorker(QThread):
         self.end_draw = end_draw
         self.sequence_mode = sequence_mode
         self.sequence_length = sequence_length
+        self.use_registry = use_registry
+        self.fine_tune = fine_tune
         self.data_loader = None
 
     def run(self):
@@ -76,33 +84,40 @@ class PredictionWorker(QThread):
 
                 # 학습 데이터 준비
                 if self.model_type == "혼합 모델":
-                    X_cnn = self.data_loader.create_marking_patterns(numbers)
-                    train_data = (X_cnn, X, y)
+                    # 학습용 마킹 패턴/윈도우는 tf.data 파이프라인에서 배치마다 생성
+                    X_cnn = self.data_loader.create_marking_patterns(numbers[-1:])
+                    train_data = self.data_loader.windows
                 else:
                     train_data = df[['num1', 'num2', 'num3', 'num4', 'num5', 'num6']].values
 
-                # 모델 학습
-                self.log.emit("모델 학습 중...")
-                model.train(train_data)
+                # 모델 학습 (같은 데이터로 학습된 모델이 저장소에 있으면 불러옴)
+                if self.use_registry:
+                    key = ModelRegistry.make_key(self.model_type, self.start_draw,
+                                                 self.sequence_mode, self.sequence_length)
+                    ModelRegistry().train_or_load(
+                        model, key, df['draw_number'].values,
+                        df[['num1', 'num2', 'num3', 'num4', 'num5', 'num6']].values,
+                        train_data, fine_tune=self.fine_tune, log=self.log.emit
+                    )
+                else:
+                    self.log.emit("모델 학습 중...")
+                    model.train(train_data)
 
                 # 번호 예측
                 self.log.emit("\n번호 예측 중...")
-                for i in range(self.num_sets):
-                    try:
-                        if self.model_type == "혼합 모델":
-                            pred = model.predict_numbers((X_cnn, X))
-                        else:
-                            pred = model.predict_numbers(train_data)
-
-                        if pred:
-                            predictions.append(pred)
-                            self.progress.emit(int((i + 1) / self.num_sets * 100))
-                            self.log.emit(f"세트 {i + 1} 예측 완료: {pred}")
-                        else:
-                            raise ValueError("예측 결과가 없습니다.")
-
-                    except Exception as e:
-                        self.log.emit(f"세트 {i + 1} 예측 실패: {str(e)}")
+                if self.model_type == "유전 알고리즘 모델":
+                    # 섬 모델 병렬 진화 한 번으로 서로 다른 상위 조합을 게임 세트 수만큼 생성
+                    self.log.emit(f"섬 {model.islands}개 x {model.island_generations}세대 병렬 진화")
+
+                # 순전파/분석 한 번으로 게임 세트 수만큼 생성
+                input_data = (X_cnn, X) if self.model_type == "혼합 모델" else train_data
+                for i, pred in enumerate(model.predict_many(input_data, self.num_sets)):
+                    if pred:
+                        predictions.append(pred)
+                        self.progress.emit(int((i + 1) / self.num_sets * 100))
+                        self.log.emit(f"세트 {i + 1} 예측 완료: {pred}")
+                    else:
+                        self.log.emit(f"세트 {i + 1} 예측 실패: 예측 결과가 없습니다.")
 
                 if not predictions:
                     raise Exception("예측 결과를 생성할 수 없습니다.")
@@ -244,15 +259,11 @@ class LottoPredictionApp(QMainWindow):
         model_group = QGroupBox("모델 설정")
         model_layout = QHBoxLayout()
 
+        # 모델 목록은 이름/설명만 사용 (TensorFlow 등은 선택한 모델을 처음 사용할 때 로드)
         self.model_combo = QComboBox()
-        self.model_combo.addItems([
-            "혼합 모델",
-            "강화학습 모델",
-            "유전 알고리즘 모델",
-            "트랜스포머 모델",
-            "통계 기반 모델",
-            "앙상블 모델"
-        ])
+        for index, (name, spec) in enumerate(get_available_models().items()):
+            self.model_combo.addItem(name)
+            self.model_combo.setItemData(index, spec['description'], Qt.ToolTipRole)
 
         self.sets_spin = QSpinBox()
         self.sets_spin.setRange(1, 20)
@@ -262,6 +273,15 @@ class LottoPredictionApp(QMainWindow):
         model_layout.addWidget(QLabel("게임 세트:"))
         model_layout.addWidget(self.sets_spin)
 
+        # 학습된 모델 재사용 (모델 저장소)
+        self.use_registry = QCheckBox("저장된 모델 재사용")
+        self.use_registry.setChecked(True)
+        self.fine_tune = QCheckBox("새 회차만 추가 학습")
+        self.fine_tune.setChecked(True)
+        self.use_registry.toggled.connect(self.fine_tune.setEnabled)
+        model_layout.addWidget(self.use_registry)
+        model_layout.addWidget(self.fine_tune)
+
         model_group.setLayout(model_layout)
         layout.addWidget(model_group)
 
@@ -731,7 +751,9 @@ class LottoPredictionApp(QMainWindow):
             self.start_draw.value(),
             self.end_draw.value(),
             self.sequence_mode.currentText(),
-            self.sequence_length.value()
+            self.sequence_length.value(),
+            self.use_registry.isChecked(),
+            self.fine_tune.isChecked()
         )
 
         self.worker.progress.connect(self.update_progress)
@@ -773,6 +795,22 @@ class LottoPredictionApp(QMainWindow):
         self.log_text.append(f"predictions/results_{timestamp}.csv")
         logging.info("예측 작업 완료")
 
+def start_warm_up():
+    """첫 화면 표시 시간 기록 후 모델 모듈 미리 불러오기 스레드 시작"""
+    logging.info(f"첫 화면 표시: 시작 후 {time.perf_counter() - START_TIME:.2f}초")
+
+    def run():
+        start_time = time.perf_counter()
+        try:
+            warm_up()
+            logging.info(f"모델 모듈 미리 불러오기 완료 ({time.perf_counter() - start_time:.2f}초)")
+        except Exception as e:
+            # 실패해도 예측 시작 시 다시 import 되므로 기록만 남김
+            logging.error(f"모델 모듈 미리 불러오기 실패: {str(e)}")
+
+    threading.Thread(target=run, name='model-warm-up', daemon=True).start()
+
+
 def main():
     """메인 함수"""
     try:
@@ -784,6 +822,9 @@ def main():
         app = QApplication(sys.argv)
         ex = LottoPredictionApp()
         ex.show()
+
+        # 첫 화면이 그려진 뒤 모델 모듈(TensorFlow 포함)을 백그라운드에서 미리 로드
+        QTimer.singleShot(0, start_warm_up)
         sys.exit(app.exec_())
 
     except Exception as e:
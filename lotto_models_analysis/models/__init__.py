@@ -1,10 +1,36 @@
-from .base import BaseModel
-from .hybrid import HybridModel
-from .reinforcement import ReinforcementLearningModel
-from .genetic import GeneticAlgorithmModel
-from .transformer import TransformerModel
-from .statistical import StatisticalModel
-from .ensemble import EnsembleModel
+import importlib
+
+# 모델 이름 -> 모듈/클래스/설명 (모듈은 처음 사용할 때 import, TensorFlow 는 이때 로드)
+MODEL_SPECS = {
+    "혼합 모델": {
+        'module': '.hybrid', 'class_name': 'HybridModel',
+        'description': "CNN(마킹 패턴) + LSTM(시계열) 하이브리드", 'requires': ['tensorflow']
+    },
+    "강화학습 모델": {
+        'module': '.reinforcement', 'class_name': 'ReinforcementLearningModel',
+        'description': "DQN 기반 순차 번호 선택", 'requires': ['tensorflow']
+    },
+    "유전 알고리즘 모델": {
+        'module': '.genetic', 'class_name': 'GeneticAlgorithmModel',
+        'description': "적합도 기반 진화 알고리즘", 'requires': ['tensorflow']
+    },
+    "트랜스포머 모델": {
+        'module': '.transformer', 'class_name': 'TransformerModel',
+        'description': "자기 주의 기반 시퀀스 모델", 'requires': ['tensorflow']
+    },
+    "통계 기반 모델": {
+        'module': '.statistical', 'class_name': 'StatisticalModel',
+        'description': "빈도/패턴/확률 통계 분석", 'requires': ['tensorflow', 'pandas']
+    },
+    "앙상블 모델": {
+        'module': '.ensemble', 'class_name': 'EnsembleModel',
+        'description': "모든 모델의 가중 투표", 'requires': ['tensorflow']
+    }
+}
+
+# from models import HybridModel 등 기존 import 호환 (클래스 이름 -> 모듈)
+_CLASS_MODULES = {spec['class_name']: spec['module'] for spec in MODEL_SPECS.values()}
+_CLASS_MODULES['BaseModel'] = '.base'
 
 __all__ = [
     'BaseModel',
@@ -14,23 +40,40 @@ __all__ = [
     'TransformerModel',
     'StatisticalModel',
     'EnsembleModel',
-    'get_model'
+    'get_model',
+    'get_model_class',
+    'warm_up'
 ]
 
+
+def __getattr__(name):
+    if name in _CLASS_MODULES:
+        return getattr(importlib.import_module(_CLASS_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_available_models():
-    """사용 가능한 모델 목록 반환"""
-    return {
-        "혼합 모델": HybridModel,
-        "강화학습 모델": ReinforcementLearningModel,
-        "유전 알고리즘 모델": GeneticAlgorithmModel,
-        "트랜스포머 모델": TransformerModel,
-        "통계 기반 모델": StatisticalModel,
-        "앙상블 모델": EnsembleModel
-    }
+    """사용 가능한 모델 목록 반환 (이름 -> 메타데이터, 모델 모듈은 불러오지 않음)"""
+    return {name: dict(spec) for name, spec in MODEL_SPECS.items()}
 
-def get_model(model_type: str) -> BaseModel:
-    """모델 타입에 따른 모델 인스턴스 반환"""
-    models = get_available_models()
-    if model_type not in models:
+
+def get_model_class(model_type: str):
+    """모델 타입의 클래스 반환 (해당 모듈을 처음 사용할 때 import)"""
+    if model_type not in MODEL_SPECS:
         raise ValueError(f"지원하지 않는 모델 타입입니다: {model_type}")
-    return models[model_type]()
\ No newline at end of file
+    spec = MODEL_SPECS[model_type]
+    return getattr(importlib.import_module(spec['module'], __name__), spec['class_name'])
+
+
+def get_model(model_type: str) -> 'BaseModel':
+    """모델 타입에 따른 모델 인스턴스 반환"""
+    return get_model_class(model_type)()
+
+
+def warm_up(model_types=None):
+    """모델 모듈 미리 불러오기 (GUI 표시 후 백그라운드 스레드에서 호출, 불러온 모델 이름 반환)"""
+    loaded = []
+    for model_type in model_types or MODEL_SPECS:
+        get_model_class(model_type)
+        loaded.append(model_type)
+    return loaded
@@ -1,4 +1,5 @@
 
+import os
 import numpy as np
 import tensorflow as tf
 from abc import ABC, abstractmethod
@@ -11,6 +12,11 @@ class BaseModel(ABC):
         self.model = None
         self.model_name = self.__class__.__name__
 
+        # 예측 경로: 'predict' (model.predict), 'function' (고정 시그니처 tf.function), 'tflite'
+        self.inference_mode = 'predict'
+        self._inference_fn = None
+        self._tflite = None
+
     @abstractmethod
     def build_model(self):
         """모델 구조 생성"""
@@ -26,16 +32,114 @@ class BaseModel(ABC):
         """번호 예측"""
         pass
 
-    def save_model(self, filepath):
-        """모델 저장"""
+    def predict_many(self, input_data=None, n_sets=1, n_numbers=6):
+        """번호 n_sets 세트 예측 (기본 구현은 predict_numbers 반복)
+
+        한 번의 순전파/분석 결과에서 여러 세트를 뽑을 수 있는 모델은 재정의한다.
+        """
+        return [self.predict_numbers(input_data) for _ in range(n_sets)]
+
+    @staticmethod
+    def sample_sets(probabilities, n_sets, n_numbers=6):
+        """확률 벡터 [45] 에서 비복원 추출 n_sets 회 -> 정렬된 번호 [n_sets, n_numbers]
+
+        선택할 때마다 남은 번호의 확률을 다시 정규화해 뽑는 기존 루프와 같은 분포
+        (Gumbel-top-k). 확률이 0인 번호는 양수 확률 번호가 모자랄 때만 무작위로 채운다.
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        gumbel = np.random.gumbel(size=(n_sets, len(probabilities)))
+        keys = np.where(probabilities > 0, np.log(np.maximum(probabilities, 1e-300)) + gumbel, gumbel - 1e6)
+        picks = np.argpartition(-keys, n_numbers - 1, axis=1)[:, :n_numbers]
+        return np.sort(picks + 1, axis=1)
+
+    @staticmethod
+    def _as_input_list(inputs):
+        return list(inputs) if isinstance(inputs, (list, tuple)) else [inputs]
+
+    def enable_fast_inference(self, sample_inputs, jit_compile=False):
+        """예측 입력 형태(배치 1)로 고정한 tf.function 예측 경로 컴파일
+
+        model.predict 는 호출마다 데이터 어댑터와 배치 루프를 만들기 때문에 입력 하나를
+        예측할 때는 모델을 직접 호출하는 편이 빠르다. jit_compile=True 이면 XLA 로 컴파일한다.
+        """
+        specs = [tf.TensorSpec((1,) + tuple(np.shape(x)[1:]), tf.float32)
+                 for x in self._as_input_list(sample_inputs)]
+        model = self.model
+
+        @tf.function(input_signature=specs, jit_compile=jit_compile)
+        def infer(*inputs):
+            return model(list(inputs) if len(inputs) > 1 else inputs[0], training=False)
+
+        # 첫 예측에서 트레이스 지연이 생기지 않도록 미리 컴파일
+        infer.get_concrete_function()
+        self._inference_fn = infer
+        self.inference_mode = 'function'
+        return infer
+
+    def export_tflite(self, filepath):
+        """컴파일된 예측 경로를 TFLite 모델로 저장 후 경로 반환 (CPU 서빙용)"""
+        if self._inference_fn is None:
+            raise ValueError("enable_fast_inference 를 먼저 호출해야 합니다.")
+
+        converter = tf.lite.TFLiteConverter.from_concrete_functions(
+            [self._inference_fn.get_concrete_function()], self.model)
+        # LSTM 등 TFLite 기본 연산으로 바뀌지 않는 연산은 TF 연산으로 유지
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS,
+                                               tf.lite.OpsSet.SELECT_TF_OPS]
+        path = f"{filepath}.tflite"
+        with open(path, 'wb') as f:
+            f.write(converter.convert())
+        return path
+
+    def load_tflite(self, filepath, num_threads=None):
+        """TFLite 모델을 불러와 이후 예측에 사용"""
+        interpreter = tf.lite.Interpreter(model_path=filepath, num_threads=num_threads)
+        interpreter.allocate_tensors()
+        self._tflite = interpreter
+        self.inference_mode = 'tflite'
+
+    def run_inference(self, inputs):
+        """현재 예측 경로로 마지막 입력 하나(배치 1) 예측 -> numpy 출력"""
+        inputs = [np.asarray(x, dtype=np.float32)[-1:] for x in self._as_input_list(inputs)]
+
+        if self.inference_mode == 'tflite' and self._tflite is not None:
+            # TFLite 입력 순서는 변환 결과에 따라 다르므로 입력 형태로 대응
+            for detail in self._tflite.get_input_details():
+                match = next(x for x in inputs if tuple(x.shape) == tuple(detail['shape']))
+                self._tflite.set_tensor(detail['index'], match)
+            self._tflite.invoke()
+            return self._tflite.get_tensor(self._tflite.get_output_details()[0]['index'])
+
+        if self.inference_mode == 'function' and self._inference_fn is not None:
+            return self._inference_fn(*inputs).numpy()
+
+        return self.model.predict(inputs if len(inputs) > 1 else inputs[0], verbose=0)
+
+    def fine_tune(self, train_data, new_count):
+        """저장된 모델에 새 회차(train_data 의 마지막 new_count 회차) 추가 학습
+
+        기본 구현은 전체 재학습이며, 이어서 학습할 수 있는 모델은 재정의한다.
+        """
+        return self.train(train_data)
+
+    def save_model(self, filepath, weights_only=False):
+        """모델 저장 (저장된 파일 경로 반환, weights_only 이면 Keras 가중치만 저장)"""
         if self.model is not None:
             try:
                 if isinstance(self.model, tf.keras.Model):
-                    self.model.save(f"{filepath}.keras")
+                    if weights_only:
+                        path = f"{filepath}.weights.h5"
+                        self.model.save_weights(path)
+                    else:
+                        path = f"{filepath}.keras"
+                        self.model.save(path)
                 else:
-                    np.save(f"{filepath}.npy", self.model)
+                    path = f"{filepath}.npy"
+                    np.save(path, self.model)
+                return path
             except Exception as e:
                 print(f"모델 저장 중 오류 발생: {str(e)}")
+        return None
 
     def load_best_model(self):
         """최고 성능 모델 로드"""
@@ -52,16 +156,24 @@ class BaseModel(ABC):
 
 
     def load_model(self, filepath):
-        """모델 로드"""
+        """모델 로드 (성공 여부 반환)"""
         try:
-            if filepath.endswith('.keras'):
+            if filepath.endswith('.weights.h5'):
+                # 같은 구조로 생성된 모델에 가중치만 적용
+                self.model.load_weights(filepath)
+            elif filepath.endswith('.keras'):
                 self.model = tf.keras.models.load_model(filepath)
+                # 이전 모델을 참조하는 컴파일된 예측 경로는 사용하지 않음
+                self._inference_fn = None
+                self.inference_mode = 'predict'
             elif filepath.endswith('.npy'):
                 self.model = np.load(filepath, allow_pickle=True)
             else:
                 raise ValueError("지원하지 않는 파일 형식입니다.")
+            return True
         except Exception as e:
             print(f"모델 로드 중 오류 발생: {str(e)}")
+            return False
 
     # def validate_numbers(self, numbers):
     #     """예측된 번호의 유효성 검사"""
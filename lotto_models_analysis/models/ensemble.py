@@ -1,14 +1,39 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 import numpy as np
+import tensorflow as tf
 from .base import BaseModel
 from .hybrid import HybridModel
 from .reinforcement import ReinforcementLearningModel
 from .genetic import GeneticAlgorithmModel
 from .transformer import TransformerModel
 from .statistical import StatisticalModel
+from utils.threads import limited_threads_env
 import logging
 from datetime import datetime
 
 
+def _train_member(model_class, train_data, validation_data, filepath, threads):
+    """하위 모델 하나를 별도 프로세스에서 학습하고 save_model 로 저장한 경로 반환"""
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(threads)
+    except RuntimeError:
+        # 이미 TensorFlow 런타임이 초기화된 경우 (환경 변수 제한만 적용)
+        pass
+
+    start_time = time.perf_counter()
+    model = model_class()
+    model.train(train_data, validation_data)
+    path = model.save_model(filepath, weights_only=True)
+    return path, time.perf_counter() - start_time
+
+
 class EnsembleModel(BaseModel):
     """여러 모델을 결합한 앙상블 모델"""
 
@@ -34,6 +59,12 @@ class EnsembleModel(BaseModel):
 
         # 성능 기록
         self.model_performance = {name: [] for name in self.models.keys()}
+
+        # 하위 모델 병렬 학습 설정 (프로세스 수 None 이면 CPU 코어 수까지)
+        self.parallel_training = True
+        self.max_workers = None
+        self.training_times = {}
+        self.training_total_time = 0.0
         self.setup_logging()
 
     def build_model(self):
@@ -52,13 +83,19 @@ class EnsembleModel(BaseModel):
         )
 
     def train_all_models(self, train_data, validation_data=None):
-        """모든 모델 학습"""
+        """모든 모델 학습 (하위 모델은 서로 독립이므로 별도 프로세스에서 동시에 학습)"""
         try:
+            start_time = time.perf_counter()
+            if self.parallel_training and len(self.models) > 1:
+                trained = self.train_models_parallel(train_data, validation_data)
+            else:
+                trained = self.train_models_sequential(train_data, validation_data)
+            self.training_total_time = time.perf_counter() - start_time
+
             for name, model in self.models.items():
-                logging.info(f"\n=== {name} 학습 시작 ===")
+                if name not in trained:
+                    continue
                 try:
-                    model.train(train_data, validation_data)
-
                     # 검증 데이터로 성능 평가
                     if validation_data is not None:
                         performance = self.evaluate_model(model, validation_data)
@@ -68,7 +105,9 @@ class EnsembleModel(BaseModel):
                     np.save('best_models/ensemble_weight.npy', self.weights)
 
                 except Exception as e:
-                    logging.error(f"{name} 학습 중 오류: {str(e)}")
+                    logging.error(f"{name} 평가 중 오류: {str(e)}")
+
+            self.log_training_times()
 
             # 성능에 따른 가중치 업데이트
             self.update_weights()
@@ -77,10 +116,123 @@ class EnsembleModel(BaseModel):
             logging.error(f"앙상블 모델 학습 중 오류: {str(e)}")
             raise
 
+    def train_models_sequential(self, train_data, validation_data=None, names=None):
+        """하위 모델을 현재 프로세스에서 차례로 학습, 학습에 성공한 모델 이름 목록 반환"""
+        trained = []
+        if names is None:
+            self.training_times = {}
+        for name, model in self.models.items():
+            if names is not None and name not in names:
+                continue
+            logging.info(f"\n=== {name} 학습 시작 ===")
+            start_time = time.perf_counter()
+            try:
+                model.train(train_data, validation_data)
+                trained.append(name)
+            except Exception as e:
+                logging.error(f"{name} 학습 중 오류: {str(e)}")
+            self.training_times[name] = time.perf_counter() - start_time
+        return trained
+
+    def train_models_parallel(self, train_data, validation_data=None):
+        """하위 모델을 spawn 프로세스에서 동시에 학습하고 save_model/load_model 로 가중치 회수
+
+        TensorFlow 는 fork 이후 동작을 보장하지 않으므로 spawn 을 사용하고,
+        프로세스별 스레드 수는 CPU 코어 수 / 동시 프로세스 수로 제한한다.
+        """
+        cpu_count = os.cpu_count() or 1
+        workers = min(self.max_workers or cpu_count, len(self.models))
+        threads = max(1, cpu_count // workers)
+        logging.info(f"하위 모델 병렬 학습: 프로세스 {workers}개, 프로세스당 스레드 {threads}개")
+
+        trained = []
+        retry = []
+        self.training_times = {}
+        temp_dir = tempfile.mkdtemp(prefix='ensemble_')
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            futures = {}
+            # 프로세스는 submit 시점에 시작되므로 이 구간에서만 스레드 제한 환경 변수 적용
+            with limited_threads_env(threads):
+                for name, model in self.models.items():
+                    logging.info(f"\n=== {name} 학습 시작 ===")
+                    filepath = os.path.join(temp_dir, model.model_name.lower())
+                    future = executor.submit(_train_member, type(model), train_data, validation_data,
+                                             filepath, threads)
+                    futures[future] = name
+
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    path, elapsed = future.result()
+                    self.training_times[name] = elapsed
+                    if path is None or not self.models[name].load_model(path):
+                        raise RuntimeError(f"학습된 가중치를 불러오지 못했습니다: {path}")
+                    trained.append(name)
+                    logging.info(f"{name} 학습 완료 ({elapsed:.1f}초)")
+                except BrokenProcessPool as e:
+                    # 프로세스 시작 실패/비정상 종료: 현재 프로세스에서 다시 학습
+                    logging.error(f"{name} 학습 프로세스 오류: {str(e)}")
+                    retry.append(name)
+                except Exception as e:
+                    logging.error(f"{name} 학습 중 오류: {str(e)}")
+        finally:
+            executor.shutdown(wait=True)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        if retry:
+            logging.info(f"현재 프로세스에서 다시 학습: {', '.join(retry)}")
+            trained += self.train_models_sequential(train_data, validation_data, names=retry)
+
+        return trained
+
+    def log_training_times(self):
+        """하위 모델별/전체 학습 시간 로깅"""
+        logging.info("\n=== 학습 시간 ===")
+        for name, elapsed in self.training_times.items():
+            logging.info(f"{name}: {elapsed:.1f}초")
+        logging.info(f"하위 모델 합계: {sum(self.training_times.values()):.1f}초, "
+                     f"전체 경과: {self.training_total_time:.1f}초")
+
     def train(self, train_data, validation_data=None):
         """학습 인터페이스 구현"""
         return self.train_all_models(train_data, validation_data)
 
+    def fine_tune(self, train_data, new_count):
+        """하위 모델별 추가 학습"""
+        for name, model in self.models.items():
+            try:
+                model.fine_tune(train_data, new_count)
+            except Exception as e:
+                logging.error(f"{name} 추가 학습 중 오류: {str(e)}")
+
+    def save_model(self, filepath, weights_only=False):
+        """하위 모델과 앙상블 가중치 저장 (목록 파일 경로 반환)"""
+        members = {}
+        for name, model in self.models.items():
+            path = model.save_model(f"{filepath}_{model.model_name.lower()}", weights_only=True)
+            if path is not None:
+                members[name] = os.path.basename(path)
+
+        path = f"{filepath}.ensemble.npy"
+        np.save(path, {'members': members, 'weights': self.weights})
+        return path
+
+    def load_model(self, filepath):
+        """save_model 로 저장한 하위 모델/가중치 복원 (모든 하위 모델을 불러오면 True)"""
+        if not filepath.endswith('.ensemble.npy'):
+            return super().load_model(filepath)
+        try:
+            state = np.load(filepath, allow_pickle=True).item()
+            directory = os.path.dirname(filepath)
+            loaded = [self.models[name].load_model(os.path.join(directory, member))
+                      for name, member in state['members'].items() if name in self.models]
+            self.weights = state['weights']
+            return len(loaded) == len(self.models) and all(loaded)
+        except Exception as e:
+            logging.error(f"모델 로드 중 오류: {str(e)}")
+            return False
+
     def evaluate_model(self, model, validation_data):
         """개별 모델 성능 평가"""
         try:
@@ -260,6 +412,52 @@ class EnsembleModel(BaseModel):
             raise
 
 
+    def predict_many(self, input_data=None, n_sets=1, n_numbers=6):
+        """하위 모델별 predict_many 한 번씩으로 n_sets 세트 앙상블 예측
+
+        i 번째 세트는 각 하위 모델의 i 번째 예측을 predict_numbers 와 같은 가중 투표로 결합한다.
+        """
+        try:
+            votes = np.zeros((n_sets, 45))
+            voted = np.zeros(n_sets, dtype=bool)
+
+            for name, model in self.models.items():
+                try:
+                    if name == "강화학습 모델":
+                        member_input = np.zeros((1, 45))  # 초기 상태
+                    else:
+                        member_input = input_data
+                    member_sets = model.predict_many(member_input, n_sets)
+
+                    for i, pred in enumerate(member_sets[:n_sets]):
+                        if pred is None:
+                            continue
+                        prob_dist = np.zeros(45)
+                        prob_dist[np.asarray(pred, dtype=np.int64) - 1] = 1
+                        votes[i] += prob_dist / prob_dist.sum() * self.weights.get(name, 0)
+                        voted[i] = True
+
+                except Exception as e:
+                    logging.error(f"{name} 예측 중 오류: {str(e)}")
+                    continue
+
+            if not voted.any():
+                raise ValueError("유효한 예측 결과가 없습니다.")
+
+            results = []
+            for i in np.flatnonzero(voted):
+                # 가중치가 높은 번호 순 (predict_numbers 와 같이 동점은 작은 번호 우선,
+                # 표를 받지 못한 번호는 무작위로 채움)
+                order = np.lexsort((np.where(votes[i] > 0, 0.0, np.random.random(45)), -votes[i]))
+                result = sorted(int(n) + 1 for n in order[:n_numbers])
+                logging.info(f"앙상블 최종 예측 {len(results) + 1}: {result}")
+                results.append(result)
+            return results
+
+        except Exception as e:
+            logging.error(f"앙상블 예측 중 오류: {str(e)}")
+            raise
+
     def log_prediction_results(self, final_numbers, model_predictions):
         """예측 결과 로깅"""
         logging.info("\n=== 앙상블 예측 결과 ===")
@@ -277,6 +475,8 @@ class EnsembleModel(BaseModel):
         """모델 분석 정보 반환"""
         return {
             'weights': self.weights,
+            'training_times': dict(self.training_times),
+            'training_total_time': self.training_total_time,
             'performance': {
                 name: np.mean(perfs) if perfs else 0
                 for name, perfs in self.model_performance.items()
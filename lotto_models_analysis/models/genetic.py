@@ -1,19 +1,70 @@
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import numpy as np
 from .base import BaseModel
 import logging
 from datetime import datetime
 
+# 일치 개수별 적합도 점수 (calculate_fitness 의 6/5/4/3개 일치 점수)
+MATCH_FITNESS = np.array([0, 0, 0, 1, 10, 50, 100])
+
+# 적합도 계산에 쓰는 최근 회차 수
+RECENT_DRAWS = 30
+
+
+def to_masks(population):
+    """[P,6] 번호 배열 -> [P,45] 번호 포함 마스크 (0/1)"""
+    population = np.asarray(population, dtype=np.int64)
+    masks = np.zeros((len(population), 45), dtype=np.float32)
+    masks[np.arange(len(population))[:, None], population - 1] = 1
+    return masks
+
+
+# 섬 모델 작업 프로세스의 모델 (프로세스 시작 시 한 번 생성)
+_island_model = None
+
+
+def _init_island_worker(historical_data, population_size, elite_size, mutation_rate):
+    global _island_model
+    _island_model = GeneticAlgorithmModel(population_size, elite_size, mutation_rate)
+    _island_model.historical_data = historical_data
+
+
+def _evolve_island(population, generations, seed, model=None):
+    """섬 하나를 generations 세대 진화 -> (최종 개체군, 세대별 최고 적합도)"""
+    model = _island_model if model is None else model
+    np.random.seed(seed)
+    model.population = population
+    model.best_fitness_history = []
+    model.evolve(generations)
+    return model.population, model.best_fitness_history
+
 
 class GeneticAlgorithmModel(BaseModel):
     """유전 알고리즘 기반 로또 번호 예측 모델"""
 
-    def __init__(self, population_size=100, elite_size=4, mutation_rate=0.1):
+    def __init__(self, population_size=100, elite_size=4, mutation_rate=0.1,
+                 islands=4, island_generations=20, migration_interval=5, migration_size=2,
+                 island_processes=1, island_seed=None):
         super().__init__()
         self.population_size = population_size
         self.elite_size = elite_size
         self.mutation_rate = mutation_rate
         self.population = None
+
+        # 섬 모델 설정 (predict_sets)
+        # 섬 수 x 세대 수가 늘수록 결과 품질과 소요 시간이 함께 증가
+        # island_processes 기본값 1 은 현재 프로세스에서 진화 (spawn 프로세스 시작 비용이
+        # 기본 설정의 진화 시간보다 크다). 개체군/세대가 클 때만 2 이상으로 지정
+        self.islands = islands
+        self.island_generations = island_generations
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.island_processes = island_processes
+        self.island_seed = island_seed
+        self.island_populations = None
         self.best_fitness_history = []
         self.generation_count = 0
         self.historical_data = None
@@ -36,11 +87,9 @@ class GeneticAlgorithmModel(BaseModel):
     def initialize_population(self):
         """초기 개체군 생성"""
         try:
-            population = []
-            for _ in range(self.population_size):
-                # 1부터 45까지의 숫자 중 6개를 무작위로 선택
-                chromosome = np.sort(np.random.choice(45, 6, replace=False) + 1)
-                population.append(chromosome)
+            # 1부터 45까지의 숫자 중 6개를 무작위로 선택 -> [P,6] 배열
+            keys = np.random.random((self.population_size, 45))
+            population = np.sort(np.argpartition(keys, 6, axis=1)[:, :6] + 1, axis=1)
 
             logging.info(f"초기 개체군 생성 완료: {self.population_size}개 염색체")
             return population
@@ -87,6 +136,44 @@ class GeneticAlgorithmModel(BaseModel):
     #         logging.error(f"적합도 계산 중 오류: {str(e)}")
     #         raise
 
+    def population_fitness(self, population):
+        """개체군 전체 적합도 [P] (calculate_fitness 와 같은 값)
+
+        [P,45] 마스크 @ [45,30] 최근 회차 마스크 한 번으로 일치 개수를 구하고
+        점수/페널티/보너스를 calculate_fitness 와 같은 순서로 곱한다.
+        """
+        population = np.sort(np.asarray(population, dtype=np.int64), axis=1)
+        recent_draws = np.asarray(self.historical_data[-RECENT_DRAWS:], dtype=np.int64)
+
+        # 과거 당첨 번호와의 매칭 점수
+        if len(recent_draws):
+            matched_counts = (to_masks(population) @ to_masks(recent_draws).T).astype(np.int64)
+        else:
+            matched_counts = np.zeros((len(population), 1), dtype=np.int64)
+        fitness = MATCH_FITNESS[matched_counts].sum(axis=1).astype(np.float64)
+
+        # 너무 자주 매칭되는 경우 페널티
+        fitness = np.where(matched_counts.max(axis=1) > 4, fitness * 0.5, fitness)
+
+        # 번호 간격 평가 (연속된 번호가 있으면 페널티)
+        consecutive = np.any(np.diff(population, axis=1) == 1, axis=1)
+        fitness = np.where(consecutive, fitness * 0.8, fitness)
+
+        # 구간 균형 보너스 (한 구간에 2개 이하)
+        sections = (population - 1) // 10
+        section_max = np.stack([(sections == s).sum(axis=1) for s in range(5)], axis=1).max(axis=1)
+        fitness = np.where(section_max <= 2, fitness * 1.2, fitness)
+
+        # 홀짝 균형 보너스
+        even_count = (population % 2 == 0).sum(axis=1)
+        fitness = np.where((even_count >= 2) & (even_count <= 4), fitness * 1.1, fitness)
+
+        # 합계 범위 보너스 (135-185가 적정)
+        total = population.sum(axis=1)
+        fitness = np.where((total >= 135) & (total <= 185), fitness * 1.1, fitness)
+
+        return fitness
+
     def calculate_fitness(self, chromosome):
         """적합도 계산"""
         try:
@@ -189,6 +276,56 @@ class GeneticAlgorithmModel(BaseModel):
             logging.error(f"교차 연산 중 오류: {str(e)}")
             raise
 
+    def select_parents_batch(self, fitness_scores, count, tournament_size=5):
+        """토너먼트 선택 count 번을 한 번에 수행 -> 부모 인덱스 [count,2]
+
+        토너먼트 참가자는 select_parents 와 같이 중복 없이 뽑는다 (중복이 생긴 행만 다시 추첨).
+        """
+        fitness_scores = np.asarray(fitness_scores)
+        size = len(fitness_scores)
+        tournament_size = min(tournament_size, size)
+        entrants = np.random.randint(0, size, (count * 2, tournament_size))
+        while True:
+            ordered = np.sort(entrants, axis=1)
+            duplicated = np.any(ordered[:, 1:] == ordered[:, :-1], axis=1)
+            if not duplicated.any():
+                break
+            entrants[duplicated] = np.random.randint(0, size, (duplicated.sum(), tournament_size))
+
+        winners = entrants[np.arange(len(entrants)), np.argmax(fitness_scores[entrants], axis=1)]
+        return winners.reshape(count, 2)
+
+    def crossover_batch(self, parents1, parents2):
+        """교차 연산 (crossover 와 같은 규칙을 [K,6] 배열에 한 번에 적용)"""
+        count = len(parents1)
+        crossover_point = np.random.randint(1, 5, count)
+        use_first = np.arange(6) < crossover_point[:, None]
+        children = np.where(use_first, parents1, parents2)
+
+        # 교차하지 않는 경우 (10%) 는 첫 번째 부모 그대로
+        keep = np.random.random(count) >= 0.9
+        children[keep] = parents1[keep]
+
+        # 중복 제거 후 부족한 번호는 남은 번호 중에서 무작위로 보충
+        keys = np.random.random((count, 45))
+        keys[to_masks(children) > 0] = 2.0
+        return np.sort(np.argpartition(-keys, 5, axis=1)[:, :6] + 1, axis=1)
+
+    def mutate_batch(self, population):
+        """돌연변이 연산 (mutate 와 같은 규칙을 [K,6] 배열에 한 번에 적용)"""
+        population = population.copy()
+        rows = np.flatnonzero(np.random.random(len(population)) < self.mutation_rate)
+        if len(rows) == 0:
+            return population
+
+        # 무작위 위치를 기존 번호와 겹치지 않는 새 번호로 교체
+        mutation_point = np.random.randint(0, 6, len(rows))
+        keys = np.random.random((len(rows), 45))
+        keys[to_masks(population[rows]) > 0] = -1.0
+        population[rows, mutation_point] = np.argmax(keys, axis=1) + 1
+        population[rows] = np.sort(population[rows], axis=1)
+        return population
+
     def mutate(self, chromosome):
         """돌연변이 연산"""
         try:
@@ -215,38 +352,29 @@ class GeneticAlgorithmModel(BaseModel):
         try:
             if self.population is None:
                 self.population = self.initialize_population()
+            population = np.asarray(self.population, dtype=np.int64)
 
             logging.info(f"진화 시작: {generations}세대")
 
             for generation in range(generations):
-                # 적합도 계산
-                fitness_scores = [self.calculate_fitness(chromosome)
-                                  for chromosome in self.population]
+                # 적합도 계산 (개체군 전체를 한 번에)
+                fitness_scores = self.population_fitness(population)
 
                 # 최고 적합도 기록
-                best_fitness = max(fitness_scores)
+                best_fitness = float(fitness_scores.max())
                 self.best_fitness_history.append(best_fitness)
 
-                # 새로운 개체군 생성
-                new_population = []
-
                 # 엘리트 보존
                 elite_indices = np.argsort(fitness_scores)[-self.elite_size:]
-                new_population.extend([self.population[i].copy()
-                                       for i in elite_indices])
-
-                # 나머지 개체 생성
-                while len(new_population) < self.population_size:
-                    # 부모 선택
-                    parents = self.select_parents(self.population, fitness_scores)
 
-                    # 자식 생성
-                    child = self.crossover(parents[0], parents[1])
-                    child = self.mutate(child)
+                # 나머지 개체 생성 (토너먼트 선택 -> 교차 -> 돌연변이)
+                child_count = max(self.population_size - len(elite_indices), 0)
+                parents = self.select_parents_batch(fitness_scores, child_count)
+                children = self.crossover_batch(population[parents[:, 0]], population[parents[:, 1]])
+                children = self.mutate_batch(children)
 
-                    new_population.append(child)
-
-                self.population = new_population
+                population = np.concatenate([population[elite_indices], children])
+                self.population = population
                 self.generation_count += 1
 
                 # 진행 상황 로깅
@@ -262,26 +390,179 @@ class GeneticAlgorithmModel(BaseModel):
             logging.error(f"진화 과정 중 오류: {str(e)}")
             raise
 
+    def migrate(self, populations):
+        """고리 구조 이주: 각 섬의 상위 migration_size 개체가 다음 섬의 하위 개체를 대체"""
+        count = min(self.migration_size, self.population_size)
+        if count <= 0 or len(populations) < 2:
+            return populations
+
+        fitness = [self.population_fitness(population) for population in populations]
+        elites = [population[np.argsort(scores)[-count:]]
+                  for population, scores in zip(populations, fitness)]
+
+        migrated = []
+        for i, (population, scores) in enumerate(zip(populations, fitness)):
+            population = population.copy()
+            population[np.argsort(scores)[:count]] = elites[i - 1]
+            migrated.append(population)
+        return migrated
+
+    def evolve_islands(self, generations=None, islands=None, processes=None):
+        """섬 모델 진화 (섬별 최종 개체군 목록 반환)
+
+        섬마다 독립 개체군을 작업 프로세스에서 진화시키고 migration_interval 세대마다
+        상위 개체를 다음 섬으로 이주시킨다. 첫 번째 섬은 학습된 개체군이 있으면 그것으로
+        시작한다. 구간/섬별 시드는 island_seed 에서 만들므로 프로세스 수와 무관하게 같은 결과.
+        processes(없으면 island_processes) 가 2 이상일 때만 작업 프로세스를 사용한다.
+        진화 후 self.population 은 최종 최고 적합도 섬의 개체군(population_size 개)으로 바꾼다.
+        """
+        generations = generations or self.island_generations
+        islands = max(islands or self.islands, 1)
+        interval = max(min(self.migration_interval or generations, generations), 1)
+        epochs = -(-generations // interval)
+
+        rng = np.random.default_rng(self.island_seed)
+        seeds = rng.integers(2 ** 31, size=(epochs + 1, islands))
+
+        populations = []
+        for i in range(islands):
+            if i == 0 and self.population is not None and len(self.population) == self.population_size:
+                populations.append(np.asarray(self.population, dtype=np.int64))
+            else:
+                np.random.seed(seeds[0, i])
+                populations.append(self.initialize_population())
+
+        workers = min(processes or self.island_processes or 1, islands)
+        logging.info(f"섬 모델 진화 시작: 섬 {islands}개 x {generations}세대, "
+                     f"이주 간격 {interval}세대, 프로세스 {workers}개")
+
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_island_worker,
+                initargs=(self.historical_data, self.population_size, self.elite_size, self.mutation_rate)
+            )
+        inline_model = None
+
+        try:
+            remaining = generations
+            for epoch in range(epochs):
+                steps = min(interval, remaining)
+                results = None
+                if executor is not None:
+                    try:
+                        futures = [executor.submit(_evolve_island, population, steps, seeds[epoch + 1, i])
+                                   for i, population in enumerate(populations)]
+                        results = [future.result() for future in futures]
+                    except BrokenProcessPool as e:
+                        # 프로세스 시작 실패/비정상 종료: 남은 구간은 현재 프로세스에서 진화
+                        logging.error(f"섬 진화 프로세스 오류: {str(e)}")
+                        executor.shutdown(wait=True)
+                        executor = None
+
+                if results is None:
+                    if inline_model is None:
+                        inline_model = GeneticAlgorithmModel(self.population_size, self.elite_size,
+                                                             self.mutation_rate)
+                        inline_model.historical_data = self.historical_data
+                    results = [_evolve_island(population, steps, seeds[epoch + 1, i], inline_model)
+                               for i, population in enumerate(populations)]
+
+                populations = [np.asarray(population, dtype=np.int64) for population, _ in results]
+                histories = np.array([history for _, history in results])
+                self.best_fitness_history.extend(histories.max(axis=0).tolist())
+                self.generation_count += steps
+                remaining -= steps
+
+                if epoch < epochs - 1:
+                    populations = self.migrate(populations)
+
+                logging.info(f"섬 진화 {generations - remaining}/{generations}세대, "
+                             f"섬별 최고 적합도: {np.round(histories[:, -1], 2).tolist()}")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        # 다음 evolve/evolve_islands 와 save_model 이 같은 크기의 개체군을 쓰도록 최고 섬만 유지
+        self.island_populations = populations
+        self.population = populations[int(np.argmax(histories[:, -1]))]
+        return populations
+
+    def predict_sets(self, n_sets=5, generations=None, islands=None, processes=None):
+        """섬 모델로 진화한 뒤 서로 다른 적합도 상위 n_sets 개 조합 반환"""
+        try:
+            if self.historical_data is None:
+                raise ValueError("모델이 학습되지 않았습니다.")
+
+            populations = self.evolve_islands(generations, islands, processes)
+
+            candidates = np.unique(np.concatenate(populations), axis=0)
+            fitness_scores = self.population_fitness(candidates)
+            best_indices = np.argsort(-fitness_scores, kind='stable')[:n_sets]
+
+            predictions = []
+            for rank, idx in enumerate(best_indices):
+                predictions.append(list(map(int, candidates[idx])))
+                logging.info(f"세트 {rank + 1}: {predictions[-1]}, 적합도: {fitness_scores[idx]:.2f}")
+
+            return predictions
+
+        except Exception as e:
+            logging.error(f"섬 모델 예측 중 오류: {str(e)}")
+            raise
+
+    def predict_many(self, input_data=None, n_sets=1, n_numbers=6):
+        """섬 모델 진화 한 번으로 서로 다른 n_sets 세트 예측 (predict_sets)"""
+        if self.historical_data is None and input_data is not None:
+            self.historical_data = input_data
+        return self.predict_sets(n_sets)
+
     def train(self, train_data, validation_data=None):
         try:
             self.historical_data = train_data
             self.evolve(generations=100)
 
             # 최고 성능의 개체군 저장
-            best_population = {
-                'population': np.array(self.population).tolist() if isinstance(self.population,
-                                                                               list) else self.population.tolist(),
-                'generation_count': self.generation_count,
-                'best_fitness_history': self.best_fitness_history
-            }
-
-            np.save('best_models/genetic_model.npy', best_population)
+            self.save_model('best_models/genetic_model')
 
 
         except Exception as e:
             logging.error(f"학습 중 오류: {str(e)}")
             raise
 
+    def fine_tune(self, train_data, new_count, generations=20):
+        """저장된 개체군에서 이어서 진화 (새 회차가 반영된 이력 기준)"""
+        self.historical_data = train_data
+        self.evolve(generations=generations)
+
+    def save_model(self, filepath, weights_only=False):
+        """개체군/적합도 기록/학습 이력 저장 (저장된 파일 경로 반환)"""
+        state = {
+            'population': np.array(self.population).tolist() if isinstance(self.population,
+                                                                           list) else self.population.tolist(),
+            'generation_count': self.generation_count,
+            'best_fitness_history': self.best_fitness_history,
+            'historical_data': None if self.historical_data is None else np.asarray(self.historical_data).tolist()
+        }
+        path = f"{filepath}.npy"
+        np.save(path, state)
+        return path
+
+    def load_model(self, filepath):
+        """save_model 로 저장한 상태 복원 (성공 여부 반환)"""
+        try:
+            state = np.load(filepath, allow_pickle=True).item()
+            self.population = np.array(state['population'], dtype=np.int64)
+            self.generation_count = state['generation_count']
+            self.best_fitness_history = list(state['best_fitness_history'])
+            if state.get('historical_data') is not None:
+                self.historical_data = np.array(state['historical_data'])
+            return True
+        except Exception as e:
+            logging.error(f"모델 로드 중 오류: {str(e)}")
+            return False
+
     # def predict_numbers(self, input_data=None, n_predictions=6):
     #     """번호 예측"""
     #     try:
@@ -319,8 +600,7 @@ class GeneticAlgorithmModel(BaseModel):
                 self.evolve(generations=20)
 
                 # 적합도 계산
-                fitness_scores = [self.calculate_fitness(chromosome)
-                                  for chromosome in self.population]
+                fitness_scores = self.population_fitness(self.population)
 
                 # 상위 10개의 해 중에서 랜덤 선택
                 top_k = 10
@@ -347,11 +627,10 @@ class GeneticAlgorithmModel(BaseModel):
     def get_population_stats(self):
         """개체군 통계 정보 반환"""
         try:
-            if not self.population:
+            if self.population is None or len(self.population) == 0:
                 return None
 
-            fitness_scores = [self.calculate_fitness(chromosome)
-                              for chromosome in self.population]
+            fitness_scores = self.population_fitness(self.population)
 
             return {
                 'generation': self.generation_count,
@@ -6,6 +6,8 @@ from tensorflow.keras.layers import (Dense, LSTM, Conv2D, MaxPooling2D, Flatten,
                                      Dropout, Input, BatchNormalization)
 from tensorflow.keras.optimizers import Adam
 from .base import BaseModel
+from utils.windowing import SequenceWindows, marking_patterns
+from utils.tf_data import array_dataset, window_dataset
 import logging
 
 
@@ -17,6 +19,8 @@ class HybridModel(BaseModel):
         self.embedding_dim = 64
         self.dropout_rate = 0.3
         self.learning_rate = 0.001
+        self.sequence_length = 10
+        self.batch_size = 32
         self.build_model()
 
     def build_model(self):
@@ -90,20 +94,8 @@ class HybridModel(BaseModel):
     def train(self, train_data, validation_data=None):
         """모델 학습"""
         try:
-            X_cnn_train, X_lstm_train, y_train = train_data
-
-            # 데이터 크기 확인 및 로깅
-            logging.info(f"Training data shapes:")
-            logging.info(f"X_cnn: {X_cnn_train.shape}")
-            logging.info(f"X_lstm: {X_lstm_train.shape}")
-            logging.info(f"y: {y_train.shape}")
-
-
-            if validation_data:
-                X_cnn_val, X_lstm_val, y_val = validation_data
-                val_data = ([X_cnn_val, X_lstm_val], y_val)
-            else:
-                val_data = None
+            dataset = self.make_dataset(train_data, shuffle=True)
+            val_data = self.make_dataset(validation_data, shuffle=False) if validation_data is not None else None
 
             # 콜백 설정
             callbacks = [
@@ -130,10 +122,8 @@ class HybridModel(BaseModel):
 
             # 모델 학습
             history = self.model.fit(
-                [X_cnn_train, X_lstm_train],
-                y_train,
+                dataset,
                 epochs=100,
-                batch_size=32,
                 validation_data=val_data,
                 callbacks=callbacks,
                 verbose=1
@@ -148,6 +138,51 @@ class HybridModel(BaseModel):
             logging.error(f"모델 학습 중 오류 발생: {str(e)}")
             raise
 
+    def fine_tune(self, train_data, new_count, epochs=5):
+        """타겟이 새 회차인 윈도우만으로 추가 학습"""
+        try:
+            if isinstance(train_data, tuple):
+                recent = tuple(array[-new_count:] for array in train_data)
+            else:
+                windows = train_data if isinstance(train_data, SequenceWindows) else \
+                    SequenceWindows(np.asarray(train_data)[-(new_count + self.sequence_length):],
+                                    self.sequence_length)
+                total = len(windows.numbers)
+                indices = np.flatnonzero(windows.target_rows >= total - new_count)
+                if len(indices) == 0:
+                    indices = np.arange(len(windows))[-1:]
+
+                # 마킹 패턴은 make_dataset 과 같은 회차 정렬 (numbers[-len(windows):])
+                X_lstm, y = windows.batch(indices)
+                X_cnn = marking_patterns(windows.numbers[total - len(windows) + indices])
+                recent = (X_cnn, X_lstm, y)
+
+            logging.info(f"추가 학습 윈도우: {len(recent[2])}개")
+            return self.model.fit(self.make_dataset(recent, shuffle=True), epochs=epochs, verbose=1)
+
+        except Exception as e:
+            logging.error(f"추가 학습 중 오류: {str(e)}")
+            raise
+
+    def make_dataset(self, data, shuffle=True):
+        """학습 입력 -> tf.data.Dataset ((마킹 패턴, 윈도우), 타겟)
+
+        - SequenceWindows 또는 [N,6] 이력: 패턴/윈도우를 배치마다 생성 (메모리 사용량 일정)
+        - (X_cnn, X_lstm, y) 배열 튜플: 기존 입력 호환
+        """
+        if isinstance(data, tuple):
+            X_cnn, X_lstm, y = data
+            logging.info(f"Training data shapes:")
+            logging.info(f"X_cnn: {X_cnn.shape}")
+            logging.info(f"X_lstm: {X_lstm.shape}")
+            logging.info(f"y: {y.shape}")
+            return array_dataset((X_cnn, X_lstm), y, self.batch_size, shuffle)
+
+        windows = data if isinstance(data, SequenceWindows) else SequenceWindows(data, self.sequence_length)
+        logging.info(f"학습 윈도우: {len(windows)}개 x {windows.sequence_length}회차, "
+                     f"이력 버퍼 {windows.nbytes() / 1024:.1f}KB")
+        return window_dataset(windows, self.batch_size, shuffle, marking=True)
+
     # def predict_numbers(self, input_data=None, n_predictions=6):
     #     """번호 예측"""
     #     try:
@@ -196,55 +231,44 @@ class HybridModel(BaseModel):
     #         logging.error(f"번호 예측 중 오류 발생: {str(e)}")
     #         raise
 
-    def predict_numbers(self, input_data=None, n_predictions=6):
-        """번호 예측"""
-        try:
-            X_cnn, X_lstm = input_data
-            predictions = self.model.predict([X_cnn[-1:], X_lstm[-1:]], verbose=0)
-
-            # 예측 확률 검증
-            if np.any(np.isnan(predictions)):
-                raise ValueError("예측값에 NaN이 포함되어 있습니다.")
+    def predict_probabilities(self, input_data):
+        """마지막 입력 하나의 번호별 확률 [45] (순전파 1회)"""
+        X_cnn, X_lstm = input_data
+        predictions = self.run_inference([X_cnn, X_lstm])
 
-            # 확률 정규화
-            probs = predictions[0]
-            probs = np.clip(probs, 1e-10, 1.0)
-            probs = probs / np.sum(probs)
+        # 예측 확률 검증
+        if np.any(np.isnan(predictions)):
+            raise ValueError("예측값에 NaN이 포함되어 있습니다.")
 
-            # 번호 선택
-            selected_numbers = []
-            remaining_probs = probs.copy()
+        # 확률 정규화
+        probs = predictions[0]
+        probs = np.clip(probs, 1e-10, 1.0)
+        return probs / np.sum(probs)
 
-            while len(selected_numbers) < n_predictions:
-                # 이미 선택된 번호 제외
-                mask = np.ones(45, dtype=bool)
-                if selected_numbers:
-                    mask[np.array([int(x - 1) for x in selected_numbers])] = False
-
-                # 남은 번호들의 확률 재조정
-                masked_probs = remaining_probs * mask
-                if masked_probs.sum() > 0:
-                    masked_probs = masked_probs / masked_probs.sum()
-                    selected = int(np.random.choice(45, p=masked_probs)) + 1
-                else:
-                    # 확률이 0인 경우 무작위 선택
-                    available = np.where(mask)[0]
-                    selected = int(np.random.choice(available)) + 1
-
-                selected_numbers.append(selected)
+    def predict_many(self, input_data=None, n_sets=1, n_numbers=6):
+        """순전파 한 번의 확률 분포에서 n_sets 세트 추출"""
+        try:
+            probs = self.predict_probabilities(input_data)
 
-            # 결과 검증 및 정렬
-            result = self.format_numbers(selected_numbers)
+            results = []
+            for numbers in self.sample_sets(probs, n_sets, n_numbers):
+                # 결과 검증 및 정렬
+                result = self.format_numbers(numbers)
 
-            # 예측 결과 로깅
-            self.log_prediction_results(result, probs)
+                # 예측 결과 로깅
+                self.log_prediction_results(result, probs)
+                results.append(result)
 
-            return result
+            return results
 
         except Exception as e:
             logging.error(f"번호 예측 중 오류 발생: {str(e)}")
             raise
 
+    def predict_numbers(self, input_data=None, n_predictions=6):
+        """번호 예측"""
+        return self.predict_many(input_data, 1, n_predictions)[0]
+
     def log_training_results(self, history):
         """학습 결과 로깅"""
         logging.info("\n=== 학습 결과 ===")
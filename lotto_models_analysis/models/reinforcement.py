@@ -1,14 +1,94 @@
 
+import time
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, BatchNormalization, Dropout
 from tensorflow.keras.optimizers import Adam
-from collections import deque
-import random
 from .base import BaseModel
 import logging
 
+# 일치 개수(0~6)별 보상 (calculate_reward 와 동일)
+REWARD_TABLE = np.array([-2, -1, 0, 1, 10, 100, 1000], dtype=np.float32)
+
+
+class ReplayMemory:
+    """미리 할당한 NumPy 배열 기반 순환(ring) 경험 메모리
+
+    deque 에 튜플을 쌓는 대신 고정 크기 배열에 덮어쓰고, 샘플링은 인덱스 한 번으로
+    [B,45] 배치를 바로 만든다.
+    """
+
+    def __init__(self, capacity, state_size):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int32)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        self.position = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """경험 여러 개 저장 (가장 오래된 경험부터 덮어씀)"""
+        count = len(actions)
+        indices = (self.position + np.arange(count)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size):
+        """중복 없이 batch_size 개 추출 -> (states, actions, rewards, next_states, dones)"""
+        indices = np.random.choice(self.size, batch_size, replace=False)
+        return (self.states[indices], self.actions[indices], self.rewards[indices],
+                self.next_states[indices], self.dones[indices])
+
+
+class VectorLottoEnv:
+    """에피소드 E개를 동시에 진행하는 번호 선택 환경
+
+    - 상태: 지금까지 선택한 번호 마스크 [E,45]
+    - 행동: 번호 인덱스 [E] (0~44), 6번째 선택에서 에피소드 종료
+    - 보상: 종료 시 최근 10회차 당첨 번호와의 평균 보상 (calculate_reward 와 동일), 그 외 0
+    """
+
+    def __init__(self, historical_data, n_envs, state_size=45):
+        recent_draws = np.asarray(historical_data[-10:], dtype=np.int64)
+        self.recent_masks = np.zeros((len(recent_draws), state_size), dtype=np.float32)
+        self.recent_masks[np.arange(len(recent_draws))[:, None], recent_draws - 1] = 1
+        self.n_envs = n_envs
+        self.state_size = state_size
+        self.states = None
+        self.steps = 0
+
+    def reset(self):
+        self.states = np.zeros((self.n_envs, self.state_size), dtype=np.float32)
+        self.steps = 0
+        return self.states
+
+    def step(self, actions):
+        """-> (next_states, rewards, dones)"""
+        next_states = self.states.copy()
+        next_states[np.arange(self.n_envs), actions] = 1
+        self.steps += 1
+
+        done = self.steps == 6
+        if done:
+            matches = (next_states @ self.recent_masks.T).astype(np.int64)
+            rewards = REWARD_TABLE[matches].mean(axis=1)
+        else:
+            rewards = np.zeros(self.n_envs, dtype=np.float32)
+
+        self.states = next_states
+        return next_states, rewards, np.full(self.n_envs, done, dtype=np.float32)
+
 
 class ReinforcementLearningModel(BaseModel):
     """강화학습 기반 로또 번호 예측 모델"""
@@ -18,17 +98,20 @@ class ReinforcementLearningModel(BaseModel):
         # 강화학습 파라미터
         self.state_size = 45  # 상태 공간 크기 (로또 번호 범위)
         self.action_size = 45  # 행동 공간 크기 (선택 가능한 번호)
-        self.memory = deque(maxlen=2000)  # 경험 메모리
+        self.memory = ReplayMemory(2000, self.state_size)  # 경험 메모리 (순환 배열)
         self.gamma = 0.95  # 할인 계수
         self.epsilon = 1.0  # 탐험률
         self.epsilon_min = 0.01  # 최소 탐험률
         self.epsilon_decay = 0.995  # 탐험률 감소율
         self.learning_rate = 0.001  # 학습률
+        self.n_envs = 16  # 동시에 진행하는 에피소드 수
+        self.episodes_per_second = None
 
         # 모델 초기화
         self.model = self.build_model()  # 메인 네트워크
         self.target_model = self.build_model()  # 타겟 네트워크
         self.update_target_model()  # 타겟 네트워크 초기화
+        self._compiled = None  # (메인, 타겟 네트워크, q_values 함수, train_step 함수)
 
     def softmax(self, x):
         """소프트맥스 함수"""
@@ -56,7 +139,6 @@ class ReinforcementLearningModel(BaseModel):
                 optimizer=Adam(learning_rate=self.learning_rate)
             )
 
-            self.model = model  # 모델을 인스턴스 변수로 저장
             return model
 
         except Exception as e:
@@ -69,44 +151,87 @@ class ReinforcementLearningModel(BaseModel):
 
     def remember(self, state, action, reward, next_state, done):
         """경험 저장"""
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.add_batch(np.reshape(state, (1, -1)), [action], [reward],
+                              np.reshape(next_state, (1, -1)), [done])
 
     def act(self, state, training=False):
         """행동 선택 (번호 선택)"""
         if training and np.random.rand() <= self.epsilon:
             return np.random.randint(self.action_size)
 
-        act_values = self.model.predict(state, verbose=0)
+        act_values = self.q_values(np.asarray(state, dtype=np.float32))
         return np.argmax(act_values[0])
 
+    def _compiled_steps(self):
+        """현재 네트워크에 묶인 (q_values, train_step) tf.function
+
+        tf.function 은 트레이스 시점의 모델을 붙잡으므로, load_model 등으로 self.model 이
+        바뀌면 새 모델로 다시 만든다.
+        """
+        model, target_model = self.model, self.target_model
+        if self._compiled is not None and self._compiled[0] is model and self._compiled[1] is target_model:
+            return self._compiled[2:]
+
+        gamma, action_size = self.gamma, self.action_size
+
+        @tf.function
+        def q_values(states):
+            return model(states, training=False)
+
+        @tf.function
+        def train_step(states, actions, rewards, next_states, dones):
+            """타겟 계산과 MSE 경사 하강 한 단계 (replay 의 predict x2 + fit 대체)"""
+            target = model(states, training=False)
+            target_next = target_model(next_states, training=False)
+
+            # Q-learning 업데이트: 선택한 행동의 Q값만 보상 + 할인된 다음 상태 최대 Q값으로 교체
+            q_update = rewards + gamma * tf.reduce_max(target_next, axis=1) * (1.0 - dones)
+            action_mask = tf.one_hot(actions, action_size)
+            target = action_mask * q_update[:, None] + (1.0 - action_mask) * target
+
+            with tf.GradientTape() as tape:
+                prediction = model(states, training=True)
+                loss = tf.reduce_mean(tf.square(target - prediction))
+            gradients = tape.gradient(loss, model.trainable_variables)
+            model.optimizer.apply_gradients(zip(gradients, model.trainable_variables))
+            return loss
+
+        self._compiled = (model, target_model, q_values, train_step)
+        return q_values, train_step
+
+    def q_values(self, states):
+        """Q값 [E,45] (model.predict 대신 컴파일된 순전파 한 번)"""
+        q_values_fn, _ = self._compiled_steps()
+        return q_values_fn(tf.convert_to_tensor(states, dtype=tf.float32)).numpy()
+
+    def act_batch(self, states, training=False):
+        """에피소드 E개의 행동을 한 번에 선택 [E]
+
+        act 와 같은 epsilon-greedy 규칙이며, 선택된 번호가 이미 고른 번호이면
+        (train_episode 의 재추첨과 같이) 남은 번호 중에서 무작위로 다시 고른다.
+        """
+        count = len(states)
+        actions = np.argmax(self.q_values(states), axis=1)
+        if training:
+            explore = np.random.random(count) <= self.epsilon
+            actions = np.where(explore, np.random.randint(self.action_size, size=count), actions)
+
+        taken = states[np.arange(count), actions] > 0
+        if taken.any():
+            keys = np.random.random((taken.sum(), self.action_size))
+            keys[states[taken] > 0] = -1.0
+            actions[taken] = np.argmax(keys, axis=1)
+        return actions
+
     def replay(self, batch_size):
         """경험 재생을 통한 학습"""
         try:
             if len(self.memory) < batch_size:
                 return
 
-            minibatch = random.sample(self.memory, batch_size)
-            states = np.zeros((batch_size, self.state_size))
-            next_states = np.zeros((batch_size, self.state_size))
-
-            # 배치 데이터 준비
-            for i, (state, _, _, next_state, _) in enumerate(minibatch):
-                states[i] = state
-                next_states[i] = next_state
-
-            # 현재 상태와 다음 상태의 Q값 예측
-            target = self.model.predict(states, verbose=0)
-            target_next = self.target_model.predict(next_states, verbose=0)
-
-            # Q-learning 업데이트
-            for i, (state, action, reward, next_state, done) in enumerate(minibatch):
-                if done:
-                    target[i][action] = reward
-                else:
-                    target[i][action] = reward + self.gamma * np.amax(target_next[i])
-
             # 모델 학습
-            self.model.fit(states, target, epochs=1, verbose=0)
+            _, train_step = self._compiled_steps()
+            train_step(*[tf.convert_to_tensor(batch) for batch in self.memory.sample(batch_size)])
 
             # 탐험률 감소
             if self.epsilon > self.epsilon_min:
@@ -200,72 +325,68 @@ class ReinforcementLearningModel(BaseModel):
     #     """학습 인터페이스 구현"""
     #     return self.train_episode(train_data)
 
-    def train_episode(self, historical_data, episode_count=1000):
-        """에피소드 단위 학습"""
+    def train_episode(self, historical_data, episode_count=1000, n_envs=None):
+        """에피소드 단위 학습
+
+        에피소드 n_envs 개를 VectorLottoEnv 에서 동시에 진행해 행동 선택을 [E,45] 순전파
+        한 번으로 처리하고, 끝난 에피소드마다 기존과 같이 경험 재생 1회/탐험률 감소/
+        10 에피소드마다 타겟 네트워크 업데이트를 수행한다.
+        """
         try:
             # 데이터 설정
             self.historical_data = historical_data
             batch_size = 64
+            n_envs = max(1, min(n_envs or self.n_envs, episode_count))
             total_reward_history = []
 
             logging.info("강화학습 시작...")
             logging.info(f"학습 데이터 크기: {len(historical_data)} 회차")
             logging.info(f"배치 크기: {batch_size}")
-            logging.info(f"에피소드 수: {episode_count}")
+            logging.info(f"에피소드 수: {episode_count} (동시 진행 {n_envs}개)")
 
-            # 에피소드 단위 학습
-            for episode in range(episode_count):
-                total_reward = 0
-                state = np.zeros(self.state_size)
-                selected_numbers = []
+            start_time = time.perf_counter()
+            episode = 0
+            while episode < episode_count:
+                env = VectorLottoEnv(historical_data, min(n_envs, episode_count - episode), self.state_size)
+                states = env.reset()
+                episode_rewards = np.zeros(env.n_envs)
 
-                # 번호 6개 선택
+                # 번호 6개 선택 (에피소드 E개 동시)
                 for _ in range(6):
-                    action = self.act(state.reshape(1, -1), training=True)
-                    while action + 1 in selected_numbers:
-                        action = np.random.randint(self.action_size)
-
-                    selected_numbers.append(action + 1)
-                    next_state = state.copy()
-                    next_state[action] = 1
-
-                    # 보상 계산
-                    if len(selected_numbers) == 6:
-                        rewards = []
-                        for winning_numbers in historical_data[-10:]:
-                            reward = self.calculate_reward(selected_numbers, winning_numbers)
-                            rewards.append(reward)
-                        reward = np.mean(rewards)
-                    else:
-                        reward = 0
-
-                    done = (len(selected_numbers) == 6)
-                    self.remember(state, action, reward, next_state, done)
-                    state = next_state
-                    total_reward += reward
-
-                # 경험 재생으로 학습
-                if len(self.memory) > batch_size:
-                    self.replay(batch_size)
-
-                # 타겟 네트워크 업데이트
-                if episode % 10 == 0:
-                    self.update_target_model()
-
-                # 탐험률 감소
-                if self.epsilon > self.epsilon_min:
-                    self.epsilon *= self.epsilon_decay
-
-                total_reward_history.append(total_reward)
-
-                # 학습 진행 상황 로깅
-                if episode % 100 == 0:
-                    avg_reward = np.mean(total_reward_history[-100:])
-                    logging.info(
-                        f"Episode: {episode}/{episode_count}, "
-                        f"Average Reward: {avg_reward:.2f}, "
-                        f"Epsilon: {self.epsilon:.4f}"
-                    )
+                    actions = self.act_batch(states, training=True)
+                    next_states, rewards, dones = env.step(actions)
+                    self.memory.add_batch(states, actions, rewards, next_states, dones)
+                    states = next_states
+                    episode_rewards += rewards
+
+                for total_reward in episode_rewards:
+                    # 경험 재생으로 학습
+                    if len(self.memory) > batch_size:
+                        self.replay(batch_size)
+
+                    # 타겟 네트워크 업데이트
+                    if episode % 10 == 0:
+                        self.update_target_model()
+
+                    # 탐험률 감소
+                    if self.epsilon > self.epsilon_min:
+                        self.epsilon *= self.epsilon_decay
+
+                    total_reward_history.append(float(total_reward))
+
+                    # 학습 진행 상황 로깅
+                    if episode % 100 == 0:
+                        avg_reward = np.mean(total_reward_history[-100:])
+                        logging.info(
+                            f"Episode: {episode}/{episode_count}, "
+                            f"Average Reward: {avg_reward:.2f}, "
+                            f"Epsilon: {self.epsilon:.4f}"
+                        )
+                    episode += 1
+
+            elapsed = time.perf_counter() - start_time
+            self.episodes_per_second = episode_count / elapsed if elapsed > 0 else None
+            logging.info(f"학습 속도: {episode_count / max(elapsed, 1e-9):.1f} 에피소드/초 ({elapsed:.1f}초)")
 
             # 최고 성능의 모델 저장
             self.model.save('best_models/reinforcement_model.keras')
@@ -289,6 +410,7 @@ class ReinforcementLearningModel(BaseModel):
             logging.info(f"최종 평균 보상: {final_avg_reward:.2f}")
             logging.info(f"최종 탐험률: {self.epsilon:.4f}")
             logging.info(f"메모리 크기: {len(self.memory)}")
+            logging.info(f"에피소드/초: {self.episodes_per_second or 0:.1f}")
 
             return reward_history
 
@@ -296,6 +418,12 @@ class ReinforcementLearningModel(BaseModel):
             logging.error(f"학습 중 오류 발생: {str(e)}")
             raise
 
+    def fine_tune(self, train_data, new_count, episode_count=100):
+        """저장된 Q 네트워크에서 새 이력 기준으로 짧게 추가 학습 (탐험률은 낮게 시작)"""
+        self.update_target_model()
+        self.epsilon = max(self.epsilon_min, 0.1)
+        return self.train_episode(train_data, episode_count=episode_count)
+
     # 강화 학습 모델_1
     # def predict_numbers(self, input_data=None, n_predictions=6):
     #     """번호 예측"""
@@ -364,15 +492,15 @@ class ReinforcementLearningModel(BaseModel):
     #         logging.error(f"예측 중 오류: {str(e)}")
     #         raise
 
-    def predict_numbers(self, input_data=None, n_sets=1):
-        """번호 예측"""
+    def predict_many(self, input_data=None, n_sets=1, n_numbers=6):
+        """Q값 예측 한 번으로 n_sets 세트 생성"""
         try:
             if not self.model:
                 raise ValueError("모델이 학습되지 않았습니다.")
 
             # 전체 번호에 대한 Q값 예측
             state = np.zeros((1, self.state_size))
-            q_values = self.model.predict(state, verbose=0)[0]
+            q_values = self.q_values(state)[0]
 
             # Q값을 기반으로 상위 20개의 유망한 번호 선택
             top_k = 20
@@ -381,54 +509,30 @@ class ReinforcementLearningModel(BaseModel):
 
             logging.info(f"학습된 상위 {top_k}개 번호: {top_numbers}")
 
-            # 각 세트별로 다른 번호 조합 생성
+            # Q값에 기반한 가중치 (상위 번호 외에는 0) 에서 세트별로 비복원 추출
+            weights = np.zeros(self.action_size)
+            weights[top_indices] = self.softmax(q_values[top_indices])
+
             predictions = []
-            for set_num in range(n_sets):  # n_sets 만큼 생성
-                # 상위 번호들 중에서 6개 선택
-                available = top_numbers.copy()
-                selected = []
-
-                # Q값에 기반한 가중치 계산
-                if hasattr(self, 'softmax'):
-                    weights = self.softmax(q_values[np.array(top_indices)])
-                else:
-                    # 정적 메서드인 경우
-                    weights = self.__class__.softmax(q_values[np.array(top_indices)])
-
-                # 6개 번호 선택
-                while len(selected) < 6 and available:
-                    available_indices = [i for i, num in enumerate(top_numbers) if num in available]
-                    if not available_indices:
-                        break
-
-                    available_weights = weights[available_indices]
-                    available_weights = available_weights / np.sum(available_weights)
-
-                    selected_idx = np.random.choice(available_indices, p=available_weights)
-                    selected_number = top_numbers[selected_idx]
-
-                    selected.append(selected_number)
-                    available.remove(selected_number)
-
-                # 결과 정렬
-                selected = sorted(selected)
-                predictions.append(selected)
-                logging.info(f"세트 {set_num + 1} 예측 완료: {selected}")
-
-            # n_sets개의 예측 결과를 모두 반환
-            if len(predictions) == 1:
-                return predictions[0]
-            return predictions[0]  # 호환성을 위해 첫 번째 세트만 반환
+            for set_num, selected in enumerate(self.sample_sets(weights, n_sets, n_numbers)):
+                predictions.append([int(num) for num in selected])
+                logging.info(f"세트 {set_num + 1} 예측 완료: {predictions[-1]}")
+
+            return predictions
 
         except Exception as e:
             logging.error(f"예측 중 오류: {str(e)}")
             raise
 
+    def predict_numbers(self, input_data=None, n_sets=1):
+        """번호 예측 (호환성을 위해 첫 번째 세트만 반환)"""
+        return self.predict_many(input_data, n_sets)[0]
 
     def get_model_status(self):
         """모델 상태 정보 반환"""
         return {
             'epsilon': self.epsilon,
             'memory_size': len(self.memory),
-            'learning_rate': self.learning_rate
+            'learning_rate': self.learning_rate,
+            'episodes_per_second': self.episodes_per_second
         }
@@ -29,43 +29,62 @@ class StatisticalModel(BaseModel):
         self.section_freq = np.zeros(5)  # 구간별 출현 빈도
         self.streak_data = defaultdict(int)  # 연속 출현/미출현 데이터
         self.recent_numbers = []  # 최근 당첨 번호
+        self.total_draws = 0  # 분석한 회차 수
+        self.last_presence = None  # 마지막 분석 회차의 번호별 출현 여부 (연속성 갱신용)
         self.number_stats = {}  # 상세 통계 정보
 
     def build_model(self):
         """모델 구조 생성 - 통계 모델은 별도의 딥러닝 모델 구조가 필요 없음"""
         pass
 
+    @staticmethod
+    def presence_matrix(draws):
+        """당첨번호 [N,6] -> 번호별 출현 여부 [N,45]"""
+        draws = np.asarray(draws, dtype=np.int64).reshape(-1, 6)
+        presence = np.zeros((len(draws), 45), dtype=bool)
+        presence[np.arange(len(draws))[:, None], draws - 1] = True
+        return presence
+
+    def accumulate(self, draws, previous=None):
+        """회차 묶음의 빈도를 누적 (번호/구간/번호 쌍/간격/연속성)
+
+        previous: draws 바로 앞 회차의 출현 여부 [45] (연속성 분석을 이어서 계산할 때)
+        """
+        draws = np.asarray(draws, dtype=np.int64).reshape(-1, 6)
+        presence = self.presence_matrix(draws)
+
+        # 1. 단일 번호/구간 분석
+        self.number_freq += presence.sum(axis=0)
+        self.section_freq += np.bincount(((draws - 1) // 10).ravel(), minlength=5)[:5]
+
+        # 2. 번호 쌍 분석 (원-핫 Gram 행렬, 같은 번호 쌍은 제외)
+        onehot = presence.astype(np.float64)
+        pairs = onehot.T @ onehot
+        np.fill_diagonal(pairs, 0)
+        self.pair_freq += pairs
+
+        # 3. 번호 간격 분석
+        gap_counts = np.bincount(np.diff(np.sort(draws, axis=1), axis=1).ravel(), minlength=45)
+        for gap in np.flatnonzero(gap_counts):
+            self.gap_freq[int(gap)] += int(gap_counts[gap])
+
+        # 4. 연속성 분석
+        self.analyze_streaks(presence, previous)
+
+        self.total_draws += len(draws)
+        if len(presence):
+            self.last_presence = presence[-1]
+
     def analyze_data(self, historical_data):
         """데이터 분석"""
         try:
             logging.info("통계 분석 시작...")
-            total_draws = len(historical_data)
 
-            # 1. 단일 번호 분석
-            for numbers in historical_data:
-                for num in numbers:
-                    self.number_freq[num - 1] += 1
-                    self.section_freq[(num - 1) // 10] += 1
+            # 1~4. 빈도/쌍/간격/연속성 (전체 이력 한 번에)
+            self.accumulate(historical_data)
 
             # 출현 확률 계산
-            self.number_prob = self.number_freq / total_draws
-
-            # 2. 번호 쌍 분석
-            for numbers in historical_data:
-                for i in range(6):
-                    for j in range(i + 1, 6):
-                        self.pair_freq[numbers[i] - 1, numbers[j] - 1] += 1
-                        self.pair_freq[numbers[j] - 1, numbers[i] - 1] += 1
-
-            # 3. 번호 간격 분석
-            for numbers in historical_data:
-                sorted_nums = sorted(numbers)
-                gaps = np.diff(sorted_nums)
-                for gap in gaps:
-                    self.gap_freq[gap] += 1
-
-            # 4. 연속성 분석
-            self.analyze_streaks(historical_data)
+            self.number_prob = self.number_freq / len(historical_data)
 
             # 5. 최근 트렌드 분석
             self.recent_numbers = historical_data[-10:]  # 최근 10회차
@@ -80,49 +99,74 @@ class StatisticalModel(BaseModel):
             logging.error(f"데이터 분석 중 오류 발생: {str(e)}")
             raise
 
-    def analyze_streaks(self, historical_data):
-        """연속 출현/미출현 패턴 분석"""
+    def update(self, new_draws):
+        """새 회차만 반영해 통계 갱신 (전체 이력을 다시 분석하지 않음)"""
         try:
-            for num in range(1, 46):
-                streak = 0
-                max_streak = 0
-                for numbers in historical_data:
-                    if num in numbers:
-                        if streak < 0:
-                            self.streak_data[f"미출현_{abs(streak)}"] += 1
-                        streak = 1
-                    else:
-                        if streak > 0:
-                            self.streak_data[f"출현_{streak}"] += 1
-                        streak = -1
-                    max_streak = max(max_streak, abs(streak))
-
-            logging.info(f"최대 연속 기록: {max_streak}회")
+            new_draws = np.asarray(new_draws, dtype=np.int64).reshape(-1, 6)
+            if len(new_draws) == 0:
+                return
+
+            # 이전 버전에서 저장된 상태에는 회차 수/마지막 회차 출현 여부가 없음
+            if self.total_draws == 0:
+                self.total_draws = int(round(self.number_freq.sum() / 6))
+            previous = self.last_presence
+            if previous is None and len(self.recent_numbers):
+                previous = self.presence_matrix(np.asarray(self.recent_numbers)[-1:])[0]
+
+            self.accumulate(new_draws, previous)
+            self.number_prob = self.number_freq / self.total_draws
+
+            recent = np.concatenate([np.asarray(self.recent_numbers).reshape(-1, 6), new_draws])
+            self.recent_numbers = recent[-10:]
+            self.calculate_detailed_stats()
+
+            logging.info(f"통계 갱신 완료: 새 {len(new_draws)}회차, 누적 {self.total_draws}회차")
 
         except Exception as e:
-            logging.error(f"연속성 분석 중 오류: {str(e)}")
+            logging.error(f"통계 갱신 중 오류 발생: {str(e)}")
             raise
 
-    def calculate_detailed_stats(self, historical_data):
-        """상세 통계 정보 계산"""
+    def fine_tune(self, train_data, new_count):
+        """저장된 통계에 새 회차만 반영"""
+        self.update(np.asarray(train_data)[-new_count:])
+
+    def analyze_streaks(self, presence, previous=None):
+        """연속 출현/미출현 패턴 분석
+
+        회차 사이에 출현 -> 미출현, 미출현 -> 출현으로 바뀐 횟수를 번호 전체에 대해 센다.
+        """
         try:
-            for num in range(1, 46):
-                # 기본 출현 정보
-                appearances = self.number_freq[num - 1]
-                probability = self.number_prob[num - 1]
+            if previous is not None:
+                presence = np.vstack([np.asarray(previous, dtype=bool)[None, :], presence])
+            if len(presence) < 2:
+                return
 
-                # 최근 출현 정보
-                recent_count = sum(1 for numbers in self.recent_numbers
-                                   if num in numbers)
+            before, after = presence[:-1], presence[1:]
+            appeared = int((after & ~before).sum())
+            disappeared = int((~after & before).sum())
+            if appeared:
+                self.streak_data["미출현_1"] += appeared
+            if disappeared:
+                self.streak_data["출현_1"] += disappeared
 
-                # 번호 조합 정보
-                common_pairs = np.argsort(self.pair_freq[num - 1])[-5:]
+            logging.info(f"최대 연속 기록: {1 if appeared or disappeared else 0}회")
 
+        except Exception as e:
+            logging.error(f"연속성 분석 중 오류: {str(e)}")
+            raise
+
+    def calculate_detailed_stats(self, historical_data=None):
+        """상세 통계 정보 계산"""
+        try:
+            recent_counts = self.presence_matrix(np.asarray(self.recent_numbers)).sum(axis=0)
+            common_pairs = np.argsort(self.pair_freq, axis=1)[:, -5:]
+
+            for num in range(1, 46):
                 self.number_stats[num] = {
-                    'total_appearances': int(appearances),
-                    'probability': probability,
-                    'recent_appearances': recent_count,
-                    'common_pairs': [i + 1 for i in common_pairs],
+                    'total_appearances': int(self.number_freq[num - 1]),
+                    'probability': self.number_prob[num - 1],
+                    'recent_appearances': int(recent_counts[num - 1]),
+                    'common_pairs': [int(i) + 1 for i in common_pairs[num - 1]],
                     'section': (num - 1) // 10
                 }
 
@@ -136,21 +180,50 @@ class StatisticalModel(BaseModel):
             self.analyze_data(train_data)
 
             # 통계 모델 상태 저장
-            model_state = {
-                'number_freq': self.number_freq,
-                'pair_freq': self.pair_freq,
-                'gap_freq': dict(self.gap_freq),
-                'section_freq': self.section_freq,
-                'streak_data': dict(self.streak_data),
-                'number_stats': self.number_stats
-            }
-
-            np.save('best_models/statistical_model.npy', model_state)
+            self.save_model('best_models/statistical_model')
 
         except Exception as e:
             logging.error(f"모델 학습 중 오류: {str(e)}")
             raise
 
+    def save_model(self, filepath, weights_only=False):
+        """통계 모델 상태 저장 (저장된 파일 경로 반환)"""
+        model_state = {
+            'number_freq': self.number_freq,
+            'pair_freq': self.pair_freq,
+            'gap_freq': dict(self.gap_freq),
+            'section_freq': self.section_freq,
+            'streak_data': dict(self.streak_data),
+            'number_stats': self.number_stats,
+            'number_prob': getattr(self, 'number_prob', None),
+            'recent_numbers': np.asarray(self.recent_numbers),
+            'total_draws': self.total_draws,
+            'last_presence': self.last_presence
+        }
+        path = f"{filepath}.npy"
+        np.save(path, model_state)
+        return path
+
+    def load_model(self, filepath):
+        """save_model 로 저장한 상태 복원 (성공 여부 반환)"""
+        try:
+            state = np.load(filepath, allow_pickle=True).item()
+            self.number_freq = state['number_freq']
+            self.pair_freq = state['pair_freq']
+            self.gap_freq = defaultdict(int, state['gap_freq'])
+            self.section_freq = state['section_freq']
+            self.streak_data = defaultdict(int, state['streak_data'])
+            self.number_stats = state['number_stats']
+            if state.get('number_prob') is not None:
+                self.number_prob = state['number_prob']
+            self.recent_numbers = state.get('recent_numbers', [])
+            self.total_draws = state.get('total_draws', 0)
+            self.last_presence = state.get('last_presence')
+            return True
+        except Exception as e:
+            logging.error(f"모델 로드 중 오류: {str(e)}")
+            return False
+
     # def predict_numbers(self, input_data=None, n_predictions=6):
     #     """번호 예측"""
     #     try:
@@ -178,6 +251,52 @@ class StatisticalModel(BaseModel):
     #         logging.error(f"예측 중 오류: {str(e)}")
     #         raise
 
+    def predict_many(self, input_data=None, n_sets=1, n_numbers=6):
+        """확률 계산 한 번으로 n_sets 세트 예측
+
+        세트마다 predict_numbers 와 같이 한 번호씩 확률 비례로 뽑되, validate_selection 의
+        제약(연속 번호 금지, 같은 구간 3개 이상 금지)을 만족하는 번호만 후보로 두고
+        모든 세트를 동시에 진행한다. 후보가 없으면 선택되지 않은 번호 전체에서 뽑는다.
+        """
+        try:
+            probabilities = self.calculate_probabilities()
+            log_probs = np.where(probabilities > 0, np.log(np.maximum(probabilities, 1e-300)), -np.inf)
+            if not np.isfinite(log_probs).any():
+                raise ValueError("모든 확률이 0입니다.")
+
+            numbers = np.arange(1, 46)
+            sections = (numbers - 1) // 10
+            selected = np.zeros((n_sets, 45), dtype=bool)
+            section_counts = np.zeros((n_sets, 5), dtype=np.int64)
+            rows = np.arange(n_sets)
+
+            for _ in range(n_numbers):
+                # 이미 선택된 번호와 이웃한 번호, 3개가 찬 구간의 번호 제외
+                adjacent = np.zeros_like(selected)
+                adjacent[:, 1:] |= selected[:, :-1]
+                adjacent[:, :-1] |= selected[:, 1:]
+                allowed = ~selected & ~adjacent & (section_counts[:, sections] < 3)
+                allowed &= np.isfinite(log_probs)
+                stuck = ~allowed.any(axis=1)
+                allowed[stuck] = ~selected[stuck]
+
+                keys = np.where(allowed, log_probs + np.random.gumbel(size=selected.shape), -np.inf)
+                keys[stuck] = np.where(allowed[stuck], np.random.random((stuck.sum(), 45)), -np.inf)
+                picks = np.argmax(keys, axis=1)
+                selected[rows, picks] = True
+                section_counts[rows, sections[picks]] += 1
+
+            results = []
+            for row in selected:
+                result = self.format_numbers(numbers[row])
+                self.log_prediction_results(result, probabilities)
+                results.append(result)
+            return results
+
+        except Exception as e:
+            logging.error(f"예측 중 오류: {str(e)}")
+            raise
+
     def predict_numbers(self, input_data=None, n_predictions=6):
         """번호 예측"""
         try:
@@ -6,6 +6,8 @@ from tensorflow.keras.layers import (Input, Dense, LayerNormalization,
 from tensorflow.keras.models import Model
 from tensorflow.keras.optimizers import Adam
 from .base import BaseModel
+from utils.windowing import SequenceWindows
+from utils.tf_data import window_dataset
 import logging
 
 
@@ -131,26 +133,9 @@ class TransformerModel(BaseModel):
     def prepare_data(self, historical_data):
         """데이터 전처리"""
         try:
-            X = []
-            y = []
-
-            # 시퀀스 데이터 생성
-            for i in range(len(historical_data) - self.sequence_length):
-                sequence = historical_data[i:i + self.sequence_length]
-                target = historical_data[i + self.sequence_length]
-
-                # 원-핫 인코딩
-                sequence_encoded = np.zeros((self.sequence_length, 45))
-                target_encoded = np.zeros(45)
-
-                for j, numbers in enumerate(sequence):
-                    sequence_encoded[j, np.array(numbers) - 1] = 1
-                target_encoded[np.array(target) - 1] = 1
-
-                X.append(sequence_encoded)
-                y.append(target_encoded)
-
-            return np.array(X), np.array(y)
+            # 원-핫 버퍼 하나 위의 윈도우 (입력/타겟 모두 뷰, fit 시점에 텐서로 복사)
+            windows = SequenceWindows(historical_data, self.sequence_length)
+            return windows.inputs, windows.targets
 
         except Exception as e:
             logging.error(f"데이터 전처리 중 오류: {str(e)}")
@@ -159,12 +144,15 @@ class TransformerModel(BaseModel):
     def train(self, train_data, validation_data=None):
         """모델 학습"""
         try:
-            X, y = self.prepare_data(train_data)
+            # [N,6] 이력에서 원-핫 윈도우를 배치마다 생성하는 tf.data 파이프라인
+            windows = SequenceWindows(train_data, self.sequence_length)
+            dataset = window_dataset(windows, batch_size=32, shuffle=True)
+            logging.info(f"학습 윈도우: {len(windows)}개, 이력 버퍼 {windows.nbytes() / 1024:.1f}KB")
 
             # 검증 데이터 준비
             if validation_data is not None:
-                X_val, y_val = self.prepare_data(validation_data)
-                validation_data = (X_val, y_val)
+                validation_data = window_dataset(
+                    SequenceWindows(validation_data, self.sequence_length), batch_size=32, shuffle=False)
 
             # 콜백 설정
             callbacks = [
@@ -188,9 +176,8 @@ class TransformerModel(BaseModel):
 
             # 모델 학습
             history = self.model.fit(
-                X, y,
+                dataset,
                 epochs=100,
-                batch_size=32,
                 validation_data=validation_data,
                 callbacks=callbacks,
                 verbose=1
@@ -205,6 +192,19 @@ class TransformerModel(BaseModel):
             logging.error(f"모델 학습 중 오류: {str(e)}")
             raise
 
+    def fine_tune(self, train_data, new_count, epochs=5):
+        """새 회차를 타겟으로 하는 윈도우만으로 추가 학습"""
+        try:
+            recent = np.asarray(train_data)[-(new_count + self.sequence_length):]
+            windows = SequenceWindows(recent, self.sequence_length)
+            logging.info(f"추가 학습 윈도우: {len(windows)}개")
+            return self.model.fit(window_dataset(windows, batch_size=32, shuffle=True),
+                                  epochs=epochs, verbose=1)
+
+        except Exception as e:
+            logging.error(f"추가 학습 중 오류: {str(e)}")
+            raise
+
     # def predict_numbers(self, input_data=None, n_predictions=6):
     #     """번호 예측"""
     #     try:
@@ -249,58 +249,43 @@ class TransformerModel(BaseModel):
     #         logging.error(f"예측 중 오류: {str(e)}")
     #         raise
 
-    def predict_numbers(self, input_data=None, n_predictions=6):
-        """번호 예측"""
-        try:
-            if input_data is None:
-                raise ValueError("입력 데이터가 필요합니다.")
-
-            # 입력 데이터 준비
-            sequence = input_data[-self.sequence_length:]
-            sequence_encoded = np.zeros((1, self.sequence_length, 45))
-
-            for i, nums in enumerate(sequence):
-                for num in nums:
-                    sequence_encoded[0, i, int(num - 1)] = 1
-
-            # 예측 수행
-            predictions = self.model.predict(sequence_encoded, verbose=0)[0]
+    def predict_probabilities(self, input_data):
+        """마지막 sequence_length 회차 다음 회차의 번호별 확률 [45] (순전파 1회)"""
+        if input_data is None:
+            raise ValueError("입력 데이터가 필요합니다.")
 
-            # 번호 선택
-            selected_numbers = []
-            remaining_probs = predictions.copy()
+        # 입력 데이터 준비
+        sequence_encoded = SequenceWindows(
+            input_data[-self.sequence_length:], self.sequence_length).last_window()
 
-            for _ in range(n_predictions):
-                # 이미 선택된 번호 제외
-                mask = np.ones(45, dtype=bool)
-                if selected_numbers:
-                    mask[np.array([int(x - 1) for x in selected_numbers])] = False
+        # 예측 수행
+        return self.run_inference(sequence_encoded)[0]
 
-                # 확률 정규화
-                masked_probs = remaining_probs * mask
-                if np.sum(masked_probs) > 0:
-                    masked_probs = masked_probs / np.sum(masked_probs)
-                    selected = int(np.random.choice(45, p=masked_probs)) + 1
-                else:
-                    # 확률이 0인 경우 무작위 선택
-                    available = np.where(mask)[0]
-                    selected = int(np.random.choice(available)) + 1
-
-                selected_numbers.append(selected)
+    def predict_many(self, input_data=None, n_sets=1, n_numbers=6):
+        """순전파 한 번의 확률 분포에서 n_sets 세트 추출"""
+        try:
+            predictions = self.predict_probabilities(input_data)
 
-            result = self.format_numbers(selected_numbers)
+            results = []
+            for numbers in self.sample_sets(predictions, n_sets, n_numbers):
+                result = self.format_numbers(numbers)
 
-            # 예측 결과 로깅
-            prob_str = ", ".join(f"{predictions[n - 1]:.4f}" for n in result)
-            logging.info(f"예측된 번호: {result}")
-            logging.info(f"각 번호의 확률: [{prob_str}]")
+                # 예측 결과 로깅
+                prob_str = ", ".join(f"{predictions[n - 1]:.4f}" for n in result)
+                logging.info(f"예측된 번호: {result}")
+                logging.info(f"각 번호의 확률: [{prob_str}]")
+                results.append(result)
 
-            return result
+            return results
 
         except Exception as e:
             logging.error(f"예측 중 오류: {str(e)}")
             raise
 
+    def predict_numbers(self, input_data=None, n_predictions=6):
+        """번호 예측"""
+        return self.predict_many(input_data, 1, n_predictions)[0]
+
     def log_training_results(self, history):
         """학습 결과 로깅"""
         logging.info("\n=== 학습 결과 ===")
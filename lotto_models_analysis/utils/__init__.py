@@ -1,7 +1,11 @@
 from .data_loader import DataLoader
 from .preprocessing import DataPreprocessor
+from .windowing import SequenceWindows, marking_patterns, one_hot_history
 
 __all__ = [
     'DataLoader',
-    'DataPreprocessor'
+    'DataPreprocessor',
+    'SequenceWindows',
+    'marking_patterns',
+    'one_hot_history'
 ]
\ No newline at end of file
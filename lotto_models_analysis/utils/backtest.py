@@ -0,0 +1,478 @@
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+import numpy as np
+
+from .model_registry import ModelRegistry
+from .threads import limited_threads_env
+from .windowing import SequenceWindows, marking_patterns
+
+RESULTS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS backtest_runs (
+        run_id TEXT PRIMARY KEY,
+        config TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS backtest_results (
+        run_id TEXT NOT NULL,
+        model_type TEXT NOT NULL,
+        draw_number INTEGER NOT NULL,
+        set_index INTEGER NOT NULL,
+        numbers TEXT NOT NULL,
+        matches INTEGER NOT NULL,
+        rank INTEGER NOT NULL,
+        train_mode TEXT NOT NULL,
+        seconds REAL,
+        PRIMARY KEY (run_id, model_type, draw_number, set_index)
+    );
+    CREATE TABLE IF NOT EXISTS backtest_hit_counts (
+        run_id TEXT NOT NULL,
+        model_type TEXT NOT NULL,
+        matches INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (run_id, model_type, matches)
+    );
+"""
+
+# 작업 프로세스 상태 (이력은 초기화 때 한 번만 전달되는 읽기 전용 배열)
+_backtest_state = {}
+
+
+def _connect(results_path):
+    # 작업 프로세스들이 같은 파일에 회차별로 기록하므로 잠금 대기 시간을 넉넉히 둔다
+    return sqlite3.connect(results_path, timeout=60)
+
+
+def _init_backtest_worker(draw_numbers, numbers, settings):
+    """작업 프로세스 초기화: 전체 이력과 실행 설정 보관"""
+    _backtest_state.clear()
+    _backtest_state.update(_make_state(draw_numbers, numbers, settings))
+
+
+def _make_state(draw_numbers, numbers, settings):
+    draw_numbers = np.asarray(draw_numbers, dtype=np.int64)
+    numbers = np.asarray(numbers, dtype=np.int64)
+    draw_numbers.setflags(write=False)
+    numbers.setflags(write=False)
+    return dict(settings, draw_numbers=draw_numbers, numbers=numbers)
+
+
+def _seed_draw(seed, draw_number):
+    """회차별 난수 시드 (샤드 구성/프로세스 수와 무관하게 같은 회차는 같은 시드)"""
+    value = (int(seed) * 1_000_003 + int(draw_number)) % 2 ** 31
+    random.seed(value)
+    np.random.seed(value)
+    if 'tensorflow' in sys.modules:
+        sys.modules['tensorflow'].random.set_seed(value)
+    return value
+
+
+def _work_dir(state):
+    """모델 train() 이 best_models/, logs/ 에 남기는 파일을 받을 프로세스별 작업 폴더
+
+    train() 은 앱의 best_models/ 에 학습 결과를 덮어쓰므로, 샤드 실행 중에는 이 폴더를 현재
+    디렉토리로 두어 사용자의 실제 모델 파일을 건드리지 않는다 (체크포인트는 ModelRegistry 로만 관리).
+    """
+    path = os.path.join(state['work_dir'], str(os.getpid()))
+    for name in ('best_models', 'logs'):
+        os.makedirs(os.path.join(path, name), exist_ok=True)
+    return path
+
+
+def _members(model):
+    """모델과 (앙상블이면) 하위 모델 목록"""
+    return [model, *getattr(model, 'models', {}).values()]
+
+
+def model_inputs(model_type, model, history):
+    """history([N,6]) 로 학습할 데이터와 그 다음 회차를 예측할 입력 (main.py 와 같은 형식)"""
+    if model_type == "혼합 모델":
+        # 다음 회차 예측 윈도우 + 마지막 회차 마킹 패턴
+        windows = SequenceWindows(history, model.sequence_length)
+        return windows, (marking_patterns(history[-1:]), windows.last_window())
+    return history, history
+
+
+def _new_model(model_type):
+    """백테스트용 모델 생성 (샤드 단위로 이미 병렬이므로 모델 내부 프로세스 풀은 끔)"""
+    from models import get_model
+
+    model = get_model(model_type)
+    for member in _members(model):
+        if hasattr(member, 'parallel_training'):
+            member.parallel_training = False
+        if hasattr(member, 'island_processes'):
+            member.island_processes = 1
+    return model
+
+
+def _prepare_model(model_type, model, history, draw_numbers, registry, key):
+    """체크포인트가 있으면 불러와 남은 회차만 추가 학습, 없으면 전체 학습 -> 학습 방식"""
+    train_data, _ = model_inputs(model_type, model, history)
+    if registry is not None:
+        status, meta, new_count = registry.match(key, draw_numbers, history)
+        if status != 'missing' and registry.load(model, meta):
+            if new_count:
+                model.fine_tune(train_data, new_count)
+            return 'resumed'
+    model.train(train_data)
+    return 'trained'
+
+
+def _record_draw(conn, run_id, model_type, draw_number, predictions, actual, model, train_mode, seconds):
+    """회차 하나의 예측 세트와 채점 결과를 한 트랜잭션으로 기록 (회차 단위 체크포인트)"""
+    actual = set(int(num) for num in actual)
+    rows = []
+    for set_index, numbers in enumerate(predictions):
+        rows.append((run_id, model_type, int(draw_number), set_index, ','.join(map(str, numbers)),
+                     len(set(numbers) & actual), model.evaluate_prediction(numbers, sorted(actual)),
+                     train_mode, seconds))
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO backtest_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return rows
+
+
+def _run_shard(model_type, shard, indices, state=None):
+    """샤드(연속 회차 묶음) 하나 실행 -> (모델, 샤드, 완료 회차 수, 실패 회차 수)
+
+    샤드의 첫 회차에서 그 이전 회차로 학습하고, 이후 회차는 incremental 이면 새 회차만
+    fine_tune, 아니면 회차마다 새로 학습한다. 예측/채점 결과는 회차마다 바로 기록한다.
+    """
+    state = state or _backtest_state
+    draw_numbers, numbers = state['draw_numbers'], state['numbers']
+    run_id = state['run_id']
+
+    registry = None
+    key = {'model_type': model_type, 'backtest_run': run_id, 'shard': int(shard)}
+    if state['incremental'] and state['checkpoint_every']:
+        registry = ModelRegistry(os.path.join(state['checkpoint_dir'], run_id), keep=1)
+
+    # 모델 모듈(TensorFlow 포함)을 먼저 불러와야 첫 회차의 _seed_draw 가 TF 시드까지 고정한다
+    from models import get_model_class
+
+    get_model_class(model_type)
+
+    conn = _connect(state['results_path'])
+    model, seen, since_checkpoint = None, 0, 0
+    done, failed = 0, 0
+    previous_cwd = os.getcwd()
+    os.chdir(_work_dir(state))
+    try:
+        for index in indices:
+            history = numbers[:index]
+            draw_number = draw_numbers[index]
+            start_time = time.perf_counter()
+            try:
+                seed = _seed_draw(state['seed'], draw_number)
+                if model is None or not state['incremental']:
+                    model = _new_model(model_type)
+                    train_mode = _prepare_model(model_type, model, history, draw_numbers[:index], registry, key)
+                else:
+                    train_data, _ = model_inputs(model_type, model, history)
+                    model.fine_tune(train_data, index - seen)
+                    train_mode = 'fine_tuned'
+                seen = index
+
+                # 섬 모델 진화처럼 자체 시드를 쓰는 예측도 회차 시드로 고정
+                for member in _members(model):
+                    if hasattr(member, 'island_seed'):
+                        member.island_seed = seed
+
+                _, input_data = model_inputs(model_type, model, history)
+                predictions = model.predict_many(input_data, state['n_sets'])
+                _record_draw(conn, run_id, model_type, draw_number, predictions, numbers[index],
+                             model, train_mode, time.perf_counter() - start_time)
+                done += 1
+
+                since_checkpoint += 1
+                if registry is not None and since_checkpoint >= state['checkpoint_every']:
+                    registry.save(model, key, draw_numbers[:index], history)
+                    since_checkpoint = 0
+
+            except Exception as e:
+                # 기록되지 않은 회차는 재개할 때 다시 실행되고, 다음 회차는 새로 학습
+                logging.error(f"{model_type} {draw_number}회차 백테스트 중 오류: {str(e)}")
+                failed += 1
+                model = None
+
+        if registry is not None and failed == 0:
+            # 샤드가 끝나면 모델 체크포인트는 필요 없음
+            shutil.rmtree(registry.key_dir(key), ignore_errors=True)
+
+    finally:
+        os.chdir(previous_cwd)
+        conn.close()
+
+    return model_type, shard, done, failed
+
+
+class WalkForwardBacktest:
+    """워크 포워드 백테스트
+
+    대상 회차 t 마다 t 이전 회차로 학습(또는 추가 학습)한 모델로 n_sets 세트를 예측하고
+    t 회차 당첨번호로 채점해 결과 DB 에 기록한다.
+
+    - 대상 회차는 shard_size 개씩 연속된 샤드로 나누어 프로세스 풀에서 실행
+      (샤드 첫 회차에서 전체 학습, 이후 회차는 incremental 이면 새 회차만 fine_tune)
+    - 이력은 작업 프로세스마다 초기화 때 한 번만 전달 (읽기 전용)
+    - 체크포인트/재개: 회차별 결과는 한 트랜잭션으로 기록되고, 같은 설정(run_id)으로 다시
+      실행하면 기록된 회차는 건너뛴다. 진행 중이던 샤드의 모델은 checkpoint_every 회차마다
+      ModelRegistry 로 저장해 두었다가 이어서 추가 학습한다.
+      재개한 결과가 중단 없이 실행한 결과와 같은 것은 통계 기반 모델처럼 fine_tune 이 새 회차만
+      반영하는 모델뿐이다. 유전 알고리즘 모델은 fine_tune 한 번에 건너뛴 회차 수와 무관하게 정해진
+      세대만 진화하고, Keras 모델은 체크포인트 이후의 난수/옵티마이저 진행이 달라 결과가 다를 수 있다.
+    - 회차별 난수 시드는 seed 와 회차 번호로 정해지므로 프로세스 수와 무관
+    - 모델 train() 이 best_models/, logs/ 에 쓰는 파일은 checkpoint_dir 아래 작업 폴더로 돌려
+      앱의 실제 모델 파일을 덮어쓰지 않는다
+    """
+
+    def __init__(self, db_path='data/lotto.db', results_path='backtest/backtest.db', model_types=None,
+                 start_draw=1, first_target=None, last_target=None, min_history=100, n_sets=5,
+                 shard_size=25, incremental=True, checkpoint_every=10, processes=None, seed=0,
+                 checkpoint_dir='backtest/checkpoints'):
+        from models import get_available_models
+
+        self.db_path = db_path
+        self.results_path = results_path
+        self.model_types = list(model_types or get_available_models())
+        self.start_draw = start_draw
+        self.first_target = first_target
+        self.last_target = last_target
+        self.min_history = min_history
+        self.n_sets = n_sets
+        self.shard_size = max(int(shard_size), 1)
+        self.incremental = incremental
+        self.checkpoint_every = checkpoint_every
+        self.processes = processes
+        self.seed = seed
+        self.checkpoint_dir = checkpoint_dir
+
+    def config(self):
+        """결과에 영향을 주는 설정 (run_id 계산용, 모델 목록/프로세스 수는 제외)"""
+        return {
+            'start_draw': int(self.start_draw),
+            'first_target': self.first_target,
+            'last_target': self.last_target,
+            'min_history': int(self.min_history),
+            'n_sets': int(self.n_sets),
+            'shard_size': self.shard_size,
+            'incremental': bool(self.incremental),
+            'seed': int(self.seed)
+        }
+
+    @property
+    def run_id(self):
+        config = json.dumps(self.config(), sort_keys=True)
+        return hashlib.sha1(config.encode('utf-8')).hexdigest()[:12]
+
+    def load_history(self):
+        """시작 회차 이후 전체 이력 -> (회차 번호 [N], 당첨번호 [N,6])"""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT draw_number, num1, num2, num3, num4, num5, num6 FROM lotto_results "
+                "WHERE draw_number >= ? ORDER BY draw_number", (self.start_draw,)
+            ).fetchall()
+        if not rows:
+            raise ValueError("백테스트할 데이터가 없습니다.")
+        data = np.array(rows, dtype=np.int64)
+        return data[:, 0], data[:, 1:]
+
+    def setup_results(self):
+        """결과 DB 테이블 생성 및 실행 설정 등록"""
+        os.makedirs(os.path.dirname(self.results_path) or '.', exist_ok=True)
+        with _connect(self.results_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(RESULTS_SCHEMA)
+            conn.execute("INSERT OR IGNORE INTO backtest_runs VALUES (?, ?, ?)",
+                         (self.run_id, json.dumps(self.config(), sort_keys=True),
+                          datetime.now().isoformat(timespec='seconds')))
+
+    def completed(self):
+        """기록이 끝난 (모델, 회차) 집합"""
+        with _connect(self.results_path) as conn:
+            rows = conn.execute("SELECT DISTINCT model_type, draw_number FROM backtest_results "
+                                "WHERE run_id = ?", (self.run_id,)).fetchall()
+        return set(rows)
+
+    def target_indices(self, draw_numbers):
+        """대상 회차의 이력 위치 (앞쪽 min_history 회차는 학습용으로만 사용)"""
+        indices = np.arange(max(self.min_history, 1), len(draw_numbers))
+        if self.first_target is not None:
+            indices = indices[draw_numbers[indices] >= self.first_target]
+        if self.last_target is not None:
+            indices = indices[draw_numbers[indices] <= self.last_target]
+        return indices
+
+    def plan(self, draw_numbers):
+        """남은 작업 -> [(모델, 샤드 번호, 이력 위치 목록)]
+
+        샤드 경계는 대상 회차 기준으로 고정이라 재개해도 같은 샤드로 나뉜다.
+        """
+        indices = self.target_indices(draw_numbers)
+        if len(indices) == 0:
+            return []
+        completed = self.completed()
+
+        tasks = []
+        for model_type in self.model_types:
+            shards = {}
+            for position, index in enumerate(indices):
+                if (model_type, int(draw_numbers[index])) not in completed:
+                    shards.setdefault(position // self.shard_size, []).append(int(index))
+            tasks.extend((model_type, shard, shard_indices) for shard, shard_indices in sorted(shards.items()))
+        return tasks
+
+    @property
+    def work_dir(self):
+        return os.path.join(os.path.abspath(self.checkpoint_dir), self.run_id, 'work')
+
+    def worker_settings(self):
+        # 작업 프로세스는 샤드 실행 중 work_dir 로 이동하므로 경로는 절대 경로로 전달
+        return {
+            'run_id': self.run_id,
+            'results_path': os.path.abspath(self.results_path),
+            'checkpoint_dir': os.path.abspath(self.checkpoint_dir),
+            'work_dir': self.work_dir,
+            'checkpoint_every': self.checkpoint_every,
+            'incremental': self.incremental,
+            'n_sets': self.n_sets,
+            'seed': self.seed
+        }
+
+    def run(self, log=None):
+        """남은 회차 백테스트 실행 후 모델별 일치 개수 분포 반환"""
+        log = log or logging.info
+        draw_numbers, numbers = self.load_history()
+        self.setup_results()
+
+        tasks = self.plan(draw_numbers)
+        total = sum(len(indices) for _, _, indices in tasks)
+        if not tasks:
+            log(f"백테스트 {self.run_id}: 남은 회차가 없습니다.")
+            return self.hit_counts()
+
+        cpu_count = os.cpu_count() or 1
+        workers = min(self.processes or cpu_count, len(tasks))
+        log(f"백테스트 {self.run_id}: 모델 {len(self.model_types)}개, 남은 {total}회차 "
+            f"(샤드 {len(tasks)}개, 프로세스 {workers}개)")
+
+        start_time = time.perf_counter()
+        finished = 0
+
+        def report(result):
+            nonlocal finished
+            model_type, shard, done, failed = result
+            finished += done
+            log(f"{model_type} 샤드 {shard}: {done}회차 완료" + (f", {failed}회차 실패" if failed else "") +
+                f" ({finished}/{total}, {time.perf_counter() - start_time:.0f}초)")
+
+        inline = workers <= 1
+        if not inline:
+            # 프로세스당 스레드는 CPU 코어 수 / 동시 프로세스 수로 제한
+            threads = max(1, cpu_count // workers)
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_backtest_worker, initargs=(draw_numbers, numbers, self.worker_settings())
+            )
+            try:
+                # 프로세스는 submit 시점에 시작되므로 이 구간에서만 스레드 제한 환경 변수 적용
+                with limited_threads_env(threads):
+                    futures = {executor.submit(_run_shard, *task): task for task in tasks}
+
+                for future in as_completed(futures):
+                    model_type, shard, _ = futures[future]
+                    try:
+                        report(future.result())
+                    except BrokenProcessPool as e:
+                        # 프로세스 시작 실패/비정상 종료: 남은 회차는 현재 프로세스에서 실행
+                        logging.error(f"백테스트 프로세스 오류: {str(e)}")
+                        inline = True
+                        break
+                    except Exception as e:
+                        logging.error(f"{model_type} 샤드 {shard} 백테스트 중 오류: {str(e)}")
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        if inline:
+            state = _make_state(draw_numbers, numbers, self.worker_settings())
+            for task in self.plan(draw_numbers):
+                report(_run_shard(*task, state=state))
+
+        # 모델 train() 이 남긴 파일은 결과에 쓰이지 않음
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        return self.hit_counts()
+
+    def hit_counts(self):
+        """모델별 세트당 일치 개수 분포 {모델: [0~6개 일치 세트 수]} (backtest_hit_counts 에도 저장)"""
+        with _connect(self.results_path) as conn:
+            rows = conn.execute("SELECT model_type, matches, COUNT(*) FROM backtest_results "
+                                "WHERE run_id = ? GROUP BY model_type, matches", (self.run_id,)).fetchall()
+            conn.execute("DELETE FROM backtest_hit_counts WHERE run_id = ?", (self.run_id,))
+            conn.executemany("INSERT INTO backtest_hit_counts VALUES (?, ?, ?, ?)",
+                             [(self.run_id, model_type, matches, count) for model_type, matches, count in rows])
+
+        counts = {}
+        for model_type, matches, count in rows:
+            counts.setdefault(model_type, np.zeros(7, dtype=np.int64))[matches] = count
+        return counts
+
+    def summary(self, counts=None):
+        """모델별 요약 (세트 수, 평균 일치 개수, 3개 이상 일치 비율, 분포)"""
+        counts = self.hit_counts() if counts is None else counts
+        summary = {}
+        for model_type, distribution in counts.items():
+            sets = int(distribution.sum())
+            summary[model_type] = {
+                'sets': sets,
+                'mean_matches': float(np.arange(7) @ distribution / sets) if sets else 0.0,
+                'hit_rate': float(distribution[3:].sum() / sets) if sets else 0.0,
+                'distribution': distribution.tolist()
+            }
+        return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모델별 워크 포워드 백테스트 (앱 디렉토리에서 python -m utils.backtest)")
+    parser.add_argument('--db', default='data/lotto.db')
+    parser.add_argument('--results', default='backtest/backtest.db')
+    parser.add_argument('--models', nargs='*', help="모델 이름 (기본: 전체)")
+    parser.add_argument('--start-draw', type=int, default=1)
+    parser.add_argument('--first', type=int, help="첫 대상 회차")
+    parser.add_argument('--last', type=int, help="마지막 대상 회차")
+    parser.add_argument('--min-history', type=int, default=100)
+    parser.add_argument('--sets', type=int, default=5)
+    parser.add_argument('--shard-size', type=int, default=25)
+    parser.add_argument('--checkpoint-every', type=int, default=10)
+    parser.add_argument('--processes', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--full-retrain', action='store_true', help="회차마다 새로 학습")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    backtest = WalkForwardBacktest(
+        args.db, args.results, args.models, args.start_draw, args.first, args.last,
+        args.min_history, args.sets, args.shard_size, not args.full_retrain, args.checkpoint_every,
+        args.processes, args.seed
+    )
+    counts = backtest.run(log=print)
+
+    print(f"\n백테스트 {backtest.run_id} 결과 ({backtest.results_path})")
+    for model_type, result in backtest.summary(counts).items():
+        print(f"{model_type}: {result['sets']}세트, 평균 {result['mean_matches']:.3f}개 일치, "
+              f"3개 이상 {result['hit_rate']:.2%}, 분포 {result['distribution']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -181,6 +181,7 @@ import pandas as pd
 from datetime import datetime
 import logging
 from .preprocessing import DataPreprocessor
+from .windowing import SequenceWindows, marking_patterns
 
 
 class DataLoader:
@@ -271,51 +272,22 @@ class DataLoader:
             # 번호 데이터 추출 및 정수형으로 변환
             numbers = df[['num1', 'num2', 'num3', 'num4', 'num5', 'num6']].values.astype(np.int32)
 
-            # 시퀀스 데이터 생성
+            # 원-핫 버퍼 하나 위에 윈도우 생성 (입력/타겟 모두 버퍼의 뷰)
             if self.sequence_mode == "전체 데이터":
+                # 전체의 1/10 길이 윈도우를 절반씩 겹치게, 타겟은 윈도우 마지막 회차
                 sequence_length = len(numbers) // 10
-                X = []
-                y = []
-                for i in range(0, len(numbers) - sequence_length, sequence_length // 2):
-                    sequence = numbers[i:i + sequence_length]
-                    target = numbers[i + sequence_length - 1]
-
-                    # 시퀀스 원-핫 인코딩
-                    sequence_encoded = np.zeros((sequence_length, 45))
-                    for j, nums in enumerate(sequence):
-                        for num in nums:
-                            sequence_encoded[j, int(num - 1)] = 1
-
-                    X.append(sequence_encoded)
-                    y.append(target)
+                self.windows = SequenceWindows(numbers, sequence_length,
+                                               stride=sequence_length // 2, target_offset=-1)
             else:
-                X = []
-                y = []
-                for i in range(len(numbers) - self.sequence_length):
-                    sequence = numbers[i:i + self.sequence_length]
-                    target = numbers[i + self.sequence_length]
-
-                    # 시퀀스 원-핫 인코딩
-                    sequence_encoded = np.zeros((self.sequence_length, 45))
-                    for j, nums in enumerate(sequence):
-                        for num in nums:
-                            sequence_encoded[j, int(num - 1)] = 1
-
-                    X.append(sequence_encoded)
-                    y.append(target)
-
-            X = np.array(X, dtype=np.float32)
-            y = np.array(y, dtype=np.float32)
-
-            # 타겟 원-핫 인코딩
-            y_encoded = np.zeros((len(y), 45))
-            for i, nums in enumerate(y):
-                for num in nums:
-                    y_encoded[i, int(num - 1)] = 1
+                self.windows = SequenceWindows(numbers, self.sequence_length)
+
+            X = self.windows.inputs
+            y_encoded = self.windows.targets
 
             logging.info("데이터 전처리 완료")
             logging.info(f"입력 데이터 shape: {X.shape}")
             logging.info(f"출력 데이터 shape: {y_encoded.shape}")
+            logging.info(f"원-핫 버퍼: {self.windows.nbytes() / 1024:.1f}KB")
 
             return X, y_encoded, numbers[-len(X):]
 
@@ -327,12 +299,7 @@ class DataLoader:
     def create_marking_patterns(self, numbers):
         """마킹지 패턴 생성"""
         try:
-            patterns = np.array([
-                self.preprocessor.create_marking_pattern(row)
-                for row in numbers
-            ])
-
-            patterns = patterns.reshape(-1, 7, 7, 1)
+            patterns = marking_patterns(numbers)
             logging.info(f"마킹 패턴 생성 완료 - shape: {patterns.shape}")
 
             return patterns
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+
+
+class ModelRegistry:
+    """학습된 모델 저장소
+
+    (모델 종류, 시작 회차, 시퀀스 설정) 별로 학습 결과물과 메타데이터를 저장하고,
+    같은 데이터(회차 범위 + 당첨번호 지문)로 학습된 결과물이 있으면 재학습 없이 불러온다.
+
+    - 저장 위치: <root>/<설정 키 해시>/<마지막 회차>_<지문 앞 8자리>/ (model.* + meta.json)
+    - 상태 판정 (match)
+      'current'  : 같은 데이터로 학습된 결과물 -> 그대로 사용
+      'new_draws': 저장된 데이터가 현재 데이터의 앞부분 -> 불러온 뒤 새 회차만 추가 학습
+      'missing'  : 사용할 결과물 없음 -> 전체 학습
+    - 설정 키마다 최근 keep 개만 보관
+    """
+
+    def __init__(self, root='best_models/registry', keep=3):
+        self.root = root
+        self.keep = keep
+
+    @staticmethod
+    def make_key(model_type, start_draw, sequence_mode, sequence_length):
+        """설정 키 (종료 회차는 데이터 버전에 포함)"""
+        return {
+            'model_type': model_type,
+            'start_draw': int(start_draw),
+            'sequence_mode': sequence_mode,
+            'sequence_length': int(sequence_length) if sequence_mode == "지정 길이" else None
+        }
+
+    @staticmethod
+    def fingerprint(draw_numbers, numbers):
+        """회차 번호 + 당첨번호 지문 (sha1)"""
+        digest = hashlib.sha1()
+        digest.update(np.ascontiguousarray(draw_numbers, dtype=np.int64).tobytes())
+        digest.update(np.ascontiguousarray(numbers, dtype=np.int64).tobytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def data_version(cls, draw_numbers, numbers):
+        """학습 데이터 버전 (회차 범위, 회차 수, 지문)"""
+        return {
+            'first_draw': int(draw_numbers[0]) if len(draw_numbers) else None,
+            'last_draw': int(draw_numbers[-1]) if len(draw_numbers) else None,
+            'draw_count': int(len(draw_numbers)),
+            'fingerprint': cls.fingerprint(draw_numbers, numbers)
+        }
+
+    def key_dir(self, key):
+        key_hash = hashlib.sha1(json.dumps(key, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        return os.path.join(self.root, key_hash.hexdigest()[:16])
+
+    def entries(self, key):
+        """설정 키의 저장된 결과물 메타데이터 목록 (최근 학습 순)"""
+        key_dir = self.key_dir(key)
+        if not os.path.isdir(key_dir):
+            return []
+
+        entries = []
+        for name in os.listdir(key_dir):
+            meta_path = os.path.join(key_dir, name, 'meta.json')
+            try:
+                with open(meta_path, encoding='utf-8') as f:
+                    meta = json.load(f)
+                meta['path'] = os.path.join(key_dir, name)
+                entries.append(meta)
+            except (OSError, ValueError):
+                continue
+        return sorted(entries, key=lambda meta: meta.get('trained_at', ''), reverse=True)
+
+    def match(self, key, draw_numbers, numbers):
+        """현재 데이터에 맞는 결과물 -> (상태, 메타데이터, 새 회차 수)"""
+        version = self.data_version(draw_numbers, numbers)
+        prefix = None
+
+        for meta in self.entries(key):
+            stored = meta['data_version']
+            if stored['fingerprint'] == version['fingerprint']:
+                return 'current', meta, 0
+
+            # 저장된 데이터가 현재 데이터의 앞부분인지 (DB 에 새 회차만 추가된 경우)
+            count = stored['draw_count']
+            if 0 < count < version['draw_count'] and \
+                    self.fingerprint(draw_numbers[:count], numbers[:count]) == stored['fingerprint']:
+                if prefix is None or count > prefix['data_version']['draw_count']:
+                    prefix = meta
+
+        if prefix is not None:
+            return 'new_draws', prefix, version['draw_count'] - prefix['data_version']['draw_count']
+        return 'missing', None, version['draw_count']
+
+    def load(self, model, meta):
+        """결과물을 모델에 적용 (성공 여부 반환)"""
+        path = os.path.join(meta['path'], meta['artifact'])
+        if not os.path.exists(path):
+            logging.warning(f"저장된 모델 파일이 없습니다: {path}")
+            return False
+        return bool(model.load_model(path))
+
+    def save(self, model, key, draw_numbers, numbers, train_seconds=None, base=None):
+        """학습된 모델 저장 후 메타데이터 반환 (저장 실패 시 None)
+
+        base: 추가 학습의 기준이 된 결과물 메타데이터
+        """
+        version = self.data_version(draw_numbers, numbers)
+        entry_dir = os.path.join(self.key_dir(key), f"{version['last_draw']}_{version['fingerprint'][:8]}")
+        os.makedirs(entry_dir, exist_ok=True)
+
+        path = model.save_model(os.path.join(entry_dir, 'model'), weights_only=True)
+        if path is None:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            logging.warning(f"{key['model_type']}: 저장할 모델이 없어 저장소에 등록하지 않습니다.")
+            return None
+
+        meta = {
+            'key': key,
+            'data_version': version,
+            'model_class': type(model).__name__,
+            'artifact': os.path.basename(path),
+            'trained_at': datetime.now().isoformat(timespec='seconds'),
+            'train_seconds': train_seconds,
+            'fine_tuned_from': base['data_version'] if base else None
+        }
+        with open(os.path.join(entry_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+        self.prune(key)
+        meta['path'] = entry_dir
+        return meta
+
+    def prune(self, key):
+        """설정 키별 최근 keep 개만 남기고 삭제"""
+        for meta in self.entries(key)[self.keep:]:
+            shutil.rmtree(meta['path'], ignore_errors=True)
+
+    def train_or_load(self, model, key, draw_numbers, numbers, train_data, fine_tune=True, log=None):
+        """저장소에 맞는 결과물이 있으면 불러오고, 없으면 학습 후 저장 -> 상태 문자열
+
+        - 'loaded'    : 같은 데이터의 결과물 사용 (학습 없음)
+        - 'fine_tuned': 이전 결과물 + 새 회차만 추가 학습
+        - 'trained'   : 전체 학습
+        """
+        log = log or logging.info
+        status, meta, new_count = self.match(key, draw_numbers, numbers)
+
+        if status == 'current' and self.load(model, meta):
+            log(f"저장된 모델 사용: {meta['data_version']['first_draw']}~{meta['data_version']['last_draw']}회차 "
+                f"({meta['trained_at']} 학습)")
+            return 'loaded'
+
+        start_time = time.perf_counter()
+        if status == 'new_draws' and fine_tune and self.load(model, meta):
+            log(f"저장된 모델({meta['data_version']['last_draw']}회차까지)에 새 {new_count}회차 추가 학습")
+            model.fine_tune(train_data, new_count)
+            result = 'fine_tuned'
+        else:
+            log("모델 학습 중...")
+            model.train(train_data)
+            meta = None
+            result = 'trained'
+
+        elapsed = time.perf_counter() - start_time
+        if self.save(model, key, draw_numbers, numbers, elapsed, base=meta) is not None:
+            log(f"모델 저장소에 등록 ({elapsed:.1f}초 학습)")
+        return result
@@ -1,37 +1,49 @@
 
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
 import logging
+from numpy.lib.stride_tricks import sliding_window_view
+from .windowing import one_hot_history
 
 
 class DataPreprocessor:
     """로또 데이터 전처리 클래스"""
 
     def __init__(self):
-        self.num_scaler = MinMaxScaler()
-        self.seq_scaler = StandardScaler()
+        self._num_scaler = None
+        self._seq_scaler = None
         self.feature_statistics = {}
 
-    def create_sequences(self, numbers, sequence_length=10):
-        """시계열 시퀀스 생성"""
-        sequences = []
-        targets = []
+    @property
+    def num_scaler(self):
+        """번호 특성 스케일러 (sklearn 은 처음 사용할 때 로드)"""
+        if self._num_scaler is None:
+            from sklearn.preprocessing import MinMaxScaler
+            self._num_scaler = MinMaxScaler()
+        return self._num_scaler
+
+    @property
+    def seq_scaler(self):
+        """시퀀스 특성 스케일러 (sklearn 은 처음 사용할 때 로드)"""
+        if self._seq_scaler is None:
+            from sklearn.preprocessing import StandardScaler
+            self._seq_scaler = StandardScaler()
+        return self._seq_scaler
 
-        for i in range(len(numbers) - sequence_length):
-            seq = numbers[i:i + sequence_length]
-            target = numbers[i + sequence_length]
-            sequences.append(seq)
-            targets.append(target)
+    def create_sequences(self, numbers, sequence_length=10):
+        """시계열 시퀀스 생성 (입력은 numbers 의 슬라이딩 윈도우 뷰, 타겟은 행 슬라이스)"""
+        numbers = np.asarray(numbers)
+        count = max(len(numbers) - sequence_length, 0)
+        if count == 0:
+            return np.empty((0, sequence_length) + numbers.shape[1:], numbers.dtype), numbers[:0]
 
-        return np.array(sequences), np.array(targets)
+        # sliding_window_view 는 [N-L+1, 6, L] -> [.., L, 6]
+        sequences = np.moveaxis(sliding_window_view(numbers, sequence_length, axis=0), -1, 1)
+        return sequences[:count], numbers[sequence_length:]
 
     def encode_numbers(self, numbers):
         """번호 원-핫 인코딩"""
-        encoded = np.zeros((len(numbers), 45))
-        for i, row in enumerate(numbers):
-            encoded[i, row - 1] = 1
-        return encoded
+        return one_hot_history(numbers, dtype=np.float64)
 
     def create_marking_pattern(self, numbers):
         """마킹지 패턴 생성"""
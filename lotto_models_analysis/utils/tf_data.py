@@ -0,0 +1,85 @@
+import numpy as np
+import tensorflow as tf
+
+from .windowing import NUMBER_COUNT, SequenceWindows
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+# cache=None 일 때 메모리 캐시를 허용하는 최대 크기 (원-핫 윈도우 기준)
+CACHE_LIMIT_BYTES = 256 * 1024 ** 2
+
+# cache 후 셔플 버퍼 크기 (캐시된 원소는 이미 원-핫이라 버퍼를 제한)
+SHUFFLE_BUFFER = 1024
+
+
+def _one_hot_rows(rows):
+    """[..., 6] 번호 -> [..., 45] 원-핫 (tf)"""
+    return tf.reduce_max(tf.one_hot(rows - 1, NUMBER_COUNT, dtype=tf.float32), axis=-2)
+
+
+def _marking_pattern(row):
+    """[6] 번호 -> [7,7,1] 마킹지 패턴 (tf)"""
+    cells = tf.reduce_max(tf.one_hot(row - 1, 49, dtype=tf.float32), axis=0)
+    return tf.reshape(cells, (7, 7, 1))
+
+
+def window_dataset(windows, batch_size=32, shuffle=True, cache=None, marking=False, seed=None):
+    """SequenceWindows -> tf.data.Dataset
+
+    압축된 [N,6] 이력과 윈도우 시작 위치만 텐서로 두고, 원-핫 윈도우(와 마킹 패턴)는
+    병렬 map 에서 배치마다 생성한다.
+
+    - 원소: (윈도우 [L,45], 타겟 [45]) 또는 marking=True 이면 ((패턴 [7,7,1], 윈도우), 타겟)
+    - 마킹 패턴은 DataLoader.create_marking_patterns(numbers[-len(X):]) 와 같은 회차 정렬
+    - cache: None 이면 크기가 CACHE_LIMIT_BYTES 이하일 때만 메모리 캐시,
+      True/False 로 강제, 문자열이면 해당 경로에 파일 캐시
+    """
+    sequence_length = windows.sequence_length
+    history = tf.constant(np.asarray(windows.numbers, dtype=np.int32))
+    count = len(windows)
+
+    starts = windows.starts.astype(np.int32)
+    target_rows = windows.target_rows.astype(np.int32)
+    marking_rows = np.arange(len(windows.numbers) - count, len(windows.numbers), dtype=np.int32)
+
+    def build(start, target_row, marking_row):
+        sequence = _one_hot_rows(history[start:start + sequence_length])
+        sequence = tf.ensure_shape(sequence, (sequence_length, NUMBER_COUNT))
+        target = _one_hot_rows(history[target_row])
+        if marking:
+            return (_marking_pattern(history[marking_row]), sequence), target
+        return sequence, target
+
+    if cache is None:
+        element_bytes = (sequence_length + 1) * NUMBER_COUNT * 4 + (49 * 4 if marking else 0)
+        cache = count * element_bytes <= CACHE_LIMIT_BYTES
+
+    dataset = tf.data.Dataset.from_tensor_slices((starts, target_rows, marking_rows))
+    if cache:
+        # 원-핫 생성은 첫 epoch 에서만 수행
+        dataset = dataset.map(build, num_parallel_calls=AUTOTUNE)
+        dataset = dataset.cache(cache) if isinstance(cache, str) else dataset.cache()
+        if shuffle:
+            dataset = dataset.shuffle(min(count, SHUFFLE_BUFFER), seed=seed, reshuffle_each_iteration=True)
+    else:
+        # 캐시 없이 매 epoch 생성: 가벼운 시작 위치를 먼저 섞은 뒤 map
+        if shuffle:
+            dataset = dataset.shuffle(max(count, 1), seed=seed, reshuffle_each_iteration=True)
+        dataset = dataset.map(build, num_parallel_calls=AUTOTUNE, deterministic=not shuffle)
+
+    return dataset.batch(batch_size).prefetch(AUTOTUNE)
+
+
+def sequence_dataset(numbers, sequence_length, batch_size=32, shuffle=True, cache=None,
+                     marking=False, seed=None):
+    """[N,6] 이력에서 바로 window_dataset 생성 (다음 회차 예측 윈도우)"""
+    return window_dataset(SequenceWindows(numbers, sequence_length), batch_size, shuffle,
+                          cache, marking, seed)
+
+
+def array_dataset(inputs, targets, batch_size=32, shuffle=True, seed=None):
+    """이미 만들어진 배열용 Dataset (기존 입력 호환, 셔플/배치/prefetch 만 적용)"""
+    dataset = tf.data.Dataset.from_tensor_slices((inputs, targets))
+    if shuffle:
+        dataset = dataset.shuffle(len(targets), seed=seed, reshuffle_each_iteration=True)
+    return dataset.batch(batch_size).prefetch(AUTOTUNE)
@@ -0,0 +1,21 @@
+import os
+from contextlib import contextmanager
+
+# 작업 프로세스의 스레드 수 제한 (spawn 된 프로세스가 라이브러리를 불러오기 전에 적용)
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS',
+                   'NUMEXPR_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS')
+
+
+@contextmanager
+def limited_threads_env(threads):
+    """이 구간에서 시작되는 자식 프로세스의 BLAS/OpenMP/TensorFlow 스레드 수 제한"""
+    previous = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    os.environ.update({name: str(threads) for name in THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
@@ -0,0 +1,101 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+NUMBER_COUNT = 45
+
+
+def one_hot_history(numbers, dtype=np.float32):
+    """당첨번호 [N,6] -> 원-핫 행렬 [N,45] (한 번만 인코딩)"""
+    numbers = np.asarray(numbers, dtype=np.int64)
+    encoded = np.zeros((len(numbers), NUMBER_COUNT), dtype=dtype)
+    if len(numbers):
+        encoded[np.arange(len(numbers))[:, None], numbers - 1] = 1
+    return encoded
+
+
+def marking_patterns(numbers):
+    """당첨번호 [N,6] -> 마킹지 패턴 [N,7,7,1]"""
+    numbers = np.asarray(numbers, dtype=np.int64)
+    patterns = np.zeros((len(numbers), 49), dtype=np.float32)
+    if len(numbers):
+        patterns[np.arange(len(numbers))[:, None], numbers - 1] = 1
+    return patterns.reshape(-1, 7, 7, 1)
+
+
+class SequenceWindows:
+    """원-핫 이력 버퍼 하나 위의 슬라이딩 윈도우
+
+    입력 윈도우와 타겟은 모두 같은 [N,45] 버퍼의 뷰로 만들고, 학습에 연속 배열이
+    필요할 때만 batch()/materialize() 로 복사한다.
+
+    - stride: 윈도우 시작 간격
+    - target_offset: 윈도우 끝(마지막 행 다음) 기준 타겟 위치
+      0 이면 윈도우 다음 회차, -1 이면 윈도우 마지막 회차
+    """
+
+    def __init__(self, numbers, sequence_length, stride=1, target_offset=0, dtype=np.float32):
+        if sequence_length < 1:
+            raise ValueError("시퀀스 길이는 1 이상이어야 합니다.")
+        if target_offset > 0 or target_offset < -sequence_length:
+            raise ValueError("타겟 위치가 윈도우 범위를 벗어납니다.")
+
+        self.numbers = np.asarray(numbers)
+        self.sequence_length = int(sequence_length)
+        self.stride = max(int(stride), 1)
+        self.target_offset = int(target_offset)
+        self.buffer = one_hot_history(self.numbers, dtype)
+
+        # 윈도우 다음 회차가 남아 있는 시작 위치 (기존 range(0, N - L, stride) 와 동일)
+        self.starts = np.arange(0, max(len(self.buffer) - self.sequence_length, 0), self.stride)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def target_rows(self):
+        """윈도우별 타겟 행 위치"""
+        return self.starts + self.sequence_length + self.target_offset
+
+    @property
+    def inputs(self):
+        """입력 윈도우 [M,L,45] (버퍼의 읽기 전용 뷰, 복사 없음)"""
+        if len(self.starts) == 0:
+            return np.empty((0, self.sequence_length, NUMBER_COUNT), dtype=self.buffer.dtype)
+        windows = sliding_window_view(self.buffer, self.sequence_length, axis=0)
+        # sliding_window_view 는 [N-L+1, 45, L] -> [.., L, 45]
+        windows = windows.transpose(0, 2, 1)
+        return windows[self.starts[0]:self.starts[-1] + 1:self.stride]
+
+    @property
+    def targets(self):
+        """타겟 원-핫 [M,45] (stride 가 1 이면 버퍼의 뷰)"""
+        if len(self.starts) == 0:
+            return np.empty((0, NUMBER_COUNT), dtype=self.buffer.dtype)
+        rows = self.target_rows
+        return self.buffer[rows[0]:rows[-1] + 1:self.stride]
+
+    @property
+    def target_numbers(self):
+        """타겟 회차의 당첨번호 [M,6]"""
+        return self.numbers[self.target_rows]
+
+    def batch(self, indices):
+        """지정한 윈도우만 연속 배열로 복사 -> (X [B,L,45], y [B,45])"""
+        indices = np.asarray(indices, dtype=np.int64)
+        rows = self.starts[indices][:, None] + np.arange(self.sequence_length)
+        return self.buffer[rows], self.buffer[self.target_rows[indices]]
+
+    def materialize(self):
+        """전체 윈도우를 연속 배열로 복사 -> (X [M,L,45], y [M,45])"""
+        return np.ascontiguousarray(self.inputs), np.ascontiguousarray(self.targets)
+
+    def last_window(self):
+        """예측 입력용 마지막 L회차 윈도우 [1,L,45] (이력이 짧으면 남는 뒤쪽 행은 0)"""
+        window = np.zeros((1, self.sequence_length, NUMBER_COUNT), dtype=self.buffer.dtype)
+        tail = self.buffer[-self.sequence_length:]
+        window[0, :len(tail)] = tail
+        return window
+
+    def nbytes(self):
+        """버퍼 메모리 (윈도우 뷰는 추가 메모리 없음)"""
+        return self.buffer.nbytes
@@ -16,46 +16,51 @@ import sys
 import matplotlib
 import matplotlib.font_manager as fm
 import copy
-import pickle
 import random
 import math
 
+# 저장소 공용 모듈 (lotto_common)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lotto_common import history_kernels
+from lotto_common import async_logging
+from lotto_common import state_file
+from lotto_common import tk_bridge
+
 
 class ModelState:
     """모델 상태를 관리하는 기본 클래스"""
 
-    def __init__(self, numbers_memory=None, number_stats=None, score=0):
+    def __init__(self, numbers_memory=None, number_stats=None, score=0, pattern_arrays=None):
         self.numbers_memory = numbers_memory if numbers_memory is not None else {}
         self.number_stats = number_stats if number_stats is not None else {}
         self.score = score
+        self.pattern_arrays = pattern_arrays if pattern_arrays is not None else {}  # 패턴 텐서
 
     def copy(self):
         """현재 상태의 깊은 복사본을 반환"""
         return ModelState(
             numbers_memory=copy.deepcopy(self.numbers_memory),
             number_stats=copy.deepcopy(self.number_stats),
-            score=self.score
+            score=self.score,
+            pattern_arrays={name: np.array(value) for name, value in self.pattern_arrays.items()}
         )
 
     def save_to_file(self, filepath):
-        """현재 상태를 파일로 저장"""
-        with open(filepath, 'wb') as f:
-            pickle.dump({
-                'numbers_memory': self.numbers_memory,
-                'number_stats': self.number_stats,
-                'score': self.score
-            }, f)
+        """현재 상태를 .lstate 파일로 저장"""
+        state_file.save_model_state(filepath, self.numbers_memory, self.number_stats, self.score,
+                                    arrays=self.pattern_arrays)
 
     @classmethod
     def load_from_file(cls, filepath):
-        """파일에서 상태를 로드"""
-        with open(filepath, 'rb') as f:
-            data = pickle.load(f)
-            return cls(
-                numbers_memory=data.get('numbers_memory', {}),
-                number_stats=data.get('number_stats', {}),
-                score=data.get('score', 0)
-            )
+        """파일에서 상태를 로드 (.lstate 는 패턴 텐서를 memmap 으로 연결)"""
+        data = state_file.load_model_state(filepath)
+        return cls(
+            numbers_memory=data['numbers_memory'],
+            number_stats=data['number_stats'],
+            score=data['score'],
+            pattern_arrays=data['arrays']
+        )
 
 
 class FileManager:
@@ -94,7 +99,7 @@ class FileManager:
     def get_model_file(self) -> Path:
         """모델 저장 파일 경로 반환"""
         current_datetime = datetime.now().strftime('%Y%m%d_%H%M%S')
-        return self.models_dir / f'best_model_{current_datetime}.pkl'
+        return self.models_dir / f'best_model_{current_datetime}.lstate'
 
 
 class LogManager:
@@ -108,10 +113,8 @@ class LogManager:
         """로깅 설정"""
         log_file = self.file_manager.get_new_log_file()
         logger = logging.getLogger('LottoPrediction')
-        logger.setLevel(logging.INFO)
 
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
 
         formatter = logging.Formatter(
             '[%(asctime)s] %(levelname)s: %(message)s',
@@ -119,25 +122,38 @@ class LogManager:
         )
         file_handler.setFormatter(formatter)
 
-        logger.handlers = []
-        logger.addHandler(file_handler)
+        # 파일 기록은 백그라운드 스레드에서 (LOTTO_LOG_LEVEL=DEBUG 로 디버그 로그 활성화)
+        self.pipeline = async_logging.get_pipeline(logger, [file_handler],
+                                                   level=async_logging.level_from_env(logging.INFO))
+        self.sampler = async_logging.LogSampler()
         self.logger = logger
 
-    def log_info(self, message: str):
-        """정보 로깅"""
-        self.logger.info(message)
+    def log_info(self, message: str, *args):
+        """정보 로깅 (args 가 있으면 기록 시점에 message % args 로 포맷)"""
+        self.logger.info(message, *args)
 
-    def log_error(self, message: str, exc_info=None):
+    def log_error(self, message: str, *args, exc_info=None):
         """에러 로깅"""
-        if exc_info:
-            self.logger.error(message, exc_info=exc_info)
-        else:
-            self.logger.error(message)
+        self.logger.error(message, *args, exc_info=exc_info)
+
+    @property
+    def debug_enabled(self) -> bool:
+        """디버그 로그가 켜져 있는지 (포맷 비용이 큰 로그 앞에서 확인)"""
+        return self.logger.isEnabledFor(logging.DEBUG)
 
-    def log_debug(self, message: str):
+    def log_debug(self, message: str, *args):
         """디버그 정보 로깅"""
-        if not message.startswith("Selected numbers"):
-            self.logger.debug(message)
+        if self.debug_enabled and not message.startswith("Selected numbers"):  # Selected numbers 로깅 제외
+            self.logger.debug(message, *args)
+
+    def log_debug_sampled(self, key: str, message: str, *args):
+        """반복 루프용 디버그 로깅 (key 별로 처음 1회와 이후 sampler.every 번째 호출만 기록)"""
+        if self.debug_enabled and self.sampler(key):
+            self.logger.debug(message, *args)
+
+    def close(self):
+        """대기 중인 로그를 모두 기록"""
+        self.pipeline.stop()
 
 class DatabaseManager:
     """데이터베이스 관리 클래스"""
@@ -322,16 +338,27 @@ class LearningAnalyzer:
 class LottoAnalyzer:
     """로또 번호 분석 및 예측 클래스"""
 
+    # ModelState 에 함께 저장하는 패턴 배열
+    PATTERN_ARRAYS = ('pair_counts', 'triple_counts', 'pair_last_seen', 'triple_last_seen')
+
     def __init__(self, learning_rate: float, log_manager: LogManager, pattern_weights: dict = None):
         self.learning_rate = learning_rate
         self.log_manager = log_manager
         self.numbers_memory = {i: 1.0 for i in range(1, 46)}
         self.number_stats = {i: 0 for i in range(1, 46)}
-        self.number_patterns = {}  # 2개 번호 연관성
-        self.triple_patterns = {}  # 3개 번호 연관성
         self.sequence_patterns = []  # 연속 번호 패턴
         self.time_weights = {}  # 시간 가중치
-        self.pattern_history = {}  # 패턴 출현 시점 기록
+
+        # 2개/3개 번호 연관성 (history_kernels 인코딩, a < b < c 위치에만 값이 있음)
+        self.pair_counts = np.zeros(history_kernels.PAIR_SIZE, dtype=np.int64)
+        self.triple_counts = np.zeros(history_kernels.TRIPLE_SIZE, dtype=np.int64)
+        self.pair_last_seen = np.zeros(history_kernels.PAIR_SIZE, dtype=np.int64)
+        self.triple_last_seen = np.zeros(history_kernels.TRIPLE_SIZE, dtype=np.int64)
+        self.max_draw = 0  # 분석한 데이터의 마지막 회차
+
+        # 번호 선택용 대칭 점수 텐서: 출현 수 * (1 + 최근성)
+        self.pair_scores = np.zeros((45, 45))
+        self.triple_scores = np.zeros((45, 45, 45))
 
         # 기본 가중치 설정
         self.pattern_weights = pattern_weights or {
@@ -346,84 +373,84 @@ class LottoAnalyzer:
         """현재 모델 상태 반환"""
         return ModelState(
             numbers_memory=dict(self.numbers_memory),
-            number_stats=dict(self.number_stats)
+            number_stats=dict(self.number_stats),
+            pattern_arrays={name: getattr(self, name).astype(np.int32) for name in self.PATTERN_ARRAYS}
         )
 
     def set_state(self, state: ModelState):
         """모델 상태 설정"""
         self.numbers_memory = copy.deepcopy(state.numbers_memory)
         self.number_stats = copy.deepcopy(state.number_stats)
+        if all(name in state.pattern_arrays for name in self.PATTERN_ARRAYS):
+            for name in self.PATTERN_ARRAYS:
+                setattr(self, name, np.array(state.pattern_arrays[name], dtype=np.int64))
+            self.max_draw = int(max(self.pair_last_seen.max(), self.triple_last_seen.max()))
+            self._update_pattern_scores()
 
     def analyze_patterns(self, historical_data: pd.DataFrame):
         """패턴 분석"""
-        total_draws = len(historical_data)
-
-        for idx, row in historical_data.iterrows():
-            draw_number = row['draw_number']
-            relative_time = (idx + 1) / total_draws  # 시간 가중치 (0~1)
-            numbers = sorted([row[f'num{i}'] for i in range(1, 7)])
-
-            # 기본 출현 통계 및 시간 가중치
-            for num in numbers:
-                self.number_stats[num] = self.number_stats.get(num, 0) + 1
-                self.time_weights[num] = relative_time
-
-            # 2개 번호 패턴
-            for i in range(len(numbers)):
-                for j in range(i + 1, len(numbers)):
-                    pair = (numbers[i], numbers[j])
-                    self.number_patterns[pair] = self.number_patterns.get(pair, 0) + 1
-
-                    if pair not in self.pattern_history:
-                        self.pattern_history[pair] = []
-                    self.pattern_history[pair].append(draw_number)
-
-            # 3개 번호 패턴
-            for i in range(len(numbers)):
-                for j in range(i + 1, len(numbers)):
-                    for k in range(j + 1, len(numbers)):
-                        triple = (numbers[i], numbers[j], numbers[k])
-                        self.triple_patterns[triple] = self.triple_patterns.get(triple, 0) + 1
-
-                        if triple not in self.pattern_history:
-                            self.pattern_history[triple] = []
-                        self.pattern_history[triple].append(draw_number)
-
-            # 연속 번호 패턴
-            for i in range(len(numbers) - 1):
-                if numbers[i + 1] - numbers[i] == 1:
-                    self.sequence_patterns.append((numbers[i], numbers[i + 1]))
+        summary = history_kernels.summarize_history(historical_data)
+
+        # 기본 출현 통계
+        for num, count in history_kernels.counts_to_dict(summary.number_counts).items():
+            self.number_stats[num] = self.number_stats.get(num, 0) + count
+
+        # 시간 가중치: 마지막 출현 위치 / 전체 회차 수 (0~1)
+        for num in np.flatnonzero(summary.number_last_position).tolist():
+            self.time_weights[num + 1] = summary.number_last_position[num].item() / summary.total_draws
+
+        # 2개/3개 번호 패턴과 마지막 출현 회차
+        self.pair_counts += summary.pair_counts
+        self.triple_counts += summary.triple_counts
+        np.maximum(self.pair_last_seen, summary.pair_last_seen, out=self.pair_last_seen)
+        np.maximum(self.triple_last_seen, summary.triple_last_seen, out=self.triple_last_seen)
+        self.max_draw = max(self.max_draw, summary.max_draw)
+        self._update_pattern_scores()
+
+        # 연속 번호 패턴
+        self.sequence_patterns.extend((n, n + 1) for n in summary.consecutive_starts.tolist())
 
         self._log_pattern_analysis()
 
+    def _update_pattern_scores(self):
+        """출현 수와 최근성(마지막 출현 회차 / 전체 마지막 회차)으로 점수 텐서 갱신"""
+        max_draw = self.max_draw if self.max_draw > 0 else 1
+        self.pair_scores = history_kernels.symmetric_pairs(
+            self.pair_counts * (1 + self.pair_last_seen / max_draw))
+        self.triple_scores = history_kernels.symmetric_triples(
+            self.triple_counts * (1 + self.triple_last_seen / max_draw))
+
+    @property
+    def number_patterns(self):
+        """2개 번호 연관성 {(a, b): 출현 수}"""
+        return history_kernels.pattern_dict(self.pair_counts, history_kernels.decode_pairs)
+
+    @property
+    def triple_patterns(self):
+        """3개 번호 연관성 {(a, b, c): 출현 수}"""
+        return history_kernels.pattern_dict(self.triple_counts, history_kernels.decode_triples)
+
     def _log_pattern_analysis(self):
         """패턴 분석 결과 로깅"""
         # 가장 빈번한 2개 번호 조합
-        sorted_pairs = sorted(self.number_patterns.items(), key=lambda x: x[1], reverse=True)
         self.log_manager.log_info("\n=== 자주 출현하는 2개 번호 조합 ===")
-        for (n1, n2), count in sorted_pairs[:10]:
+        for (n1, n2), count in history_kernels.top_patterns(self.pair_counts, history_kernels.decode_pairs):
             self.log_manager.log_info(f"조합 {n1}-{n2}: {count}회 출현")
 
         # 가장 빈번한 3개 번호 조합
-        sorted_triples = sorted(self.triple_patterns.items(), key=lambda x: x[1], reverse=True)
         self.log_manager.log_info("\n=== 자주 출현하는 3개 번호 조합 ===")
-        for (n1, n2, n3), count in sorted_triples[:10]:
+        for (n1, n2, n3), count in history_kernels.top_patterns(self.triple_counts,
+                                                                history_kernels.decode_triples):
             self.log_manager.log_info(f"조합 {n1}-{n2}-{n3}: {count}회 출현")
 
     def _calculate_pattern_recency(self, pattern):
         """패턴의 최근성 점수 계산"""
-        if pattern not in self.pattern_history:
-            return 0
-
-        history = self.pattern_history[pattern]
-        if not history:
+        last_seen = self.pair_last_seen if len(pattern) == 2 else self.triple_last_seen
+        latest_occurrence = last_seen[history_kernels.encode_pattern(pattern)]
+        if not latest_occurrence:
             return 0
 
-        latest_occurrence = max(history)
-        all_history = [h for hist in self.pattern_history.values() for h in hist]
-        max_draw = max(all_history) if all_history else 1  # 0으로 나누는 것 방지
-
-        return latest_occurrence / max_draw if max_draw > 0 else 0
+        return latest_occurrence / self.max_draw if self.max_draw > 0 else 0
 
     def _calculate_sequence_score(self, numbers):
         """연속 번호 패턴 점수 계산"""
@@ -438,64 +465,55 @@ class LottoAnalyzer:
         return score / (len(numbers) - 1) if len(numbers) > 1 else 0
 
     def select_numbers_by_count(self, count: int) -> list:
-        """패턴 기반 번호 선택"""
+        """패턴 기반 번호 선택
+
+        후보 45개 점수를 배열로 한 번에 계산한다. 2개/3개 패턴 점수는 번호를 고를 때마다
+        pair_scores / triple_scores 에서 새 번호 축을 모아 누적한다.
+        """
         selected = []
+        available = np.ones(45, dtype=bool)
+        pair_score = np.zeros(45)
+        triple_score = np.zeros(45)
+        in_selected = np.zeros(47, dtype=bool)  # 번호 n -> 위치 n (양 끝은 연속성 계산용 여백)
+
+        # 출현 빈도/최근성 점수는 선택 중 변하지 않음
+        stats = np.array([self.number_stats.get(n, 0) for n in range(1, 46)], dtype=np.float64)
+        max_stats = stats.max()
+        frequency_score = stats / max_stats if max_stats > 0 else np.zeros(45)
+        recency_score = np.array([self.time_weights.get(n, 0) for n in range(1, 46)], dtype=np.float64)
+        base_score = (frequency_score * self.pattern_weights['frequency']
+                      + recency_score * self.pattern_weights['recency'])
+        selected_runs = 0  # 선택된 번호 사이의 연속 쌍 수
 
         while len(selected) < count:
-            scores = {}
-            for num in range(1, 46):
-                if num not in selected:
-                    score = 0
-
-                    # 2개 번호 패턴 점수
-                    pair_score = 0
-                    for sel in selected:
-                        pair = tuple(sorted([num, sel]))
-                        pair_count = self.number_patterns.get(pair, 0)
-                        pair_recency = self._calculate_pattern_recency(pair)
-                        pair_score += pair_count * (1 + pair_recency)
-                    score += pair_score * self.pattern_weights['pair']
-
-                    # 3개 번호 패턴 점수
-                    if len(selected) >= 2:
-                        triple_score = 0
-                        for i in range(len(selected)):
-                            for j in range(i + 1, len(selected)):
-                                triple = tuple(sorted([num, selected[i], selected[j]]))
-                                triple_count = self.triple_patterns.get(triple, 0)
-                                triple_recency = self._calculate_pattern_recency(triple)
-                                triple_score += triple_count * (1 + triple_recency)
-                        score += triple_score * self.pattern_weights['triple']
-
-                    # 연속성 점수
-                    temp_numbers = sorted(selected + [num])
-                    sequence_score = self._calculate_sequence_score(temp_numbers)
-                    score += sequence_score * self.pattern_weights['sequence']
-
-                    # 출현 빈도 점수 계산 부분 수정
-                    max_stats = max(self.number_stats.values())
-                    frequency_score = (self.number_stats.get(num, 0) / max_stats) if max_stats > 0 else 0
-                    score += frequency_score * self.pattern_weights['frequency']
-
-                    scores[num] = score
-
-                    # 최근성 점수
-                    recency_score = self.time_weights.get(num, 0)
-                    score += recency_score * self.pattern_weights['recency']
-
-                    scores[num] = score
+            scores = (base_score + pair_score * self.pattern_weights['pair']
+                      + triple_score * self.pattern_weights['triple'])
+
+            # 연속성 점수: 후보를 더했을 때 정렬된 번호 사이 연속 쌍 비율
+            if selected:
+                runs = selected_runs + in_selected[:-2].astype(int) + in_selected[2:].astype(int)
+                scores = scores + runs / len(selected) * self.pattern_weights['sequence']
 
             # 다음 번호 선택
-            max_score = max(scores.values()) if scores else 0
+            candidate_scores = scores[available]
+            candidate_numbers = np.flatnonzero(available) + 1
+            max_score = candidate_scores.max() if len(candidate_scores) else 0
             if max_score > 0:
-                threshold = max_score * 0.8
-                candidates = [n for n, s in scores.items() if s >= threshold]
+                candidates = candidate_numbers[candidate_scores >= max_score * 0.8].tolist()
             else:
-                candidates = list(scores.keys())
+                candidates = candidate_numbers.tolist()
+
+            if not candidates:
+                break
 
-            if candidates:
-                next_num = random.choice(candidates)
-                selected.append(next_num)
+            next_num = random.choice(candidates)
+            index = next_num - 1
+            triple_score += self.triple_scores[:, index, [n - 1 for n in selected]].sum(axis=1)
+            pair_score += self.pair_scores[:, index]
+            selected_runs += int(in_selected[next_num - 1]) + int(in_selected[next_num + 1])
+            selected.append(next_num)
+            available[index] = False
+            in_selected[next_num] = True
 
         return sorted(selected)
 
@@ -525,6 +543,10 @@ class LottoPredictionGUI:
         self._setup_gui()
         self._setup_visualization()
 
+        # 예측 스레드의 화면 갱신은 큐를 거쳐 메인 루프에서 주기적으로 반영
+        self.ui = tk_bridge.TkUpdateQueue(self.root)
+        self.ui.set_scrollback(self.log_text)
+
         self.is_running = False
         self.best_model_state = None
         self.log_manager.log_info("Application started successfully")
@@ -817,7 +839,7 @@ class LottoPredictionGUI:
     def _prediction_thread(self):
         """예측 실행 스레드"""
         try:
-            self.status_var.set("데이터 로딩 중...")
+            self.ui.set(self.status_var, "데이터 로딩 중...")
             self.log_manager.log_info("Starting prediction process")
 
             # 학습 회차 설정 적용
@@ -844,7 +866,7 @@ class LottoPredictionGUI:
             self.analyzer.analyze_patterns(historical_data)
 
             # 번호 선택
-            self.status_var.set("번호 선택 중...")
+            self.ui.set(self.status_var, "번호 선택 중...")
             num_count = int(self.numbers_var.get())
 
             if num_count < 1 or num_count > 45:
@@ -853,25 +875,25 @@ class LottoPredictionGUI:
             selected_numbers = self.analyzer.select_numbers_by_count(num_count)
 
             # 결과 분석 및 표시
-            self._show_prediction_results(selected_numbers, historical_data)
+            self.ui.call(self._show_prediction_results, selected_numbers, historical_data)
 
             # 결과 저장
             self._save_prediction_results(selected_numbers)
-            self._update_analysis_graphs(historical_data)
-            self._update_stats_tab(historical_data)
+            self.ui.call(self._update_analysis_graphs, historical_data)
+            self.ui.call(self._update_stats_tab, historical_data)
 
-            self.status_var.set("완료")
+            self.ui.set(self.status_var, "완료")
             self.log_manager.log_info("Prediction process completed successfully")
-            messagebox.showinfo("완료", "예측이 완료되었습니다!")
+            self.ui.call(messagebox.showinfo, "완료", "예측이 완료되었습니다!")
 
         except Exception as e:
             self.log_manager.log_error("Prediction process error", exc_info=True)
-            self.status_var.set("오류 발생")
-            messagebox.showerror("오류", f"예측 중 오류가 발생했습니다: {str(e)}")
+            self.ui.set(self.status_var, "오류 발생")
+            self.ui.call(messagebox.showerror, "오류", f"예측 중 오류가 발생했습니다: {str(e)}")
         finally:
             self.is_running = False
-            self.run_button.config(text="예측 시작")
-            self.progress_var.set(0)
+            self.ui.call(self.run_button.config, text="예측 시작")
+            self.ui.set(self.progress_var, 0)
 
     def run_prediction(self):
         """예측 실행"""
@@ -1,2 +1,7 @@
 # 모듈들을 담을 폴더
-# __init__.py
\ No newline at end of file
+# __init__.py
+import os
+import sys
+
+# 저장소 공용 모듈 (lotto_common)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -38,7 +38,7 @@ class FileManager:
     def get_model_file(self) -> Path:
         """모델 저장 파일 경로 반환"""
         current_datetime = datetime.now().strftime('%Y%m%d_%H%M%S')
-        return self.models_dir / f'best_model_{current_datetime}.pkl'
+        return self.models_dir / f'best_model_{current_datetime}.lstate'
 
     def backup_model(self, model_path: Path) -> Path:
         """모델 파일 백업 생성"""
@@ -10,6 +10,7 @@ import sys
 import threading
 import math
 from pathlib import Path
+from lotto_common import tk_bridge
 from .file_manager import FileManager
 from .log_manager import LogManager
 from .database_manager import DatabaseManager
@@ -36,6 +37,10 @@ class LottoPredictionGUI:
             self._setup_gui()
             self._setup_visualization()
 
+            # 예측 스레드의 화면 갱신은 큐를 거쳐 메인 루프에서 주기적으로 반영
+            self.ui = tk_bridge.TkUpdateQueue(self.root)
+            self.ui.set_scrollback(self.log_text)
+
             self.is_running = False
             self.best_model_state = None
 
@@ -246,15 +251,15 @@ class LottoPredictionGUI:
     def _prediction_thread(self):
         """예측 실행 스레드"""
         try:
-            self.status_var.set("데이터 준비 중...")
-            self.progress_var.set(0)
+            self.ui.set(self.status_var, "데이터 준비 중...")
+            self.ui.set(self.progress_var, 0)
 
             if not self._validate_inputs():
                 raise ValueError("입력값이 올바르지 않습니다")
 
             draw_limit = None if self.learning_draws_var.get() == "전체" else int(self.learning_draws_var.get())
             historical_data = self.db_manager.get_historical_data(draw_limit)
-            self.progress_var.set(10)
+            self.ui.set(self.progress_var, 10)
 
             self.analyzer = LottoAnalyzer(
                 learning_rate=float(self.learning_rate_var.get()),
@@ -262,46 +267,46 @@ class LottoPredictionGUI:
                 pattern_weights={key: float(value.get()) / 100 for key, value in self.weights.items()},
                 use_ml=self.use_ml_var.get()
             )
-            self.progress_var.set(20)
+            self.ui.set(self.progress_var, 20)
 
             if self.use_ml_var.get():
-                self.status_var.set("머신러닝 모델 학습 중...")
+                self.ui.set(self.status_var, "머신러닝 모델 학습 중...")
                 self.analyzer.train_ml_model(historical_data)
-                self.progress_var.set(50)
+                self.ui.set(self.progress_var, 50)
 
-            self.status_var.set("패턴 분석 중...")
+            self.ui.set(self.status_var, "패턴 분석 중...")
             self.analyzer.analyze_patterns(historical_data)
-            self.progress_var.set(70)
+            self.ui.set(self.progress_var, 70)
 
-            self.status_var.set("번호 예측 중...")
+            self.ui.set(self.status_var, "번호 예측 중...")
             num_count = int(self.numbers_var.get())
             selected_numbers = (self.analyzer.select_numbers_by_ml(num_count)
                                 if self.use_ml_var.get()
                                 else self.analyzer.select_numbers_by_count(num_count))
-            self.progress_var.set(90)
+            self.ui.set(self.progress_var, 90)
 
             self._show_prediction_results(selected_numbers, historical_data)
             self._save_prediction_results(selected_numbers)
-            self._update_analysis_graphs(historical_data)
-            self._update_stats_tab(historical_data)
-            self.progress_var.set(100)
+            self.ui.call(self._update_analysis_graphs, historical_data)
+            self.ui.call(self._update_stats_tab, historical_data)
+            self.ui.set(self.progress_var, 100)
 
-            self.status_var.set("완료")
-            messagebox.showinfo("완료", "예측이 완료되었습니다!")
+            self.ui.set(self.status_var, "완료")
+            self.ui.call(messagebox.showinfo, "완료", "예측이 완료되었습니다!")
         except Exception as e:
             self.log_manager.log_error(f"예측 오류: {str(e)}", exc_info=True)
-            self.status_var.set("오류 발생")
-            messagebox.showerror("오류", f"예측 중 오류 발생: {str(e)}")
+            self.ui.set(self.status_var, "오류 발생")
+            self.ui.call(messagebox.showerror, "오류", f"예측 중 오류 발생: {str(e)}")
         finally:
             self.is_running = False
-            self.run_button.config(text="예측 시작")
-            self.progress_var.set(0)
+            self.ui.call(self.run_button.config, text="예측 시작")
+            self.ui.set(self.progress_var, 0)
 
     def _show_prediction_results(self, numbers, historical_data):
-        """예측 결과를 화면에 표시"""
-        self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(tk.END, f"예측된 번호: {numbers}\n")
-        self.log_text.insert(tk.END, f"예측 결과: {numbers}\n")
+        """예측 결과를 화면에 표시 (예측 스레드에서 호출)"""
+        self.ui.clear(self.results_text)
+        self.ui.append(self.results_text, f"예측된 번호: {numbers}\n")
+        self.ui.append(self.log_text, f"예측 결과: {numbers}\n")
         self.log_manager.log_info(f"예측된 번호: {numbers}")
 
     def _save_prediction_results(self, numbers):
@@ -333,7 +338,7 @@ class LottoPredictionGUI:
         try:
             filepath = filedialog.askopenfilename(
                 initialdir=str(self.file_manager.models_dir),
-                filetypes=[("Pickle files", "*.pkl")]
+                filetypes=[("Model state", "*.lstate"), ("Pickle files (구형)", "*.pkl")]
             )
             if filepath:
                 from .model_state import ModelState
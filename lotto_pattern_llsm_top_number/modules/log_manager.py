@@ -3,6 +3,8 @@
 import logging
 import logging.handlers
 
+from lotto_common import async_logging
+
 
 class LogManager:
     def __init__(self, file_manager):
@@ -13,12 +15,10 @@ class LogManager:
         """로깅 설정 (파일 회전 기능 포함)"""
         log_file = self.file_manager.get_new_log_file()
         self.logger = logging.getLogger('LottoPrediction')
-        self.logger.setLevel(logging.DEBUG)  # 디버그 레벨까지 기록
 
         file_handler = logging.handlers.RotatingFileHandler(
             log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding='utf-8'
         )
-        file_handler.setLevel(logging.DEBUG)
 
         formatter = logging.Formatter(
             '[%(asctime)s] %(levelname)s [%(filename)s:%(lineno)d]: %(message)s',
@@ -26,17 +26,33 @@ class LogManager:
         )
         file_handler.setFormatter(formatter)
 
-        self.logger.handlers = []
-        self.logger.addHandler(file_handler)
+        # 파일 기록은 백그라운드 스레드에서, 기본은 디버그 레벨까지 기록 (LOTTO_LOG_LEVEL 로 변경)
+        self.pipeline = async_logging.get_pipeline(self.logger, [file_handler],
+                                                   level=async_logging.level_from_env(logging.DEBUG))
+        self.sampler = async_logging.LogSampler()
 
-    def log_info(self, message: str):
-        """정보 로그 기록"""
-        self.logger.info(message)
+    def log_info(self, message: str, *args):
+        """정보 로그 기록 (args 가 있으면 기록 시점에 message % args 로 포맷)"""
+        self.logger.info(message, *args)
 
-    def log_error(self, message: str, exc_info=None):
+    def log_error(self, message: str, *args, exc_info=None):
         """에러 로그 기록"""
-        self.logger.error(message, exc_info=exc_info)
+        self.logger.error(message, *args, exc_info=exc_info)
+
+    @property
+    def debug_enabled(self) -> bool:
+        """디버그 로그가 켜져 있는지 (포맷 비용이 큰 로그 앞에서 확인)"""
+        return self.logger.isEnabledFor(logging.DEBUG)
 
-    def log_debug(self, message: str):
+    def log_debug(self, message: str, *args):
         """디버그 로그 기록"""
-        self.logger.debug(message)
\ No newline at end of file
+        self.logger.debug(message, *args)
+
+    def log_debug_sampled(self, key: str, message: str, *args):
+        """반복 루프용 디버그 로그 (key 별로 처음 1회와 이후 sampler.every 번째 호출만 기록)"""
+        if self.debug_enabled and self.sampler(key):
+            self.logger.debug(message, *args)
+
+    def close(self):
+        """대기 중인 로그를 모두 기록"""
+        self.pipeline.stop()
\ No newline at end of file
@@ -5,6 +5,8 @@ import numpy as np
 from sklearn.neural_network import MLPRegressor
 from sklearn.preprocessing import StandardScaler
 
+from lotto_common import history_kernels
+
 
 class LottoAnalyzer:
     """로또 번호 분석 및 예측 클래스 (머신러닝 포함)"""
@@ -42,29 +44,25 @@ class LottoAnalyzer:
 
     def analyze_patterns(self, historical_data):
         """과거 데이터를 분석해 패턴 추출"""
-        total_draws = len(historical_data)
-        for idx, row in historical_data.iterrows():
-            numbers = sorted([row[f'num{i}'] for i in range(1, 7)])
-            relative_time = (idx + 1) / total_draws
-
-            for num in numbers:
-                self.number_stats[num] = self.number_stats.get(num, 0) + 1
-                self.time_weights[num] = relative_time
-
-            for i in range(len(numbers)):
-                for j in range(i + 1, len(numbers)):
-                    pair = (numbers[i], numbers[j])
-                    self.number_patterns[pair] = self.number_patterns.get(pair, 0) + 1
-
-            for i in range(len(numbers)):
-                for j in range(i + 1, len(numbers)):
-                    for k in range(j + 1, len(numbers)):
-                        triple = (numbers[i], numbers[j], numbers[k])
-                        self.triple_patterns[triple] = self.triple_patterns.get(triple, 0) + 1
-
-        self.log_manager.log_debug(f"number_stats: {self.number_stats}")
-        self.log_manager.log_debug(f"time_weights: {self.time_weights}")
-        self.log_manager.log_debug(f"number_patterns 상위 5개: {list(self.number_patterns.items())[:5]}")
+        summary = history_kernels.summarize_history(historical_data)
+
+        for num, count in history_kernels.counts_to_dict(summary.number_counts).items():
+            self.number_stats[num] = self.number_stats.get(num, 0) + count
+
+        for num in np.flatnonzero(summary.number_last_position).tolist():
+            self.time_weights[num + 1] = summary.number_last_position[num].item() / summary.total_draws
+
+        for pair, count in history_kernels.pattern_dict(summary.pair_counts, history_kernels.decode_pairs).items():
+            self.number_patterns[pair] = self.number_patterns.get(pair, 0) + count
+
+        for triple, count in history_kernels.pattern_dict(summary.triple_counts,
+                                                          history_kernels.decode_triples).items():
+            self.triple_patterns[triple] = self.triple_patterns.get(triple, 0) + count
+
+        if self.log_manager.debug_enabled:
+            self.log_manager.log_debug("number_stats: %s", self.number_stats)
+            self.log_manager.log_debug("time_weights: %s", self.time_weights)
+            self.log_manager.log_debug("number_patterns 상위 5개: %s", list(self.number_patterns.items())[:5])
 
     def train_ml_model(self, historical_data):
         if not self.use_ml:
@@ -107,8 +105,8 @@ class LottoAnalyzer:
                 target = [1 if i + 1 in numbers else 0 for i in range(45)]
                 y.append(target)
 
-            self.log_manager.log_debug(f"학습 데이터 X 크기: {len(X)}, y 크기: {len(y)}, 특성 수: {len(features)}")
-            self.log_manager.log_debug(f"학습 데이터 X 샘플: {X[0][:10]}...")
+            self.log_manager.log_debug("학습 데이터 X 크기: %d, y 크기: %d, 특성 수: %d", len(X), len(y), len(features))
+            self.log_manager.log_debug("학습 데이터 X 샘플: %s...", X[0][:10])
             X_scaled = self.scaler.fit_transform(X)
             self.ml_model = MLPRegressor(hidden_layer_sizes=(300, 150, 50), max_iter=2000, learning_rate_init=0.001,
                                          activation='relu')
@@ -146,15 +144,15 @@ class LottoAnalyzer:
             features = stats + time_weights + pattern_scores + sequence_score
             if len(features) != 180:
                 raise ValueError(f"입력 데이터 크기가 올바르지 않습니다. 현재 크기: {len(features)}")
-            self.log_manager.log_debug(f"특성 데이터: {features[:10]}... (총 길이: {len(features)})")
+            self.log_manager.log_debug("특성 데이터: %s... (총 길이: %d)", features[:10], len(features))
             X_scaled = self.scaler.transform([features])
             predictions = self.ml_model.predict(X_scaled)[0]  # 45개의 출력 (각 번호에 대한 점수)
-            self.log_manager.log_debug(f"예측값: {predictions}")
+            self.log_manager.log_debug("예측값: %s", predictions)
 
             # 상위 점수 기반 번호 선택
             sorted_indices = np.argsort(predictions)[::-1]  # 점수 내림차순 정렬
             top_scores = [(i + 1, predictions[i]) for i in sorted_indices[:count * 2]]  # 상위 12개 (count * 2)
-            self.log_manager.log_debug(f"top_scores: {top_scores}")
+            self.log_manager.log_debug("top_scores: %s", top_scores)
 
             # 점수에 비례한 확률로 번호 선택
             scores = [score for _, score in top_scores]
@@ -1,16 +1,39 @@
 # ModelState 클래스
 # modules/model_state.py
 import copy
-import pickle
 import logging
 
+import numpy as np
+
+from lotto_common import state_file
+
+
 class ModelState:
-    """모델 상태를 저장하고 관리하는 클래스"""
-    def __init__(self, numbers_memory=None, number_stats=None, score=0, ml_model=None):
+    """모델 상태를 저장하고 관리하는 클래스
+
+    파일은 state_file 의 .lstate 형식(고정 크기 배열 + 메타 정보)으로 저장하고,
+    ml_model 은 별도 파일(<경로>.model)에 두어 처음 접근할 때 로드한다.
+    pattern_arrays 에는 2개/3개 번호 패턴 텐서 등 추가 배열을 담을 수 있다.
+    """
+    def __init__(self, numbers_memory=None, number_stats=None, score=0, ml_model=None, pattern_arrays=None):
         self.numbers_memory = numbers_memory if numbers_memory is not None else {}
         self.number_stats = number_stats if number_stats is not None else {}
         self.score = score
-        self.ml_model = ml_model
+        self.pattern_arrays = pattern_arrays if pattern_arrays is not None else {}
+        self._ml_model = ml_model
+        self._model_path = None  # 지연 로드할 모델 파일의 상태 파일 경로
+
+    @property
+    def ml_model(self):
+        if self._ml_model is None and self._model_path is not None:
+            self._ml_model = state_file.read_model_blob(self._model_path)
+            self._model_path = None
+        return self._ml_model
+
+    @ml_model.setter
+    def ml_model(self, model):
+        self._ml_model = model
+        self._model_path = None
 
     def copy(self):
         """현재 모델 상태의 깊은 복사본을 반환"""
@@ -18,20 +41,15 @@ class ModelState:
             numbers_memory=copy.deepcopy(self.numbers_memory),
             number_stats=copy.deepcopy(self.number_stats),
             score=self.score,
-            ml_model=copy.deepcopy(self.ml_model) if self.ml_model else None
+            ml_model=copy.deepcopy(self.ml_model) if self.ml_model else None,
+            pattern_arrays={name: np.array(value) for name, value in self.pattern_arrays.items()}
         )
 
     def save_to_file(self, filepath):
-        """모델 상태를 파일로 저장 (버전 정보 포함)"""
+        """모델 상태를 .lstate 파일로 저장 (ml_model 은 <경로>.model)"""
         try:
-            with open(filepath, 'wb') as f:
-                pickle.dump({
-                    'version': '3.1',
-                    'numbers_memory': self.numbers_memory,
-                    'number_stats': self.number_stats,
-                    'score': self.score,
-                    'ml_model': self.ml_model
-                }, f)
+            state_file.save_model_state(filepath, self.numbers_memory, self.number_stats, self.score,
+                                        arrays=self.pattern_arrays, ml_model=self.ml_model)
             logging.info(f"모델 저장 완료: {filepath}")
             return True
         except Exception as e:
@@ -40,18 +58,22 @@ class ModelState:
 
     @classmethod
     def load_from_file(cls, filepath):
-        """파일에서 모델 상태를 로드 (버전 체크 포함)"""
+        """파일에서 모델 상태를 로드
+
+        .lstate 파일은 헤더만 읽고 패턴 배열은 읽기 전용 memmap 으로 연결한다.
+        기존 pickle 파일은 딕셔너리/숫자만 허용해 로드하며, ml_model 이 들어 있는 파일은
+        lotto_common/state_file.py --allow-models 로 먼저 변환해야 한다.
+        """
         try:
-            with open(filepath, 'rb') as f:
-                data = pickle.load(f)
-                if data.get('version', '1.0') < '3.0':
-                    logging.warning("구형 모델 버전을 로드 중")
-                return cls(
-                    numbers_memory=data.get('numbers_memory', {}),
-                    number_stats=data.get('number_stats', {}),
-                    score=data.get('score', 0),
-                    ml_model=data.get('ml_model', None)
-                )
+            data = state_file.load_model_state(filepath)
+            state = cls(
+                numbers_memory=data['numbers_memory'],
+                number_stats=data['number_stats'],
+                score=data['score'],
+                pattern_arrays=data['arrays']
+            )
+            state._model_path = data['model_path']
+            return state
         except Exception as e:
             logging.error(f"모델 로드 실패: {str(e)}")
-            return None
\ No newline at end of file
+            return None
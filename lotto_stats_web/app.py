@@ -1,6 +1,11 @@
 # app.py - 메인 애플리케이션
 from flask import Flask
 import os
+import sys
+
+# 저장소 공용 모듈 (lotto_common)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from config import Config
 
 # 컨트롤러 임포트
@@ -25,6 +30,10 @@ def create_app(config_class=Config):
         app.logger.info(f"데이터베이스가 존재하지 않습니다. 초기화합니다: {app.config['DB_PATH']}")
         DatabaseConnector.init_db()
 
+    # 요청 계측 (/metrics)
+    from lotto_common.request_metrics import init_metrics
+    init_metrics(app, app.config.get('METRICS_DIR'))
+
     # 블루프린트 등록
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
@@ -13,7 +13,7 @@ class Config:
     # 경로 설정
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     DATA_DIR = os.path.join(BASE_DIR, 'data')
-    CACHE_DIR = os.path.join(DATA_DIR, 'cache')
+    CACHE_DIR = os.environ.get('CACHE_DIR') or os.path.join(DATA_DIR, 'cache')
 
     # 데이터베이스 설정
     DB_PATH = os.environ.get('DB_PATH') or os.path.join(DATA_DIR, 'lotto.db')
@@ -22,11 +22,18 @@ class Config:
     CACHE_LIFETIME = 86400  # 캐시 유효 시간 (초) - 기본 24시간
     STATS_CACHE_FILE = os.path.join(CACHE_DIR, 'stats_cache.json')
 
+    # 지표 설정 (gunicorn 다중 워커 집계용 공유 디렉토리, 미설정 시 프로세스 단위)
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+
     # 분석 설정
     HIGH_LOW_CUTOFF = 23  # 고저 비율 계산 기준
     DRAW_COUNT_RECENT = 100  # '최근' 회차로 간주할 횟수
     DRAW_COUNT_LATEST = 10  # '최신' 회차로 간주할 횟수
 
+    # API 설정
+    DRAWS_PAGE_DEFAULT_LIMIT = 100  # /api/draws 커서 페이지 기본 크기
+    DRAWS_PAGE_MAX_LIMIT = 1000  # /api/draws 커서 페이지 최대 크기
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -1,8 +1,9 @@
 # controllers/api_controller.py - API 컨트롤러
+import json
 import os
 import time
 
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
 from services.cache_service import CacheService
 from services.stats_service import StatsService
 from models.lotto_stats import LottoStatsModel
@@ -50,18 +51,44 @@ def api_recent():
 
 @api_bp.route('/draws')
 def api_draws():
-    """회차 데이터 API 엔드포인트"""
+    """회차 데이터 API 엔드포인트
+
+    - start/end: 회차 범위 조회
+    - limit: 최근 N회 조회 (cursor 모드에서는 페이지 크기)
+    - cursor: 키셋 페이지네이션 모드 (빈 값이면 첫 페이지, 응답의 next_cursor 전달)
+    - format=ndjson: 범위 전체를 한 줄에 한 회차씩 스트리밍
+    - 정수가 아닌 start/end/limit/cursor 는 400 응답
+    """
     try:
-        start = request.args.get('start')
-        end = request.args.get('end')
+        start = _int_arg('start')
+        end = _int_arg('end')
+        limit = _int_arg('limit')
+        cursor = _int_arg('cursor')
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    try:
+        if request.args.get('format') == 'ndjson':
+            return _stream_draws_ndjson(start, end)
+
+        if 'cursor' in request.args:
+            if limit is None:
+                limit = current_app.config['DRAWS_PAGE_DEFAULT_LIMIT']
+            limit = max(1, min(limit, current_app.config['DRAWS_PAGE_MAX_LIMIT']))
+            draws, next_cursor = LottoStatsModel.get_draws_page(cursor, limit, start, end)
+            return jsonify({
+                'success': True,
+                'draws': draws,
+                'next_cursor': next_cursor
+            })
 
         if start and end:
-            start_draw = int(start)
-            end_draw = int(end)
-            draws = LottoStatsModel.get_draws_by_range(start_draw, end_draw)
+            draws = LottoStatsModel.get_draws_by_range(start, end)
         else:
-            limit = int(request.args.get('limit', 10))
-            draws = LottoStatsModel.get_recent_draws(limit)
+            draws = LottoStatsModel.get_recent_draws(10 if limit is None else limit)
 
         return jsonify({
             'success': True,
@@ -75,6 +102,33 @@ def api_draws():
         }), 500
 
 
+def _int_arg(name):
+    """정수 쿼리 인자 (없거나 빈 값이면 None, 정수가 아니면 ValueError)"""
+    value = request.args.get(name, '').strip()
+    if not value:
+        return None
+    if not value.lstrip('-').isdigit():
+        raise ValueError(f"잘못된 {name} 값입니다: {value}")
+    return int(value)
+
+
+def _stream_draws_ndjson(start_draw, end_draw):
+    """회차 데이터를 NDJSON으로 스트리밍 (요청당 메모리 사용량 일정)
+
+    응답 헤더는 이미 전송된 뒤이므로, 도중에 DB 오류가 나면 마지막 줄에
+    {"success": false, "error": ...} 를 보내고 스트림을 종료한다.
+    """
+    def generate():
+        try:
+            for draw in LottoStatsModel.iter_draws(start_draw, end_draw):
+                yield json.dumps(draw, ensure_ascii=False) + '\n'
+        except Exception as e:
+            current_app.logger.error(f"회차 데이터 스트리밍 오류: {str(e)}")
+            yield json.dumps({'success': False, 'error': str(e)}, ensure_ascii=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @api_bp.route('/frequency')
 def api_frequency():
     """번호 빈도 API 엔드포인트"""
@@ -44,16 +44,72 @@ class LottoStatsModel:
 
         results = DatabaseConnector.execute_query(query, params)
 
-        draws = []
-        for row in results:
-            draws.append({
-                'draw_number': row[0],
-                'numbers': list(row[1:7]),
-                'bonus': row[7],
-                'draw_date': row[8] if len(row) > 8 else None
-            })
+        return [LottoStatsModel._row_to_draw(row) for row in results]
 
-        return draws
+    @staticmethod
+    def _row_to_draw(row):
+        """DB 조회 결과 한 행을 회차 딕셔너리로 변환"""
+        return {
+            'draw_number': row[0],
+            'numbers': list(row[1:7]),
+            'bonus': row[7],
+            'draw_date': row[8] if len(row) > 8 else None
+        }
+
+    @staticmethod
+    def _build_range_filter(start_draw=None, end_draw=None, cursor=None):
+        """회차 범위/커서 조건을 WHERE 절과 파라미터로 변환"""
+        conditions = []
+        params = []
+        if start_draw:
+            conditions.append("draw_number >= ?")
+            params.append(start_draw)
+        if end_draw:
+            conditions.append("draw_number <= ?")
+            params.append(end_draw)
+        if cursor is not None:
+            # 내림차순 조회이므로 커서보다 작은 회차만 다음 페이지에 해당
+            conditions.append("draw_number < ?")
+            params.append(cursor)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    @staticmethod
+    def get_draws_page(cursor=None, limit=100, start_draw=None, end_draw=None):
+        """draw_number 기준 키셋 페이지네이션 조회 (최신 회차부터)
+
+        OFFSET을 쓰지 않으므로 몇 번째 페이지든 인덱스 탐색 비용이 같다.
+        반환값: (회차 리스트, 다음 페이지 커서 또는 None)
+        """
+        where, params = LottoStatsModel._build_range_filter(start_draw, end_draw, cursor)
+        query = f"""
+            SELECT draw_number, num1, num2, num3, num4, num5, num6, bonus, draw_date
+            FROM lotto_results
+            {where}
+            ORDER BY draw_number DESC
+            LIMIT ?
+        """
+        # 다음 페이지 존재 여부 확인을 위해 한 행 더 조회
+        results = DatabaseConnector.execute_query(query, tuple(params) + (limit + 1,))
+
+        draws = [LottoStatsModel._row_to_draw(row) for row in results[:limit]]
+        next_cursor = draws[-1]['draw_number'] if len(results) > limit else None
+
+        return draws, next_cursor
+
+    @staticmethod
+    def iter_draws(start_draw=None, end_draw=None):
+        """회차 데이터를 DB 커서에서 한 행씩 읽어 반환하는 제너레이터 (스트리밍용)"""
+        where, params = LottoStatsModel._build_range_filter(start_draw, end_draw)
+        query = f"""
+            SELECT draw_number, num1, num2, num3, num4, num5, num6, bonus, draw_date
+            FROM lotto_results
+            {where}
+            ORDER BY draw_number DESC
+        """
+        for row in DatabaseConnector.iter_query(query, tuple(params)):
+            yield LottoStatsModel._row_to_draw(row)
 
     @staticmethod
     def get_recent_draws(limit=10):
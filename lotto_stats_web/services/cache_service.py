@@ -5,6 +5,7 @@ import time
 from datetime import datetime
 from config import Config
 from services.stats_service import StatsService
+from lotto_common.request_metrics import record_cache
 
 
 class CacheService:
@@ -39,12 +40,14 @@ class CacheService:
                 stats['cache_timestamp'] = datetime.fromtimestamp(mtime).isoformat()
                 stats['cache_age'] = round((time.time() - mtime) / 60, 1)  # 분 단위
 
+                record_cache('stats', hit=True)
                 return stats
             except Exception as e:
                 print(f"캐시 파일 로드 오류: {str(e)}")
                 cache_valid = False
 
         # 캐시가 유효하지 않거나 강제 갱신이면 새로 계산
+        record_cache('stats', hit=False)
         stats = refresh_all_stats_cache(force=True)
 
         return stats
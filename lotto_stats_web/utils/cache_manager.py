@@ -5,6 +5,7 @@ import time
 from datetime import datetime
 import hashlib
 from config import Config
+from lotto_common.request_metrics import record_cache
 
 
 class CacheManager:
@@ -47,6 +48,7 @@ class CacheManager:
 
         # 캐시 파일이 없는 경우
         if not os.path.exists(cache_path):
+            record_cache(cache_name, hit=False)
             return None
 
         try:
@@ -56,6 +58,7 @@ class CacheManager:
 
             # 캐시 유효기간 확인
             if current_time - mtime > max_age:
+                record_cache(cache_name, hit=False)
                 return None  # 캐시 만료
 
             # 캐시 파일 읽기
@@ -69,11 +72,13 @@ class CacheManager:
                 'name': cache_name
             }
 
+            record_cache(cache_name, hit=True)
             return cache_data
 
         except (IOError, json.JSONDecodeError) as e:
             # 파일 읽기 또는 JSON 파싱 오류
             print(f"캐시 읽기 오류: {str(e)}")
+            record_cache(cache_name, hit=False)
             return None
 
     @staticmethod
@@ -2,6 +2,7 @@
 import sqlite3
 import os
 from config import Config
+from lotto_common.request_metrics import MetricsConnection
 
 
 class DatabaseConnector:
@@ -12,7 +13,7 @@ class DatabaseConnector:
         """데이터베이스 연결 반환"""
         db_path = Config.DB_PATH
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        return sqlite3.connect(db_path)
+        return sqlite3.connect(db_path, factory=MetricsConnection)
 
     @staticmethod
     def init_db():
@@ -115,6 +116,22 @@ class DatabaseConnector:
             conn.close()
             raise e
 
+    @staticmethod
+    def iter_query(query, params=(), batch_size=500):
+        """SELECT 결과를 한 번에 메모리에 올리지 않고 batch_size 단위로 순차 반환하는 제너레이터"""
+        conn = DatabaseConnector.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+        finally:
+            conn.close()
+
     @staticmethod
     def insert_many(table, columns, values):
         """여러 행 한 번에 삽입"""
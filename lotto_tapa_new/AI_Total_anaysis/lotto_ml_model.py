@@ -6,8 +6,10 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, classification_report
 from sklearn.pipeline import Pipeline
 import joblib
+from joblib import Parallel, delayed
 import os
 import logging
+import time
 from db_manager import LottoDBManager
 from feature_engineering import LottoFeatureEngineer
 
@@ -15,6 +17,38 @@ from feature_engineering import LottoFeatureEngineer
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('LottoML')
 
+NUMBER_COLUMNS = [f'num{i}' for i in range(1, 7)]
+
+
+def _fit_number_model(num, X_reduced, y_num, model_path):
+    """
+    번호 하나의 출현 예측 모델 학습 후 바로 저장 (작업 프로세스에서 실행)
+
+    Returns:
+        tuple: (번호, 학습된 파이프라인 또는 None, 오류 메시지 또는 None)
+    """
+    try:
+        # 학습/테스트 세트 분리
+        X_train, X_test, y_train, y_test = train_test_split(
+            X_reduced, y_num, test_size=0.2, random_state=42, shuffle=True
+        )
+
+        # 모델 파이프라인 구성
+        pipeline = Pipeline([
+            ('scaler', StandardScaler()),
+            ('model', GradientBoostingClassifier(random_state=42))
+        ])
+
+        # 간소화된 하이퍼파라미터
+        pipeline.fit(X_train, y_train)
+
+        # 모델 저장 (학습이 끝난 번호부터 저장)
+        joblib.dump(pipeline, model_path)
+        return num, pipeline, None
+
+    except Exception as e:
+        return num, None, str(e)
+
 
 class LottoMLModel:
     """
@@ -22,18 +56,21 @@ class LottoMLModel:
     다양한 모델과 앙상블 기법을 사용하여 번호 출현 패턴을 학습하고 예측합니다.
     """
 
-    def __init__(self, db_path='lotto.db'):
+    def __init__(self, db_path='lotto.db', n_jobs=-1):
         """
         LottoMLModel 초기화
 
         Args:
             db_path: 로또 데이터베이스 파일 경로
+            n_jobs: 번호별 모델 동시 학습 프로세스 수 (-1 이면 전체 코어, 1 이면 순차 학습)
         """
         self.db_manager = LottoDBManager(db_path)
         self.feature_engineer = LottoFeatureEngineer()
         self.model = None
         self.number_models = {}  # 각 번호별 개별 모델 저장
         self.models_dir = 'models'  # 모델 저장 디렉토리
+        self.n_jobs = n_jobs
+        self.draws = None  # 학습에 사용한 당첨 번호 데이터
 
         # 모델 저장 디렉토리 생성
         if not os.path.exists(self.models_dir):
@@ -59,6 +96,7 @@ class LottoMLModel:
 
         # 데이터프레임 생성
         df = pd.DataFrame(lotto_data, columns=['draw_number', 'num1', 'num2', 'num3', 'num4', 'num5', 'num6', 'bonus'])
+        self.draws = df
 
         # 특성 엔지니어링
         X, y = self.feature_engineer.create_features(df)
@@ -89,65 +127,67 @@ class LottoMLModel:
         logger.info("모델 학습 완료")
         return True
 
+    def _number_targets(self, X):
+        """
+        번호별 출현 여부 라벨을 한 번에 생성
+
+        Args:
+            X: 학습 데이터 (당첨 번호 열이 없으면 prepare_data 의 당첨 번호를 같은 행 순서로 사용)
+
+        Returns:
+            numpy.ndarray: [N, 45] 원-핫 라벨 (열 i 는 번호 i+1 포함 여부)
+        """
+        if all(col in X.columns for col in NUMBER_COLUMNS):
+            numbers = X[NUMBER_COLUMNS]
+        else:
+            numbers = self.draws.loc[X.index, NUMBER_COLUMNS]
+        numbers = numbers.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+        # 비어 있거나 1~45 범위를 벗어난 값은 어떤 번호에도 포함되지 않음
+        valid = np.isin(numbers, np.arange(1, 46))
+        targets = np.zeros((len(numbers), 45), dtype=int)
+        rows = np.nonzero(valid)[0]
+        targets[rows, numbers[valid].astype(int) - 1] = 1
+        return targets
+
     def _train_individual_number_models(self, X):
         """
         각 번호(1~45)에 대한 개별 출현 확률 예측 모델 학습
+        45개 모델은 서로 독립이므로 n_jobs 개 프로세스에서 동시에 학습하고, 끝난 순서대로 저장합니다.
 
         Args:
             X: 학습 데이터
         """
         logger.info("번호별 개별 모델 학습 시작")
+        start_time = time.perf_counter()
 
-        # 숫자 범위를 1~45로 제한
-        for num in range(1, 46):
-            try:
-                # 특성 이름 생성
-                num_cols = [f'num{i}' for i in range(1, 7)]
-
-                # 해당 번호가 당첨 번호에 포함되었는지 라벨 생성 (안전한 방식으로)
-                def check_number_presence(row, num, num_cols):
-                    try:
-                        for col in num_cols:
-                            if col in row and not pd.isna(row[col]) and row[col] == num:
-                                return 1
-                        return 0
-                    except:
-                        return 0
-
-                y_num = X.apply(lambda row: check_number_presence(row, num, num_cols), axis=1)
-
-                # 특정 번호와 관련된 특성만 선택
-                X_reduced = self.feature_engineer.select_features_for_number(X, num)
-
-                # 학습/테스트 세트 분리 (비어있지 않은지 확인)
-                if len(X_reduced) > 10:  # 최소 데이터 개수 확인
-                    X_train, X_test, y_train, y_test = train_test_split(
-                        X_reduced, y_num, test_size=0.2, random_state=42, shuffle=True
-                    )
-
-                    # 모델 파이프라인 구성
-                    pipeline = Pipeline([
-                        ('scaler', StandardScaler()),
-                        ('model', GradientBoostingClassifier(random_state=42))
-                    ])
+        # 45개 번호의 라벨을 한 번에 생성
+        targets = self._number_targets(X)
 
-                    # 간소화된 하이퍼파라미터
-                    pipeline.fit(X_train, y_train)
+        tasks = []
+        for num in range(1, 46):
+            # 특정 번호와 관련된 특성만 선택
+            X_reduced = self.feature_engineer.select_features_for_number(X, num)
 
-                    # 최적 모델 저장
-                    self.number_models[num] = pipeline
+            # 최소 데이터 개수 확인
+            if len(X_reduced) > 10:
+                model_path = os.path.join(self.models_dir, f'number_{num}_model.pkl')
+                tasks.append(delayed(_fit_number_model)(num, X_reduced, targets[:, num - 1], model_path))
+            else:
+                logger.warning(f"번호 {num}에 대한 학습 데이터가 부족합니다")
 
-                    # 모델 저장
-                    model_path = os.path.join(self.models_dir, f'number_{num}_model.pkl')
-                    joblib.dump(pipeline, model_path)
+        # 오류가 있어도 나머지 번호는 계속 진행
+        results = Parallel(n_jobs=self.n_jobs, return_as='generator_unordered')(tasks)
+        for num, pipeline, error in results:
+            if pipeline is None:
+                logger.error(f"번호 {num} 모델 학습 중 오류: {error}")
+                continue
 
-                    logger.info(f"번호 {num} 모델 학습 완료")
-                else:
-                    logger.warning(f"번호 {num}에 대한 학습 데이터가 부족합니다")
+            self.number_models[num] = pipeline
+            logger.info(f"번호 {num} 모델 학습 완료")
 
-            except Exception as e:
-                logger.error(f"번호 {num} 모델 학습 중 오류: {str(e)}")
-                # 오류가 있어도 다음 번호로 계속 진행
+        logger.info(f"번호별 개별 모델 학습 종료: {len(self.number_models)}/45 모델, "
+                    f"{time.perf_counter() - start_time:.1f}초 (n_jobs={self.n_jobs})")
 
     def _train_combination_evaluation_model(self, X, y):
         """
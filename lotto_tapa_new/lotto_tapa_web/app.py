@@ -1,11 +1,18 @@
 from flask import Flask, render_template, request, jsonify, session
+import os
+import sys
 import random
 import uuid
 import logging
 from datetime import datetime
+
+# 저장소 공용 모듈 (lotto_common)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
 from lotto_config import LottoConfig
 from lotto_analyzer import LottoAnalyzer
 from db_util import LottoDatabase
+from lotto_common.request_metrics import init_metrics
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -15,9 +22,12 @@ app = Flask(__name__)
 app.secret_key = 'lotto_tapa_secret_key'  # 세션 관리를 위한 비밀키
 app.config['SESSION_TYPE'] = 'filesystem'
 
+# 요청 계측 (/metrics, 다중 워커 집계는 METRICS_DIR 환경 변수로 설정)
+init_metrics(app)
+
 # 데이터베이스 초기화 (오류 처리 추가)
 try:
-    db = LottoDatabase()
+    db = LottoDatabase(os.environ.get('LOTTO_DB_PATH', 'data/lotto.db'))
     db.init_db()
     logger.info("데이터베이스 초기화 완료")
 except Exception as e:
@@ -317,8 +327,6 @@ def handle_exception(e):
 
 if __name__ == '__main__':
     # 환경 변수에서 설정 읽기
-    import os
-
     debug_mode = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
     port = int(os.environ.get('PORT', 5000))
     host = os.environ.get('HOST', '0.0.0.0')
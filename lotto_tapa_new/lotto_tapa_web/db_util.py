@@ -1,6 +1,7 @@
 import sqlite3
 import os
 from collections import Counter
+from lotto_common.request_metrics import MetricsConnection
 
 
 class LottoDatabase:
@@ -12,7 +13,7 @@ class LottoDatabase:
 
     def get_connection(self):
         """데이터베이스 연결 반환"""
-        return sqlite3.connect(self.db_path)
+        return sqlite3.connect(self.db_path, factory=MetricsConnection)
 
     def init_db(self):
         """데이터베이스 초기화 및 테이블 생성"""